@@ -0,0 +1,115 @@
+import { v } from "convex/values";
+import { mutation } from "./_generated/server";
+
+// Bulk endpoints for scripts/convex_ingest.py. Every item carries an
+// ingestKey; re-sending a chunk (after a crash or a retry) updates or skips
+// the existing rows instead of duplicating them.
+
+const memoryItem = v.object({
+  ingestKey: v.string(),
+  title: v.string(),
+  content: v.string(),
+  tags: v.array(v.string()),
+  lastModified: v.number(),
+  source: v.string(),
+});
+
+const scheduledTaskItem = v.object({
+  ingestKey: v.string(),
+  title: v.string(),
+  description: v.string(),
+  startTime: v.number(),
+  type: v.string(),
+  status: v.string(),
+  owner: v.string(),
+  agent: v.string(),
+  taskFile: v.string(),
+  runId: v.string(),
+  source: v.string(),
+});
+
+const activityItem = v.object({
+  ingestKey: v.string(),
+  timestamp: v.number(),
+  agent: v.string(),
+  action: v.string(),
+  details: v.string(),
+  status: v.string(),
+  metadata: v.optional(v.any()),
+});
+
+export const upsertMemories = mutation({
+  args: { items: v.array(memoryItem) },
+  handler: async (ctx, args) => {
+    let inserted = 0;
+    let updated = 0;
+    let skipped = 0;
+    for (const item of args.items) {
+      const existing = await ctx.db
+        .query("memories")
+        .withIndex("by_ingest_key", (q) => q.eq("ingestKey", item.ingestKey))
+        .first();
+      if (!existing) {
+        await ctx.db.insert("memories", item);
+        inserted++;
+      } else if (existing.content !== item.content || existing.title !== item.title) {
+        await ctx.db.patch(existing._id, item);
+        updated++;
+      } else {
+        skipped++;
+      }
+    }
+    return { inserted, updated, skipped };
+  },
+});
+
+export const upsertScheduledTasks = mutation({
+  args: { items: v.array(scheduledTaskItem) },
+  handler: async (ctx, args) => {
+    let inserted = 0;
+    let updated = 0;
+    let skipped = 0;
+    for (const item of args.items) {
+      const existing = await ctx.db
+        .query("scheduled_tasks")
+        .withIndex("by_ingest_key", (q) => q.eq("ingestKey", item.ingestKey))
+        .first();
+      if (!existing) {
+        await ctx.db.insert("scheduled_tasks", item);
+        inserted++;
+      } else if (
+        existing.status !== item.status ||
+        existing.title !== item.title ||
+        existing.startTime !== item.startTime ||
+        existing.owner !== item.owner
+      ) {
+        await ctx.db.patch(existing._id, item);
+        updated++;
+      } else {
+        skipped++;
+      }
+    }
+    return { inserted, updated, skipped };
+  },
+});
+
+export const logActivities = mutation({
+  args: { items: v.array(activityItem) },
+  handler: async (ctx, args) => {
+    let inserted = 0;
+    let skipped = 0;
+    for (const item of args.items) {
+      const existing = await ctx.db
+        .query("activities")
+        .withIndex("by_ingest_key", (q) => q.eq("ingestKey", item.ingestKey))
+        .first();
+      if (existing) {
+        skipped++;
+        continue;
+      }
+      await ctx.db.insert("activities", item);
+      inserted++;
+    }
+    return { inserted, updated: 0, skipped };
+  },
+});
@@ -9,7 +9,10 @@ export default defineSchema({
     details: v.string(),
     status: v.string(), // "success" | "error" | "info" | "pending"
     metadata: v.optional(v.any()),
-  }).index("by_timestamp", ["timestamp"]),
+    ingestKey: v.optional(v.string()), // set by scripts/convex_ingest.py
+  })
+    .index("by_timestamp", ["timestamp"])
+    .index("by_ingest_key", ["ingestKey"]),
 
   scheduled_tasks: defineTable({
     title: v.string(),
@@ -19,16 +22,32 @@ export default defineSchema({
     type: v.string(), // "cron" | "reminder" | "task"
     status: v.string(), // "scheduled" | "completed" | "cancelled"
     recurrence: v.optional(v.string()),
-  }).index("by_start_time", ["startTime"]),
+    // Roundtable action items (scripts/convex_ingest.py); unset on manual tasks
+    ingestKey: v.optional(v.string()),
+    owner: v.optional(v.string()), // agent who delivers
+    agent: v.optional(v.string()), // agent who committed
+    taskFile: v.optional(v.string()),
+    runId: v.optional(v.string()),
+    source: v.optional(v.string()), // "roundtable"
+  })
+    .index("by_start_time", ["startTime"])
+    .index("by_ingest_key", ["ingestKey"])
+    .index("by_source_status", ["source", "status", "startTime"])
+    .index("by_owner", ["owner", "status", "startTime"])
+    .index("by_task_file", ["taskFile", "agent"])
+    .searchIndex("search_title", { searchField: "title" }),
 
   memories: defineTable({
     title: v.string(),
     content: v.string(),
     tags: v.array(v.string()),
     lastModified: v.number(),
-    source: v.string(), // "MEMORY.md" | "file" | "conversation"
-  }).searchIndex("search_content", {
-    searchField: "content",
-    filterFields: ["title", "source"],
-  }),
+    source: v.string(), // "MEMORY.md" | "file" | "conversation" | "roundtable"
+    ingestKey: v.optional(v.string()), // set by scripts/convex_ingest.py
+  })
+    .index("by_ingest_key", ["ingestKey"])
+    .searchIndex("search_content", {
+      searchField: "content",
+      filterFields: ["title", "source"],
+    }),
 });
@@ -15,7 +15,9 @@ export const globalSearch = query({
 
     const taskResults = await ctx.db
       .query("scheduled_tasks")
-      .filter((q) => q.contains(q.field("title"), args.searchTerm))
+      .withSearchIndex("search_title", (q) =>
+        q.search("title", args.searchTerm)
+      )
       .take(10);
 
     return {
@@ -16,6 +16,42 @@ export const listScheduled = query({
   },
 });
 
+// Roundtable action items, soonest due first: one owner's, one task's, or all.
+export const listActionItems = query({
+  args: {
+    owner: v.optional(v.string()),
+    taskFile: v.optional(v.string()),
+    status: v.optional(v.string()),
+    limit: v.optional(v.number()),
+  },
+  handler: async (ctx, args) => {
+    const status = args.status ?? "scheduled";
+    const limit = args.limit ?? 50;
+    if (args.owner) {
+      const owner = args.owner;
+      return await ctx.db
+        .query("scheduled_tasks")
+        .withIndex("by_owner", (q) => q.eq("owner", owner).eq("status", status))
+        .take(limit);
+    }
+    if (args.taskFile) {
+      const taskFile = args.taskFile;
+      const items = await ctx.db
+        .query("scheduled_tasks")
+        .withIndex("by_task_file", (q) => q.eq("taskFile", taskFile))
+        .collect();
+      return items
+        .filter((item) => item.status === status)
+        .sort((a, b) => a.startTime - b.startTime)
+        .slice(0, limit);
+    }
+    return await ctx.db
+      .query("scheduled_tasks")
+      .withIndex("by_source_status", (q) => q.eq("source", "roundtable").eq("status", status))
+      .take(limit);
+  },
+});
+
 export const add = mutation({
   args: {
     title: v.string(),
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Activity Store — JSONL activity log with a byte-offset index
+
+activity_log.json is one JSON array, so every reader had to parse all of
+history to look at the last few entries. The store mirrors it to
+activity_log.jsonl (one entry per line, append-only) and keeps a SQLite
+sidecar index of (byte offset, length, timestamp, agent) per line:
+
+  • last(n)                reads backwards from the end of the file
+  • for_agent(agent, n)    index lookup, then one seek + read per entry
+  • since(timestamp)       index range scan, then seek + read
+
+so each query costs O(result), not O(file). The index catches up on
+whatever was appended since it was last used (by this process or any
+other), and is rebuilt if the log is replaced or truncated.
+
+The JSON file is mirrored incrementally: when it was appended to (the
+bytes before its old closing bracket are unchanged) only the new tail is
+parsed; a full parse happens only when it was rewritten (capped, edited),
+and then only the entries after the last one mirrored are taken. If that
+entry is gone, entries already mirrored recently are skipped by key (their
+"id", else a hash of the entry). Entries without a timestamp get the time
+they were mirrored.
+
+Usage:
+  python3 activity_store.py                          # Mirror, then show the last 10 entries
+  python3 activity_store.py --last 25
+  python3 activity_store.py --agent Jarvis [--last 5]
+  python3 activity_store.py --since 2026-10-01T09:00
+  python3 activity_store.py --reindex                # Rebuild the offset index
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import banter_store
+from banter_store import locked
+
+# ─── Paths ──────────────────────────────────────────────
+ACTIVITY_JSON = "/Users/scott/clawd/memory/activity_log.json"   # legacy array, still written by the agents
+ACTIVITY_LOG = "/Users/scott/clawd/memory/activity_log.jsonl"
+
+FINGERPRINT_BYTES = 64   # bytes before the JSON array's closing bracket that must match to read only the tail
+RECENT_KEYS = 2000       # keys of the last mirrored entries, for de-duplicating a rewritten JSON file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    offset INTEGER PRIMARY KEY,
+    length INTEGER NOT NULL,
+    ts     REAL,
+    agent  TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_agent ON entries (agent, offset);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def jsonl_path_for(json_path):
+    """activity_log.json → activity_log.jsonl, alongside it."""
+    return os.path.splitext(json_path)[0] + ".jsonl"
+
+
+def parse_time(value):
+    """Epoch seconds for an ISO string or a seconds/milliseconds number; None if unparseable."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000 if value > 1e11 else float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def entry_time(entry):
+    return parse_time(entry.get("timestamp", entry.get("time")))
+
+
+def entry_key(entry):
+    """Identity of a legacy entry: its "id", else a hash of its content."""
+    if isinstance(entry, dict) and entry.get("id") is not None:
+        return f"id:{entry['id']}"
+    raw = json.dumps(entry, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+class ActivityLog:
+    """The JSONL log at *log_path*, its offset index, and the JSON file it mirrors."""
+
+    def __init__(self, log_path=ACTIVITY_LOG, legacy_path=ACTIVITY_JSON):
+        self.log_path = log_path
+        self.legacy_path = legacy_path
+        self.index_path = f"{log_path}.idx"
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.index_path, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def _meta(self, key, default=None):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, db, key, value):
+        db.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                   "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, json.dumps(value)))
+
+    # ─── Writing ────────────────────────────────────────
+
+    def append(self, entries):
+        """Append *entries* (dicts) to the log; missing timestamps are set to now."""
+        if not entries:
+            return 0
+        with locked(self.log_path):
+            self._write(entries)
+        self.catch_up()
+        return len(entries)
+
+    def _write(self, entries):
+        now = datetime.now().isoformat(timespec="seconds")
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps({**e, "timestamp": e.get("timestamp") or now}, ensure_ascii=False) + "\n"
+                            for e in entries))
+
+    def sync_legacy(self):
+        """Mirror entries added to the JSON file since the last sync. Returns how many."""
+        try:
+            st = os.stat(self.legacy_path)
+        except OSError:
+            return 0
+        stamp = [st.st_ino, st.st_size, st.st_mtime_ns]
+        if (self._meta("legacy") or {}).get("stamp") == stamp:
+            return 0
+        with locked(self.log_path):
+            state = self._meta("legacy") or {}  # another process may have just synced
+            if state.get("stamp") == stamp:
+                return 0
+            with open(self.legacy_path, "rb") as f:
+                new, end = self._legacy_tail(f, st, state)
+                if new is None:
+                    new, end = self._legacy_full(f, state)
+                if new is None:
+                    return 0  # mid-write or not a JSON array; try again next time
+                f.seek(max(0, end - FINGERPRINT_BYTES))
+                fingerprint = f.read(min(end, FINGERPRINT_BYTES)).hex()
+            keys = [entry_key(e) for e in new]
+            new = [e for e in new if isinstance(e, dict)]
+            self._write(new)
+            with self._conn() as db:
+                if keys:
+                    recent = self._meta("legacy_keys", [])
+                    self._set_meta(db, "legacy_keys", (recent + keys)[-RECENT_KEYS:])
+                self._set_meta(db, "legacy", {"stamp": stamp, "end": end, "fingerprint": fingerprint,
+                                              "last": keys[-1] if keys else state.get("last")})
+        self.catch_up()
+        return len(new)
+
+    def _legacy_tail(self, f, st, state):
+        """(new entries, end of the last entry) if the file was only appended to, else Nones."""
+        end = state.get("end")
+        if end is None or st.st_size <= end:
+            return None, None
+        f.seek(max(0, end - FINGERPRINT_BYTES))
+        if f.read(min(end, FINGERPRINT_BYTES)).hex() != state.get("fingerprint"):
+            return None, None
+        rest = f.read()
+        stripped = rest.lstrip()
+        if stripped.startswith(b"]"):
+            return [], end
+        if not stripped.startswith(b","):
+            return None, None
+        body = stripped[1:].rstrip()
+        if not body.endswith(b"]"):
+            return None, None
+        inner = body[:-1].rstrip()
+        try:
+            new = json.loads(b"[" + inner + b"]")
+        except ValueError:
+            return None, None
+        return new, end + (len(rest) - len(stripped)) + 1 + len(inner)
+
+    def _legacy_full(self, f, state):
+        """(entries after the last one mirrored, end of the last entry) from a full parse, else Nones."""
+        f.seek(0)
+        raw = f.read()
+        try:
+            entries = json.loads(raw)
+        except ValueError:
+            return None, None
+        if not isinstance(entries, list):
+            return None, None
+        end = len(raw.rstrip()[:-1].rstrip())
+        keys = [entry_key(e) for e in entries]
+        last = state.get("last")
+        if last is None and "count" in state:
+            return entries[state["count"]:], end  # state from before markers were kept
+        if last in keys:
+            start = len(keys) - keys[::-1].index(last)
+            return entries[start:], end
+        # Marker gone (capped past it, or edited): skip whatever was mirrored recently
+        seen = set(self._meta("legacy_keys", []))
+        return [e for e, key in zip(entries, keys) if key not in seen], end
+
+    # ─── Indexing ───────────────────────────────────────
+
+    def catch_up(self):
+        """Index lines appended since the last call; rebuild if the log was replaced."""
+        db = self._conn()
+        try:
+            st = os.stat(self.log_path)
+        except FileNotFoundError:
+            return 0
+        indexed = self._meta("indexed", {})
+        start = indexed.get("bytes", 0)
+        if indexed.get("ino") != st.st_ino or st.st_size < start:
+            start = 0
+        if st.st_size == start and start:
+            return 0
+        rows = []
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            data = f.read(st.st_size - start)
+        pos = 0
+        while True:
+            nl = data.find(b"\n", pos)
+            if nl < 0:
+                break  # partial last line: picked up next time
+            line = data[pos:nl]
+            try:
+                entry = json.loads(line)
+                rows.append((start + pos, len(line), entry_time(entry), entry.get("agent")))
+            except ValueError:
+                pass  # torn write from a crashed appender
+            pos = nl + 1
+        with db:
+            if start == 0:
+                db.execute("DELETE FROM entries")
+            db.executemany("INSERT OR REPLACE INTO entries (offset, length, ts, agent) VALUES (?, ?, ?, ?)", rows)
+            self._set_meta(db, "indexed", {"ino": st.st_ino, "bytes": start + pos})
+        return len(rows)
+
+    def reindex(self):
+        with self._conn() as db:
+            db.execute("DELETE FROM meta WHERE key = 'indexed'")
+        return self.catch_up()
+
+    # ─── Queries ────────────────────────────────────────
+
+    def _read(self, rows):
+        entries = []
+        with open(self.log_path, "rb") as f:
+            for offset, length in rows:
+                f.seek(offset)
+                try:
+                    entries.append(json.loads(f.read(length)))
+                except ValueError:
+                    continue
+        return entries
+
+    def last(self, n):
+        """The newest *n* entries, oldest first."""
+        return banter_store.tail(n, self.log_path)
+
+    def for_agent(self, agent, n=None):
+        """The newest *n* entries (all if None) by *agent*, oldest first."""
+        self.catch_up()
+        rows = self._conn().execute(
+            "SELECT offset, length FROM entries WHERE agent = ? ORDER BY offset DESC LIMIT ?",
+            (agent, -1 if n is None else n)).fetchall()
+        return self._read(reversed(rows))
+
+    def read_from(self, offset):
+        """[(offset, length, entry)] for every entry at or after byte *offset*, in log order."""
+        self.catch_up()
+        rows = self._conn().execute(
+            "SELECT offset, length FROM entries WHERE offset >= ? ORDER BY offset", (offset,)).fetchall()
+        entries = []
+        with open(self.log_path, "rb") as f:
+            for start, length in rows:
+                f.seek(start)
+                try:
+                    entries.append((start, length, json.loads(f.read(length))))
+                except ValueError:
+                    continue
+        return entries
+
+    def since(self, timestamp, n=None):
+        """Entries at or after *timestamp* (ISO string or epoch), oldest first, at most *n*."""
+        self.catch_up()
+        rows = self._conn().execute(
+            "SELECT offset, length FROM entries WHERE ts >= ? ORDER BY ts, offset LIMIT ?",
+            (parse_time(timestamp), -1 if n is None else n)).fetchall()
+        return self._read(rows)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_logs = {}
+
+
+def get_log(legacy_path=ACTIVITY_JSON):
+    """Shared ActivityLog mirroring *legacy_path* (JSONL alongside it)."""
+    log = _logs.get(legacy_path)
+    if log is None:
+        log = _logs[legacy_path] = ActivityLog(jsonl_path_for(legacy_path), legacy_path)
+    return log
+
+
+def recent(n, legacy_path=ACTIVITY_JSON):
+    """Mirror any new JSON entries, then return the newest *n*."""
+    log = get_log(legacy_path)
+    log.sync_legacy()
+    return log.last(n)
+
+
+def arg_value(flag, cast=str, default=None):
+    """Return the value following *flag* in sys.argv, or *default*."""
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+if __name__ == "__main__":
+    log = get_log()
+    start = time.perf_counter()
+    mirrored = log.sync_legacy()
+    if "--reindex" in sys.argv:
+        print(f"🗂️ Reindexed {log.reindex()} entries")
+    sync_ms = (time.perf_counter() - start) * 1000
+    print(f"🔁 Mirrored {mirrored} new entr{'y' if mirrored == 1 else 'ies'} in {sync_ms:.1f} ms")
+
+    n = arg_value("--last", int, 10)
+    start = time.perf_counter()
+    if "--agent" in sys.argv:
+        entries = log.for_agent(arg_value("--agent"), n)
+    elif "--since" in sys.argv:
+        entries = log.since(arg_value("--since"), arg_value("--last", int))
+    else:
+        entries = log.last(n)
+    print(f"🔎 {len(entries)} entr{'y' if len(entries) == 1 else 'ies'} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for e in entries:
+        print(f"  {e.get('timestamp', '?')}  {e.get('agent', '?'):<10} {e.get('action', '')}"
+              + (f" — {e['details']}" if e.get("details") else ""))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Agent Registry — one source of truth for who the agents are
+
+run_roundtable.py (keyed by @handle) and generate_banter.py (keyed by agent
+directory) used to carry their own copies of the roster and scan them
+linearly to find an avatar by display name. The registry merges the known
+roster with whatever the agents directory contains (any ``<dir>/SOUL.md``
+not listed below is picked up with its name taken from the first heading),
+and indexes the result by handle, display name and directory.
+
+get_registry() builds it lazily and caches it until the agents directory
+changes. The same data is written to src/data/agents.json for the
+dashboard (src/data/agents.ts).
+
+Usage:
+  python3 agent_registry.py                # Print the roster
+  python3 agent_registry.py --write-json   # Regenerate src/data/agents.json
+"""
+
+import json
+import os
+import re
+import sys
+
+AGENTS_DIR = "/Users/scott/clawd/agents"
+REGISTRY_JSON = "/Users/scott/clawd/deliverables/nexus-ui/src/data/agents.json"
+
+DEFAULT_AVATAR = "🤖"
+
+# ─── Known roster ───────────────────────────────────────
+# (handle, display name, avatar, agent directory)
+KNOWN_AGENTS = [
+    ("pixel",    "Pixel",    "👾",  None),  # Main agent, no sub-folder
+    ("jarvis",   "Jarvis",   "⚙️",  "developer"),
+    ("friday",   "Friday",   "🔍",  "researcher"),
+    ("loki",     "Loki",     "✍️",  "writer"),
+    ("nova",     "Nova",     "🎯",  "seo-optimizer"),
+    ("mercury",  "Mercury",  "📱",  "social-media"),
+    ("echo",     "Echo",     "🎙️",  "voice"),
+    ("atlas",    "Atlas",    "📊",  "analyst"),
+    ("hermes",   "Hermes",   "🚀",  "growth"),
+    ("vera",     "Vera",     "🛡️",  "compliance"),
+    ("astra",    "Astra",    "🌌",  "strategic"),
+    ("athena",   "Athena",   "📝",  "editor"),
+    ("sentinel", "Sentinel", "🔒",  "security"),
+    ("davinci",  "DaVinci",  "🎨",  "designer"),
+    ("orion",    "Orion",    "🎬",  "producer"),
+]
+
+# Extra @handles that resolve to an existing agent
+ALIASES = {"designer": "davinci"}
+
+HEADING = re.compile(r"^#\s+(?:SOUL(?:\.md)?\s*[—:-]\s*)?([A-Za-z][\w .-]*)", re.MULTILINE)
+
+
+class AgentRegistry:
+    """Agents (dicts with handle, name, avatar, dir, soul) with O(1) lookups."""
+
+    def __init__(self, agents, aliases=None):
+        self.agents = list(agents)
+        self._by_handle = {a["handle"]: a for a in self.agents}
+        for alias, handle in (aliases or {}).items():
+            if handle in self._by_handle:
+                self._by_handle.setdefault(alias, self._by_handle[handle])
+        self._by_name = {a["name"].lower(): a for a in self.agents}
+        self._by_dir = {a["dir"]: a for a in self.agents if a["dir"]}
+
+    def __len__(self):
+        return len(self.agents)
+
+    def __contains__(self, handle):
+        return handle in self._by_handle
+
+    def by_handle(self, handle):
+        return self._by_handle.get(handle)
+
+    def by_name(self, name):
+        return self._by_name.get((name or "").lower())
+
+    def by_dir(self, agent_dir):
+        return self._by_dir.get(agent_dir)
+
+    def avatar_for(self, name, default=DEFAULT_AVATAR):
+        """Avatar for a display name, e.g. a message's ``agent`` field."""
+        agent = self.by_name(name)
+        return agent["avatar"] if agent else default
+
+    def dirs(self):
+        """Agent directories, in roster order."""
+        return list(self._by_dir)
+
+    def to_json(self):
+        """Dashboard view: roster order, no filesystem details."""
+        return {
+            "agents": [{k: a[k] for k in ("handle", "name", "avatar", "dir")} for a in self.agents],
+            "aliases": {k: v["handle"] for k, v in self._by_handle.items() if k != v["handle"]},
+        }
+
+
+def _name_from_soul(path, fallback):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            match = HEADING.search(f.read(2048))
+    except OSError:
+        return fallback
+    return match.group(1).strip() if match else fallback
+
+
+def load_registry(agents_dir=AGENTS_DIR):
+    """Build the registry from KNOWN_AGENTS plus any SOUL.md under *agents_dir*."""
+    agents = []
+    known_dirs = set()
+    for handle, name, avatar, agent_dir in KNOWN_AGENTS:
+        soul = os.path.join(agents_dir, agent_dir, "SOUL.md") if agent_dir else None
+        agents.append({"handle": handle, "name": name, "avatar": avatar, "dir": agent_dir,
+                       "soul": bool(soul and os.path.isfile(soul))})
+        known_dirs.add(agent_dir)
+
+    try:
+        entries = sorted(os.scandir(agents_dir), key=lambda e: e.name)
+    except OSError:
+        entries = []
+    taken = {a["handle"] for a in agents} | set(ALIASES)
+    for entry in entries:
+        soul = os.path.join(entry.path, "SOUL.md")
+        if entry.name in known_dirs or not entry.is_dir() or not os.path.isfile(soul):
+            continue
+        name = _name_from_soul(soul, entry.name.replace("-", " ").title())
+        handle = re.sub(r"[^a-z0-9]", "", name.lower()) or entry.name
+        if handle in taken:
+            handle = entry.name
+        taken.add(handle)
+        agents.append({"handle": handle, "name": name, "avatar": DEFAULT_AVATAR, "dir": entry.name,
+                       "soul": True})
+    return AgentRegistry(agents, ALIASES)
+
+
+_registry = None
+_registry_stamp = None
+
+
+def get_registry(agents_dir=AGENTS_DIR):
+    """The cached registry for *agents_dir*, rebuilt when the directory changes."""
+    global _registry, _registry_stamp
+    try:
+        st = os.stat(agents_dir)
+        stamp = (agents_dir, st.st_mtime_ns, st.st_ino)
+    except OSError:
+        stamp = (agents_dir, None, None)
+    if _registry is None or stamp != _registry_stamp:
+        _registry = load_registry(agents_dir)
+        _registry_stamp = stamp
+    return _registry
+
+
+def write_json(path=REGISTRY_JSON, agents_dir=AGENTS_DIR):
+    """Atomically write the registry as JSON for the dashboard."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(get_registry(agents_dir).to_json(), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+if __name__ == "__main__":
+    if "--write-json" in sys.argv:
+        print(f"💾 Wrote {write_json()}")
+    else:
+        for agent in get_registry().agents:
+            soul = "SOUL.md" if agent["soul"] else "—"
+            print(f"  {agent['avatar']} {agent['name']:<10} @{agent['handle']:<10} {agent['dir'] or '-':<14} {soul}")
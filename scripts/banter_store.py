@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Banter Store — append-only JSONL log with a materialized "latest N" snapshot
+
+Every message the generators produce is appended as one JSON line to
+BANTER_LOG under an exclusive flock, so a roundtable and a watercooler run
+that overlap can't clobber each other, and history is no longer thrown away
+at 30 messages. Each line is stamped with ``logged_at`` (ISO local time of
+the append), since messages themselves only carry an HH:MM:SS timestamp.
+After each append the last SNAPSHOT_SIZE messages are written
+to BANTER_FILE (the {"messages": [...], "last_updated": ...} file the
+dashboard already reads) via write-to-temp + rename, so readers never see a
+half-written file.
+
+When the log grows past COMPACT_BYTES it is rewritten to its newest
+HISTORY_LIMIT messages, again via atomic rename.
+
+With --stream, in-progress messages are also published to BANTER_LIVE as
+JSONL lines ({"id", "agent", "avatar", "text", "done"}) as tokens arrive;
+the dashboard tails that file through /api/banter/stream.
+"""
+
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# ─── Paths ──────────────────────────────────────────────
+BANTER_LOG = "/Users/scott/clawd/memory/banter.jsonl"
+BANTER_FILE = "/Users/scott/clawd/deliverables/nexus-ui/src/data/banter.json"
+BANTER_LIVE = "/Users/scott/clawd/deliverables/nexus-ui/src/data/banter-live.jsonl"
+
+SNAPSHOT_SIZE = 30          # messages in the dashboard snapshot
+COMPACT_BYTES = 8 << 20     # compact the log once it passes 8 MB…
+HISTORY_LIMIT = 20_000      # …keeping this many most recent messages
+
+TAIL_BLOCK = 1 << 16
+
+LIVE_MAX_BYTES = 1 << 20    # start a fresh live feed once it passes 1 MB
+LIVE_INTERVAL = 0.1         # min seconds between partial updates per message
+
+
+@contextmanager
+def locked(log_path):
+    """Hold an exclusive lock for *log_path* (on a sidecar file that survives renames)."""
+    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+    with open(f"{log_path}.lock", 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _atomic_write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def tail(n, log_path=BANTER_LOG):
+    """Return the last *n* messages of the log, reading backwards from the end."""
+    if n <= 0:
+        return []
+    try:
+        f = open(log_path, 'rb')
+    except FileNotFoundError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]  # first line of the read window is partial
+    messages = []
+    for line in lines[-n:]:
+        try:
+            messages.append(json.loads(line))
+        except ValueError:
+            continue  # torn write from a crashed appender
+    return messages
+
+
+def write_snapshot(log_path=BANTER_LOG, snapshot_path=BANTER_FILE, size=SNAPSHOT_SIZE, now=None):
+    """Materialize the latest *size* messages into the dashboard snapshot."""
+    now = now or datetime.now()
+    snapshot = {"messages": tail(size, log_path), "last_updated": now.isoformat()}
+    _atomic_write(snapshot_path, json.dumps(snapshot, indent=2, ensure_ascii=False))
+    return snapshot
+
+
+def compact(log_path=BANTER_LOG, keep=HISTORY_LIMIT):
+    """Rewrite the log to its newest *keep* messages. Caller must hold the lock."""
+    messages = tail(keep, log_path)
+    _atomic_write(log_path, "".join(json.dumps(m, ensure_ascii=False) + "\n" for m in messages))
+
+
+def append_messages(messages, log_path=BANTER_LOG, snapshot_path=BANTER_FILE,
+                    snapshot_size=SNAPSHOT_SIZE):
+    """
+    Append *messages* to the log and refresh the snapshot, all under the
+    store lock. Returns the snapshot that was written.
+    """
+    logged_at = datetime.now().isoformat(timespec="seconds")
+    lines = "".join(json.dumps(m if "logged_at" in m else {**m, "logged_at": logged_at}, ensure_ascii=False)
+                    + "\n" for m in messages)
+    with locked(log_path):
+        if not os.path.exists(log_path):
+            _seed_from_snapshot(log_path, snapshot_path)
+        with open(log_path, 'a') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.getsize(log_path) > COMPACT_BYTES:
+            compact(log_path)
+        return write_snapshot(log_path, snapshot_path, snapshot_size)
+
+
+def _seed_from_snapshot(log_path, snapshot_path):
+    """Start a new log from an existing banter.json so no history is lost on upgrade."""
+    try:
+        with open(snapshot_path, 'r') as f:
+            messages = json.load(f).get("messages", [])
+    except Exception:
+        return
+    _atomic_write(log_path, "".join(json.dumps(m, ensure_ascii=False) + "\n" for m in messages))
+
+
+class LiveFeed:
+    """
+    Publishes in-progress messages as JSONL lines for the dashboard's live
+    stream. Partial updates are throttled per message; the final update
+    (``done``) is always written. Each line is a single O_APPEND write, so
+    concurrent publishers don't interleave.
+    """
+
+    def __init__(self, path=BANTER_LIVE, min_interval=LIVE_INTERVAL):
+        self.path = path
+        self.min_interval = min_interval
+        self._last_sent = {}
+
+    def _write(self, record):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            if os.path.getsize(self.path) > LIVE_MAX_BYTES:
+                # Readers notice the new inode and start from the top.
+                _atomic_write(self.path, "")
+        except FileNotFoundError:
+            pass
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def publish(self, message, text):
+        """Publish *text* as the current partial body of *message* (throttled)."""
+        now = time.monotonic()
+        if now - self._last_sent.get(message["id"], 0.0) < self.min_interval:
+            return
+        self._last_sent[message["id"]] = now
+        self._write({**message, "text": text, "done": False})
+
+    def finish(self, message, text=None):
+        """Publish the final body of *message*, or withdraw it if *text* is None."""
+        self._last_sent.pop(message["id"], None)
+        record = {**message, "text": text or "", "done": True}
+        if text is None:
+            record["failed"] = True
+        self._write(record)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Benchmark — roundtable and banter throughput against a stub LLM server
+
+Runs both generators end to end in a throwaway sandbox (agents, tasks,
+memory and dashboard data under a temp dir) with OPENROUTER_URL pointed at
+stub_llm_server, so no API credits are spent. Scenarios:
+
+  roundtable sequential   one roundtable after another, turns in order
+  roundtable parallel     same, with --parallel-phases
+  roundtable batch        batch_roundtable(), --batch roundtables at a time
+  banter sequential       one conversation after another
+  banter parallel         --batch conversations at a time
+
+For each it reports successful runs and runs/min, failed runs, p50/p99 LLM
+turn latency (from llm_metrics), retries, coalesced duplicate calls
+("merged") and peak Python heap (tracemalloc). Results are appended to
+benchmarks/results/bench_generators.jsonl (git-ignored, like everything
+under results/); each run is compared with the
+last one recorded under the same settings, and slowdowns beyond
+--tolerance are flagged (exit status 1).
+
+Usage:
+  python3 benchmarks/bench_generators.py
+  python3 benchmarks/bench_generators.py --latency lognormal:0.3,0.5 --failure-rate 0.05
+  python3 benchmarks/bench_generators.py --roundtables 6 --conversations 12 --batch 3
+  python3 benchmarks/bench_generators.py --only banter --no-save
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+import agent_registry  # noqa: E402
+import llm_metrics  # noqa: E402
+import memory_index  # noqa: E402
+from llm_metrics import percentile  # noqa: E402
+from stub_llm_server import start_stub_server  # noqa: E402
+
+RESULTS_FILE = os.path.join(HERE, "results", "bench_generators.jsonl")
+TOLERANCE = 0.15  # fractional slowdown that counts as a regression
+
+TASK_BODY = """# {title}
+
+Assigned to: @jarvis @friday @loki @nova
+
+## Goal
+Ship the {title} work this sprint. {filler}
+"""
+
+
+def arg_value(flag, cast=str, default=None):
+    if flag in sys.argv:
+        return cast(sys.argv[sys.argv.index(flag) + 1])
+    return default
+
+
+def build_sandbox(root, modules, task_count, create=True):
+    """Create agents/tasks/memory under *root* (unless *create* is False) and repoint the generators at it."""
+    agents_dir = os.path.join(root, "agents")
+    tasks_dir = os.path.join(root, "tasks")
+    data_dir = os.path.join(root, "data")
+    memory_dir = os.path.join(root, "memory")
+    if create:
+        for d in (tasks_dir, data_dir, memory_dir):
+            os.makedirs(d, exist_ok=True)
+        for agent_dir in agent_registry.load_registry(agents_dir).dirs():
+            os.makedirs(os.path.join(agents_dir, agent_dir), exist_ok=True)
+            with open(os.path.join(agents_dir, agent_dir, "SOUL.md"), "w") as f:
+                f.write(f"# {agent_dir}\n\nDirect, specific, a little dry. " * 8)
+        for i in range(task_count):
+            with open(os.path.join(tasks_dir, f"bench-task-{i:03d}.md"), "w") as f:
+                f.write(TASK_BODY.format(title=f"Bench Task {i}", filler="Details and constraints. " * 30))
+
+    paths = {
+        "AGENTS_DIR": agents_dir,
+        "TASKS_DIR": tasks_dir,
+        "ROUNDTABLES_DIR": os.path.join(memory_dir, "roundtables"),
+        "STATE_FILE": os.path.join(memory_dir, "roundtable-state.json"),
+        "CONVERSATION_DB": os.path.join(memory_dir, "conversations.sqlite"),
+        "BANTER_FILE": os.path.join(data_dir, "banter.json"),
+        "BANTER_LOG": os.path.join(memory_dir, "banter.jsonl"),
+        "BANTER_LIVE": os.path.join(data_dir, "banter-live.jsonl"),
+        "ACTIVITY_LOG": os.path.join(memory_dir, "activity_log.json"),
+        "RELATIONSHIPS_FILE": os.path.join(root, "state", "relationships.json"),
+    }
+    for module in modules:
+        for name, path in paths.items():
+            if hasattr(module, name):
+                setattr(module, name, path)
+    llm_metrics.PROM_FILE = os.path.join(memory_dir, "llm-metrics.prom")
+    for name in ("AGENTS_DIR", "TASKS_DIR", "ROUNDTABLES_DIR", "ACTIVITY_LOG"):
+        setattr(memory_index, name, paths[name])
+    memory_index.INDEX_DB = os.path.join(memory_dir, "memory-index.sqlite")
+    return sorted(os.listdir(tasks_dir))
+
+
+async def run_scenario(name, make_runs, client):
+    """Run the coroutines from *make_runs()* (→ (succeeded, attempted)), returning a result row."""
+    client.metrics = llm_metrics.MetricsRecorder(log_path=None)
+    before = dict(client.usage)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        runs, attempted = await make_runs()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    walls = [r["wall_s"] for r in client.metrics.records if not (r.get("cache_hit") or r.get("coalesced"))]
+    return {
+        "scenario": name,
+        "runs": runs,
+        "failed_runs": attempted - runs,
+        "seconds": round(elapsed, 3),
+        "runs_per_min": round(runs * 60 / elapsed, 2) if elapsed else 0.0,
+        "calls": len(walls),
+        "turn_p50_s": round(percentile(walls, 50) or 0.0, 4),
+        "turn_p99_s": round(percentile(walls, 99) or 0.0, 4),
+        "retries": client.usage["retries"] - before["retries"],
+        "coalesced": client.usage["coalesced"] - before["coalesced"],
+        "failures": client.usage["failures"] - before["failures"],
+        "peak_heap_kib": peak // 1024,
+    }
+
+
+def scenarios(rt, gb, tasks, roundtables, conversations, batch):
+    """(name, factory) pairs; each factory returns a coroutine yielding (succeeded, attempted) runs."""
+    picked = [tasks[i % len(tasks)] for i in range(roundtables)]
+
+    async def rt_sequential(parallel):
+        done = 0
+        for task_file in picked:
+            done += bool(await rt.run_roundtable(task_file, parallel_phases=parallel))
+        return done, len(picked)
+
+    async def rt_batch():
+        rt.store().forget_tasks()
+        completed = await rt.batch_roundtable(picked, batch, parallel_phases=True)
+        return len(completed), len(picked)
+
+    async def banter_sequential():
+        done = 0
+        for _ in range(conversations):
+            done += bool(await gb.run_conversation())
+        return done, conversations
+
+    async def banter_parallel():
+        slots = asyncio.Semaphore(batch)
+
+        async def one():
+            async with slots:
+                return bool(await gb.run_conversation())
+
+        return sum(await asyncio.gather(*[one() for _ in range(conversations)])), conversations
+
+    return [
+        ("roundtable sequential", lambda: rt_sequential(False)),
+        ("roundtable parallel", lambda: rt_sequential(True)),
+        ("roundtable batch", rt_batch),
+        ("banter sequential", banter_sequential),
+        ("banter parallel", banter_parallel),
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_baseline(config):
+    """Most recent stored result recorded with the same *config*."""
+    baseline = None
+    try:
+        with open(RESULTS_FILE) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("config") == config:
+                    baseline = entry
+    except FileNotFoundError:
+        pass
+    return baseline
+
+
+def compare(results, baseline, tolerance):
+    """Print per-scenario deltas against *baseline*; returns the regressed scenarios."""
+    previous = {r["scenario"]: r for r in baseline["results"]}
+    regressed = []
+    print(f"\nvs {baseline.get('revision') or 'baseline'} ({baseline.get('timestamp')}):")
+    for row in results:
+        old = previous.get(row["scenario"])
+        if not old or not old["runs_per_min"]:
+            continue
+        delta = row["runs_per_min"] / old["runs_per_min"] - 1
+        flag = ""
+        if delta < -tolerance:
+            flag = "  ⚠️ regression"
+            regressed.append(row["scenario"])
+        print(f"  {row['scenario']:<22} {old['runs_per_min']:>8.2f} → {row['runs_per_min']:>8.2f} /min "
+              f"({delta:+.1%}){flag}")
+    return regressed
+
+
+def main():
+    only = arg_value("--only")
+    config = {
+        "latency": arg_value("--latency", str, "lognormal:0.2,0.4"),
+        "token_latency": arg_value("--token-latency", float, 0.0),
+        "failure_rate": arg_value("--failure-rate", float, 0.0),
+        "roundtables": arg_value("--roundtables", int, 4),
+        "conversations": arg_value("--conversations", int, 8),
+        "batch": arg_value("--batch", int, 3),
+        "connections": arg_value("--max-inflight", int, 8),
+        "seed": arg_value("--seed", int, 1),
+    }
+    random.seed(config["seed"])
+
+    server = start_stub_server(latency=config["latency"], token_latency=config["token_latency"],
+                               failure_rate=config["failure_rate"])
+    os.environ["OPENROUTER_URL"] = server.url
+
+    import llm_client
+    import run_roundtable as rt
+    import generate_banter as gb
+
+    client = llm_client.configure(url=server.url, max_connections=config["connections"], cache=None)
+
+    with tempfile.TemporaryDirectory() as root:
+        tasks = build_sandbox(root, (rt, gb), max(config["roundtables"], 1))
+        results = []
+        for name, factory in scenarios(rt, gb, tasks, config["roundtables"], config["conversations"],
+                                       config["batch"]):
+            if only and not name.startswith(only):
+                continue
+            results.append(asyncio.run(run_scenario(name, factory, client)))
+    client.close()
+    server.shutdown()
+
+    print(f"Generators — stub latency {config['latency']}, failure rate {config['failure_rate']:g}, "
+          f"{config['connections']} connection(s)")
+    print(f"  {'scenario':<22} {'runs':>4} {'failed':>6} {'secs':>7} {'runs/min':>9} {'calls':>5} "
+          f"{'p50 turn':>9} {'p99 turn':>9} {'retries':>7} {'merged':>6} {'peak heap':>10}")
+    for r in results:
+        print(f"  {r['scenario']:<22} {r['runs']:>4} {r['failed_runs']:>6} {r['seconds']:>7.2f} {r['runs_per_min']:>9.2f} "
+              f"{r['calls']:>5} {r['turn_p50_s']:>8.3f}s {r['turn_p99_s']:>8.3f}s {r['retries']:>7} "
+              f"{r.get('coalesced', 0):>6} {r['peak_heap_kib']:>7} KiB")
+
+    config["only"] = only
+    baseline = load_baseline(config)
+    regressed = compare(results, baseline, arg_value("--tolerance", float, TOLERANCE)) if baseline else []
+
+    if "--no-save" not in sys.argv:
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        entry = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": git_revision(),
+                 "python": sys.version.split()[0], "config": config, "results": results}
+        with open(RESULTS_FILE, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"\n💾 Results appended to {RESULTS_FILE}")
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
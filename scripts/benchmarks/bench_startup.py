@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark — CLI startup: cold processes vs the resident nexus-agents worker
+
+Each scenario is a fresh `python3` process, run --runs times, reporting the
+median and p90 wall time:
+
+  interpreter          python3 -c pass
+  import banter        python3 -c "import generate_banter"
+  import roundtable    python3 -c "import run_roundtable"
+  cli ping             nexus_agents.py ping, answered by a running worker
+  banter cold          one conversation in a fresh process (what cron runs today)
+  banter via worker    nexus_agents.py banter, run by the warm worker
+  roundtable via worker  nexus_agents.py roundtable, alternating with and
+                       without --max-inflight 2; after each job the worker's
+                       pool size must match the flag (or MAX_CONNECTIONS)
+
+The banter scenarios run in a throwaway sandbox (see bench_generators.py)
+against stub_llm_server with no added latency, so they measure overhead,
+not the model. "banter cold" also pays for this script's sandbox bootstrap
+(a few ms of imports).
+
+Usage:
+  python3 benchmarks/bench_startup.py             # 10 runs per scenario
+  python3 benchmarks/bench_startup.py --runs 30
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(HERE, "..")
+CLI = os.path.join(SCRIPTS, "nexus_agents.py")
+sys.path.insert(0, SCRIPTS)
+
+BANTER_ARGS = ["--no-context"]  # the index refresh would dominate the first cold run
+ROUNDTABLE_ARGS = ["--task", "bench-task-000.md", "--no-context"]
+
+
+def arg_value(flag, cast=str, default=None):
+    if flag in sys.argv:
+        return cast(sys.argv[sys.argv.index(flag) + 1])
+    return default
+
+
+def child(mode, root):
+    """Entry point of the sandboxed subprocesses: a cold banter run, or the worker."""
+    import generate_banter as gb
+    import nexus_agents
+    import run_roundtable as rt
+    from bench_generators import build_sandbox
+    build_sandbox(root, (rt, gb), 0, create=False)
+    if mode == "worker":
+        nexus_agents.Worker().serve()
+        return 0
+    return nexus_agents.run_job("banter", BANTER_ARGS)
+
+
+def sandbox_env(root, server_url):
+    memory = os.path.join(root, "memory")
+    return {
+        **os.environ,
+        "OPENROUTER_URL": server_url,
+        "NEXUS_AGENTS_SOCKET": os.path.join(root, "worker.sock"),
+        "NEXUS_LLM_CACHE": os.path.join(memory, "llm-cache.sqlite"),
+        "NEXUS_LLM_METRICS": os.path.join(memory, "llm-metrics.jsonl"),
+        "NEXUS_LLM_PROM": os.path.join(memory, "llm-metrics.prom"),
+        "NEXUS_MEMORY_INDEX": os.path.join(memory, "memory-index.sqlite"),
+        "NEXUS_CONVERSATION_DB": os.path.join(memory, "conversations.sqlite"),
+    }
+
+
+def timed_runs(cmd, runs, env=None):
+    """Wall times (ms) of *runs* runs of *cmd*; raises if any run fails."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def worker_status(env):
+    out = subprocess.run([sys.executable, CLI, "status"], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def back_to_back(runs, env):
+    """
+    Roundtable jobs on the worker, alternating --max-inflight 2 and no flag.
+    Raises if an option from one job is still in effect for the next.
+    """
+    import llm_client
+    times = []
+    for i in range(runs):
+        extra = ["--max-inflight", "2"] if i % 2 == 0 else []
+        times += timed_runs([sys.executable, CLI, "roundtable"] + ROUNDTABLE_ARGS + extra, 1, env)
+        expected = 2 if extra else llm_client.MAX_CONNECTIONS
+        got = worker_status(env)["max_connections"]
+        if got != expected:
+            raise RuntimeError(f"job {i + 1}: worker pool has {got} connection(s), expected {expected}")
+    return times
+
+
+def wait_for_worker(env, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if subprocess.run([sys.executable, CLI, "ping"], env=env, stdout=subprocess.DEVNULL).returncode == 0:
+            return
+        time.sleep(0.1)
+    raise RuntimeError("worker did not start")
+
+
+def main():
+    if "--child" in sys.argv:
+        idx = sys.argv.index("--child")
+        return child(sys.argv[idx + 1], sys.argv[idx + 2])
+
+    runs = arg_value("--runs", int, 10)
+    from bench_generators import build_sandbox
+    from stub_llm_server import start_stub_server
+    import generate_banter as gb
+    import run_roundtable as rt
+
+    py = sys.executable
+    results = [
+        ("interpreter", timed_runs([py, "-c", "pass"], runs)),
+        ("import banter", timed_runs([py, "-c", "import generate_banter"], runs, {**os.environ, "PYTHONPATH": SCRIPTS})),
+        ("import roundtable", timed_runs([py, "-c", "import run_roundtable"], runs, {**os.environ, "PYTHONPATH": SCRIPTS})),
+    ]
+
+    server = start_stub_server()
+    with tempfile.TemporaryDirectory() as root:
+        build_sandbox(root, (rt, gb), 1)
+        env = sandbox_env(root, server.url)
+        worker = subprocess.Popen([py, os.path.abspath(__file__), "--child", "worker", root], env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_worker(env)
+            results.append(("cli ping", timed_runs([py, CLI, "ping"], runs, env)))
+            results.append(("banter cold", timed_runs([py, os.path.abspath(__file__), "--child", "banter", root],
+                                                      runs, env)))
+            results.append(("banter via worker", timed_runs([py, CLI, "banter"] + BANTER_ARGS, runs, env)))
+            results.append(("roundtable via worker", back_to_back(runs, env)))
+        finally:
+            subprocess.run([py, CLI, "stop"], env=env, stdout=subprocess.DEVNULL)
+            try:
+                worker.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+    server.shutdown()
+
+    print(f"Startup — {runs} run(s) per scenario, wall time per process")
+    print(f"  {'scenario':<22} {'median':>9} {'p90':>9}")
+    for name, times in results:
+        p90 = sorted(times)[min(len(times) - 1, int(len(times) * 0.9))]
+        print(f"  {name:<22} {statistics.median(times):>7.1f}ms {p90:>7.1f}ms")
+    cold = statistics.median(dict(results)["banter cold"])
+    warm = statistics.median(dict(results)["banter via worker"])
+    print(f"\n  worker saves {cold - warm:.0f} ms per banter run ({cold / warm:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark — task change detection on a large tasks directory
+
+Compares the old full-rehash scan (open + MD5 every file) with the
+stat-based task_index scan on N synthetic task files:
+
+  cold      no fingerprints yet, every file is hashed
+  warm      nothing changed, every file is skipped on stat alone
+  touched   1% of files have a new mtime but identical content
+  edited    1% of files have new content
+
+Usage:
+  python3 benchmarks/bench_task_scan.py             # 10,000 files
+  python3 benchmarks/bench_task_scan.py --files 50000
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import task_index  # noqa: E402
+
+TASK_BODY = "# Task {i}\n\nAssigned to: @jarvis @friday\n\n" + ("Details of the work. " * 40) + "\n"
+
+
+def legacy_scan(tasks_dir, discussed):
+    """The original find_undiscussed_tasks(): MD5 of every file, every run."""
+    needs = []
+    for fn in os.listdir(tasks_dir):
+        if not fn.endswith('.md'):
+            continue
+        with open(os.path.join(tasks_dir, fn), 'r') as f:
+            digest = hashlib.md5(f.read().encode()).hexdigest()
+        if discussed.get(fn) != digest:
+            needs.append(fn)
+    return needs
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    count = 10_000
+    if "--files" in sys.argv:
+        count = int(sys.argv[sys.argv.index("--files") + 1])
+
+    with tempfile.TemporaryDirectory() as tasks_dir:
+        for i in range(count):
+            with open(os.path.join(tasks_dir, f"task-{i:05d}.md"), 'w') as f:
+                f.write(TASK_BODY.format(i=i))
+
+        legacy_ms, needs = timed(legacy_scan, tasks_dir, {})
+        legacy_state = {}
+        for fn in needs:
+            with open(os.path.join(tasks_dir, fn), 'r') as f:
+                legacy_state[fn] = hashlib.md5(f.read().encode()).hexdigest()
+        legacy_warm_ms, _ = timed(legacy_scan, tasks_dir, legacy_state)
+
+        cold_ms, (changed, _) = timed(task_index.scan, tasks_dir, {})
+        discussed = dict(changed)
+        warm_ms, (changed, refreshed) = timed(task_index.scan, tasks_dir, discussed)
+        assert not changed and not refreshed
+
+        step = 100
+        for i in range(0, count, step):
+            os.utime(os.path.join(tasks_dir, f"task-{i:05d}.md"))
+        touched_ms, (changed, refreshed) = timed(task_index.scan, tasks_dir, discussed)
+        assert not changed and len(refreshed) == len(range(0, count, step))
+        discussed.update(refreshed)
+
+        for i in range(1, count, step):
+            with open(os.path.join(tasks_dir, f"task-{i:05d}.md"), 'a') as f:
+                f.write("Edited.\n")
+        edited_ms, (changed, _) = timed(task_index.scan, tasks_dir, discussed)
+        assert len(changed) == len(range(1, count, step))
+
+    print(f"Task scan — {count:,} files")
+    print(f"  {'legacy md5 (any run)':<24} {legacy_warm_ms:9.1f} ms   (first run {legacy_ms:.1f} ms)")
+    print(f"  {'indexed cold':<24} {cold_ms:9.1f} ms")
+    print(f"  {'indexed warm':<24} {warm_ms:9.1f} ms   ({legacy_warm_ms / max(warm_ms, 1e-6):.1f}× faster)")
+    print(f"  {'indexed 1% touched':<24} {touched_ms:9.1f} ms")
+    print(f"  {'indexed 1% edited':<24} {edited_ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Commitments — structured action items from the roundtable commit phase
+
+Commit turns used to end in free text ("I'll have the mockups by Friday"),
+so anything that wanted the action items had to reparse transcripts. They
+now request JSON matching COMMIT_SCHEMA:
+
+  {"message": "what the agent says to the room",
+   "commitments": [{"owner": "Nova", "deliverable": "Landing page mockups", "due": "2026-10-24"}]}
+
+parse_reply() checks a reply against the schema (validate() covers the
+JSON-Schema subset used here) and the calendar: a due date must be a real
+date, not in the past, and at most MAX_DUE_DAYS out. Owners given as
+@handles or names are normalized to the roster's display names.
+
+run_roundtable.py stores the commitments in the conversation store
+(conversation_store.py, table ``commitments``), and convex_ingest.py pushes
+them to the dashboard's Convex ``scheduled_tasks`` table.
+
+Usage:
+  python3 commitments.py                # Print COMMIT_SCHEMA
+  python3 commitments.py reply.json     # Validate a saved commit-phase reply
+"""
+
+import json
+import re
+import sys
+from datetime import date, timedelta
+
+MAX_COMMITMENTS = 3    # per commit turn
+MAX_DUE_DAYS = 90      # furthest due date accepted, from today
+
+COMMIT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "message": {"type": "string", "minLength": 1, "maxLength": 600},
+        "commitments": {
+            "type": "array",
+            "maxItems": MAX_COMMITMENTS,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "owner": {"type": "string", "minLength": 1, "maxLength": 60},
+                    "deliverable": {"type": "string", "minLength": 3, "maxLength": 280},
+                    "due": {"type": "string", "pattern": r"^\d{4}-\d{2}-\d{2}$"},
+                },
+                "required": ["owner", "deliverable", "due"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["message", "commitments"],
+    "additionalProperties": False,
+}
+
+# Appended to the commit-phase instructions; {today} is filled in per run
+INSTRUCTIONS = """Reply with JSON only, no prose around it:
+{{"message": "<what you say to the room, 1-2 sentences>",
+ "commitments": [{{"owner": "<who delivers, usually you>", "deliverable": "<one concrete deliverable>", "due": "YYYY-MM-DD"}}]}}
+At most {max_items} commitments. Today is {today}; due dates must be real dates from today on."""
+
+TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def instructions(today=None):
+    """The JSON reply instructions for a commit turn."""
+    today = today or date.today()
+    return INSTRUCTIONS.format(today=today.isoformat(), max_items=MAX_COMMITMENTS)
+
+
+def response_format():
+    """``response_format`` request field asking the provider for COMMIT_SCHEMA output."""
+    return {"type": "json_schema",
+            "json_schema": {"name": "roundtable_commitment", "strict": True, "schema": COMMIT_SCHEMA}}
+
+
+def validate(value, schema, path="$"):
+    """
+    Errors (strings naming the JSON path) of *value* against *schema*:
+    type, required, properties, additionalProperties, items, maxItems,
+    minLength, maxLength and pattern. Empty when valid.
+    """
+    expected = TYPES.get(schema.get("type"))
+    if expected and (not isinstance(value, expected) or isinstance(value, bool) and schema["type"] != "boolean"):
+        return [f"{path}: expected {schema['type']}, got {type(value).__name__}"]
+    errors = []
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}: missing {key!r}")
+        for key, item in value.items():
+            if key in properties:
+                errors += validate(item, properties[key], f"{path}.{key}")
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}: unexpected {key!r}")
+    elif isinstance(value, list):
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append(f"{path}: more than {schema['maxItems']} items")
+        if "items" in schema:
+            for i, item in enumerate(value):
+                errors += validate(item, schema["items"], f"{path}[{i}]")
+    elif isinstance(value, str):
+        if len(value.strip()) < schema.get("minLength", 0):
+            errors.append(f"{path}: shorter than {schema['minLength']} characters")
+        if "maxLength" in schema and len(value) > schema["maxLength"]:
+            errors.append(f"{path}: longer than {schema['maxLength']} characters")
+        if "pattern" in schema and not re.search(schema["pattern"], value):
+            errors.append(f"{path}: does not match {schema['pattern']}")
+    return errors
+
+
+def normalize_owner(owner, roster=None):
+    """Display name for an @handle or name on *roster* (agent_registry), else *owner* tidied."""
+    owner = owner.strip()
+    if roster is not None:
+        agent = roster.by_handle(owner.lstrip("@").lower()) or roster.by_name(owner.lstrip("@"))
+        if agent:
+            return agent["name"]
+    return owner.lstrip("@")
+
+
+def parse_reply(text, today=None, roster=None):
+    """
+    (message, commitments, errors) from a commit-phase reply. On any error
+    the commitments are empty, and message is the reply's "message" if it
+    had one, else None.
+    """
+    today = today or date.today()
+    try:
+        reply = json.loads(FENCE.sub("", (text or "").strip()))
+    except ValueError as e:
+        return None, [], [f"not valid JSON ({e})"]
+    errors = validate(reply, COMMIT_SCHEMA)
+    message = reply.get("message") if isinstance(reply, dict) and isinstance(reply.get("message"), str) else None
+    if errors:
+        return message, [], errors
+    commitments = []
+    for i, item in enumerate(reply["commitments"]):
+        try:
+            due = date.fromisoformat(item["due"])
+        except ValueError:
+            errors.append(f"$.commitments[{i}].due: {item['due']} is not a date")
+            continue
+        if due < today:
+            errors.append(f"$.commitments[{i}].due: {item['due']} is in the past (today is {today})")
+        elif due > today + timedelta(days=MAX_DUE_DAYS):
+            errors.append(f"$.commitments[{i}].due: {item['due']} is more than {MAX_DUE_DAYS} days out")
+        else:
+            commitments.append({"owner": normalize_owner(item["owner"], roster),
+                                "deliverable": item["deliverable"].strip(), "due": due.isoformat()})
+    if errors:
+        return message.strip(), [], errors
+    return message.strip(), commitments, []
+
+
+def repair_prompt(errors):
+    """Follow-up asking for a corrected reply."""
+    listed = "\n".join(f"- {e}" for e in errors[:8])
+    return f"That reply was not valid:\n{listed}\nReply again with the corrected JSON only."
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps(COMMIT_SCHEMA, indent=2))
+        sys.exit(0)
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        message, items, problems = parse_reply(f.read())
+    if problems:
+        print("❌ Invalid reply:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print(f"💬 {message}")
+    for item in items:
+        print(f"  📌 {item['owner']}: {item['deliverable']} (due {item['due']})")
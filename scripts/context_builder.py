@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Context Builder — relevant prior discussion for agent prompts
+
+Agents used to see only the current task (roundtables) or the last three
+activity log entries and a few task filenames (watercooler). build_context()
+asks the memory index (memory_index.py) for the passages of past
+roundtables and activity history that best match a task or topic, and
+packs the top-k into a strict token budget:
+
+  • the query is the task's most frequent non-trivial words, so a long task
+    file turns into a short OR query that BM25 ranks;
+  • at most one passage per source file, each clipped to SNIPPET_CHARS;
+  • passages are added best-first until TOP_K or the budget is reached.
+
+Results are cached per (task hash, index generation, k, budget), and the
+index is refreshed at most every REFRESH_INTERVAL seconds, so building the
+same context for every turn of a roundtable — or every task in a batch —
+is a dictionary lookup.
+
+Token counts are the prompt_history estimate (≈4 characters per token).
+
+Usage:
+  python3 context_builder.py <task-file>           # Context for a task file
+  python3 context_builder.py "pricing experiment"  # ...or for free text
+      [--k 5] [--budget 300]
+"""
+
+import hashlib
+import os
+import re
+import sys
+import time
+from collections import Counter, OrderedDict
+
+import memory_index
+from prompt_history import estimate_tokens
+
+# ─── Limits ─────────────────────────────────────────────
+TOP_K = 4                    # most snippets per context
+CONTEXT_TOKEN_BUDGET = 300   # tokens of retrieved context per prompt
+SNIPPET_CHARS = 360          # max characters per snippet
+QUERY_TERMS = 16             # words taken from the task for the query
+REFRESH_INTERVAL = 30.0      # seconds between index refreshes
+CACHE_SIZE = 256             # cached contexts kept in memory
+
+KINDS = ("roundtable", "activity")
+
+STOPWORDS = set("""
+a about above after again all also an and any are as at be because been before being below
+between both but by can could did do does doing done down during each few for from further get
+had has have having he her here him his how i if in into is it its just like make may me more
+most my need needs no nor not now of off on once one only or other our out over own same she
+should so some such than that the their them then there these they this those through to too
+under until up us use very via was we were what when where which while who why will with would
+you your assigned task tasks goal status notes todo
+""".split())
+
+WORD = re.compile(r"[A-Za-z][A-Za-z0-9_-]{2,}")
+
+
+def task_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def query_terms(text, limit=QUERY_TERMS):
+    """The *limit* most frequent non-stopword words of *text*, first-seen order on ties."""
+    counts = Counter()
+    first = {}
+    for i, word in enumerate(WORD.findall(text.lower())):
+        if word in STOPWORDS:
+            continue
+        counts[word] += 1
+        first.setdefault(word, i)
+    ranked = sorted(counts, key=lambda w: (-counts[w], first[w]))
+    return ranked[:limit]
+
+
+def clip_snippet(text, limit=SNIPPET_CHARS):
+    """*text* on one line, cut at a word boundary to at most *limit* characters."""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rsplit(" ", 1)[0] + "…"
+
+
+class ContextBuilder:
+    """Top-k retrieved snippets under a token budget, cached per task hash."""
+
+    def __init__(self, index=None, kinds=KINDS, refresh_interval=REFRESH_INTERVAL):
+        self.index = index
+        self.kinds = kinds
+        self.refresh_interval = refresh_interval
+        self._refreshed = None
+        self._cache = OrderedDict()
+        self.stats = Counter()
+
+    def _index(self):
+        if self.index is None:
+            self.index = memory_index.get_index()
+        now = time.monotonic()
+        if self._refreshed is None or now - self._refreshed >= self.refresh_interval:
+            self.index.refresh()
+            self._refreshed = now
+        return self.index
+
+    def snippets(self, text, k=TOP_K, budget_tokens=CONTEXT_TOKEN_BUDGET, exclude=()):
+        """[(title, snippet)] for *text*: best first, one per file, within the budget."""
+        terms = query_terms(text)
+        if not terms:
+            return []
+        results = self._index().search(" ".join(terms), kinds=self.kinds, limit=k * 4)
+        picked, seen, used = [], set(exclude), 0
+        for r in results:
+            if r["path"] in seen:
+                continue
+            snippet = clip_snippet(r["text"])
+            cost = estimate_tokens(f"- [{r['title']}] {snippet}")
+            if used + cost > budget_tokens:
+                continue
+            seen.add(r["path"])
+            picked.append((r["title"], snippet))
+            used += cost
+            if len(picked) >= k:
+                break
+        return picked
+
+    def build(self, text, k=TOP_K, budget_tokens=CONTEXT_TOKEN_BUDGET, exclude=()):
+        """Rendered context block for *text* ("" when nothing relevant is indexed)."""
+        index = self._index()
+        key = (task_hash(text), index.generation, k, budget_tokens, tuple(exclude))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._cache[key]
+        self.stats["misses"] += 1
+        block = "\n".join(f"- [{title}] {snippet}"
+                          for title, snippet in self.snippets(text, k, budget_tokens, exclude))
+        self._cache[key] = block
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return block
+
+
+_builder = None
+
+
+def get_builder():
+    """Shared builder over the default memory index."""
+    global _builder
+    if _builder is None:
+        _builder = ContextBuilder()
+    return _builder
+
+
+def build_context(text, k=TOP_K, budget_tokens=CONTEXT_TOKEN_BUDGET, exclude=()):
+    """Relevant prior discussion for *text*; never raises (returns "" on index errors)."""
+    try:
+        return get_builder().build(text, k, budget_tokens, exclude)
+    except Exception as e:
+        print(f"  ⚠️ Retrieval context unavailable: {e}")
+        return ""
+
+
+def arg_value(flag, cast=str, default=None):
+    """Return the value following *flag* in sys.argv, or *default*."""
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+if __name__ == "__main__":
+    flags_with_values = {"--k", "--budget"}
+    words = [a for i, a in enumerate(sys.argv[1:], 1)
+             if not a.startswith("--") and sys.argv[i - 1] not in flags_with_values]
+    if not words:
+        print(__doc__)
+        sys.exit(1)
+    text = " ".join(words)
+    exclude = ()
+    if len(words) == 1 and os.path.isfile(words[0]):
+        with open(words[0], "r", encoding="utf-8") as f:
+            text = f.read()
+        exclude = (os.path.abspath(words[0]),)
+    k = arg_value("--k", int, TOP_K)
+    budget = arg_value("--budget", int, CONTEXT_TOKEN_BUDGET)
+
+    builder = get_builder()
+    for label in ("cold", "cached"):
+        start = time.perf_counter()
+        block = builder.build(text, k, budget, exclude)
+        print(f"🧭 {label}: {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"   query: {' '.join(query_terms(text))}")
+    print(f"   {estimate_tokens(block) if block else 0} / {budget} tokens\n")
+    print(block or "(nothing relevant indexed)")
@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Conversation Store — runs, turns, agents, tasks and state in one SQLite file
+
+Roundtables used to exist only as markdown under memory/roundtables/, banter
+only in the JSONL log and its 30-message snapshot, and task state in
+roundtable-state.json, rewritten whole on every change. The store keeps all
+of it in one SQLite database in WAL mode:
+
+  runs    one roundtable or watercooler conversation (task, title, participants)
+  turns   one message each, keyed by its message id
+  agents  the roster the turns refer to
+  tasks   per task file: the fingerprint it was last discussed at
+  state   small key/value settings (last_roundtable, ...)
+  commitments  action items from commit turns (owner, deliverable, due date)
+
+with indexes on task, agent and timestamp, so history queries don't read
+every file. Writers take SQLite's write lock for one short transaction, so
+concurrent roundtable and banter processes are safe; readers never block.
+
+The roundtable markdown files and the banter log/snapshot are exports
+derived from it (export_markdown(), and banter_store for the dashboard).
+roundtable-state.json is imported the first time run_roundtable.py opens
+the store; --import also loads existing roundtable markdown and the banter
+log.
+
+Commitments are saved with their run and indexed by task and agent, and by
+owner and due date. A new commitment from an agent on a task supersedes that
+agent's open ones from earlier runs. Each row remembers which version of it
+was last pushed to Convex (convex_ingest.py), so only changes are sent.
+
+Usage:
+  python3 conversation_store.py                      # Recent runs
+  python3 conversation_store.py --task launch-plan.md
+  python3 conversation_store.py --agent Jarvis [--limit 20] [--since 2026-10-01]
+  python3 conversation_store.py --commitments [--task launch-plan.md | --owner Nova] [--all]
+  python3 conversation_store.py --done <commitment id>
+  python3 conversation_store.py --import             # Load existing markdown, banter log and state
+  python3 conversation_store.py --export             # Re-render roundtable markdown from the store
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+# ─── Paths ──────────────────────────────────────────────
+CONVERSATION_DB = os.environ.get("NEXUS_CONVERSATION_DB", "/Users/scott/clawd/memory/conversations.sqlite")
+ROUNDTABLES_DIR = "/Users/scott/clawd/memory/roundtables"
+STATE_FILE = "/Users/scott/clawd/memory/roundtable-state.json"
+BANTER_LOG = "/Users/scott/clawd/memory/banter.jsonl"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    name   TEXT PRIMARY KEY,
+    handle TEXT,
+    avatar TEXT,
+    dir    TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id           TEXT PRIMARY KEY,
+    kind         TEXT NOT NULL,            -- "roundtable" | "banter"
+    task_file    TEXT,
+    title        TEXT,
+    started_at   TEXT NOT NULL,            -- ISO local time
+    participants TEXT NOT NULL DEFAULT '[]',
+    meta         TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS runs_task ON runs (task_file, started_at);
+CREATE INDEX IF NOT EXISTS runs_kind ON runs (kind, started_at);
+CREATE TABLE IF NOT EXISTS turns (
+    id         TEXT PRIMARY KEY,
+    run_id     TEXT NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    seq        INTEGER NOT NULL,
+    agent      TEXT NOT NULL,
+    avatar     TEXT,
+    phase      TEXT,
+    text       TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_run ON turns (run_id, seq);
+CREATE INDEX IF NOT EXISTS turns_agent ON turns (agent, created_at);
+CREATE INDEX IF NOT EXISTS turns_created ON turns (created_at);
+CREATE TABLE IF NOT EXISTS tasks (
+    file          TEXT PRIMARY KEY,
+    fingerprint   TEXT NOT NULL,
+    discussed_at  TEXT
+);
+CREATE TABLE IF NOT EXISTS state (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS commitments (
+    id          TEXT PRIMARY KEY,          -- "<turn id>-c<n>", also the Convex ingest key
+    run_id      TEXT NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    turn_id     TEXT NOT NULL,
+    task_file   TEXT,
+    agent       TEXT NOT NULL,             -- who committed
+    owner       TEXT NOT NULL,             -- who delivers
+    deliverable TEXT NOT NULL,
+    due         TEXT NOT NULL,             -- YYYY-MM-DD
+    status      TEXT NOT NULL DEFAULT 'open',  -- open | done | superseded
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    pushed_at   TEXT                       -- updated_at of the version last pushed to Convex
+);
+CREATE INDEX IF NOT EXISTS commitments_task ON commitments (task_file, agent, status);
+CREATE INDEX IF NOT EXISTS commitments_owner ON commitments (owner, status, due);
+"""
+
+COMMITMENT_STATUSES = ("open", "done", "superseded")
+
+PHASE_LINE = re.compile(r"^### Phase: (.+)$")
+TURN_LINE = re.compile(r"^\*\*(?:(\S+) )?([^*:]+):\*\* (.*)$")
+FIELD_LINE = re.compile(r"^\*\*(Date|Task File):\*\* `?([^`]*)`?$")
+
+
+def markdown_filename(run):
+    """memory/roundtables/ name for a run, e.g. 2026-10-18-0930-launch-plan.md."""
+    stamp = datetime.fromisoformat(run["started_at"]).strftime('%Y-%m-%d-%H%M')
+    if run.get("task_file"):
+        return f"{stamp}-{run['task_file'].replace('.md', '')[:30]}.md"
+    return f"{stamp}-roundtable.md"
+
+
+def render_markdown(run, turns, commitments=()):
+    """
+    The roundtable transcript as it has always been written to
+    memory/roundtables/, followed by its action items if it has any.
+    """
+    started = datetime.fromisoformat(run["started_at"])
+    participants = ", ".join(f"{p['avatar']} {p['name']}" for p in run["participants"])
+    lines = [
+        f"# Roundtable: {run['title']}",
+        f"**Date:** {started.strftime('%Y-%m-%d %H:%M')}",
+        f"**Format:** Task collaboration — structured problem-solving",
+        f"**Participants:** {participants}",
+        f"**Task File:** `{run['task_file']}`",
+        "",
+        "---",
+        "",
+    ]
+    current_phase = None
+    for turn in turns:
+        if turn["phase"] != current_phase:
+            current_phase = turn["phase"]
+            lines.append(f"### Phase: {current_phase.title()}")
+            lines.append("")
+        lines.append(f"**{turn['avatar']} {turn['agent']}:** {turn['text']}")
+        lines.append("")
+    if commitments:
+        lines += ["---", "", "### Action Items", ""]
+        for c in commitments:
+            done = "x" if c["status"] == "done" else " "
+            lines.append(f"- [{done}] **{c['owner']}** — {c['deliverable']} (due {c['due']})")
+        lines.append("")
+    return "\n".join(lines)
+
+
+class ConversationStore:
+    """Data access for the conversation database at *path*."""
+
+    def __init__(self, path=None):
+        self.path = path or CONVERSATION_DB
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=10)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA foreign_keys=ON")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # ─── Agents ─────────────────────────────────────────
+
+    def sync_agents(self, agents):
+        """Upsert roster dicts (name, handle, avatar, dir)."""
+        with self._conn() as db:
+            db.executemany(
+                "INSERT INTO agents (name, handle, avatar, dir) VALUES (:name, :handle, :avatar, :dir) "
+                "ON CONFLICT(name) DO UPDATE SET handle = excluded.handle, avatar = excluded.avatar, "
+                "dir = excluded.dir",
+                [{k: a.get(k) for k in ("name", "handle", "avatar", "dir")} for a in agents])
+
+    # ─── Runs and turns ─────────────────────────────────
+
+    def save_run(self, run_id, kind, messages, task_file=None, title=None, participants=(),
+                 started_at=None, meta=None):
+        """
+        Store one run and its turns in a single transaction. *messages* are
+        dicts with id, agent, text and optionally avatar, phase and
+        commitments ({"owner", "deliverable", "due"} dicts); *participants*
+        are {"name", "avatar"} dicts. Saving a run id again replaces it.
+        """
+        with self._conn() as db:
+            self._insert_run(db, run_id, kind, messages, task_file, title, participants, started_at, meta)
+        return run_id
+
+    def save_runs(self, runs):
+        """Store several runs (dicts of save_run() arguments) in one transaction."""
+        with self._conn() as db:
+            for run in runs:
+                self._insert_run(db, **run)
+        return len(runs)
+
+    @staticmethod
+    def _insert_run(db, run_id, kind, messages, task_file=None, title=None, participants=(),
+                    started_at=None, meta=None):
+        started_at = started_at or datetime.now()
+        if isinstance(started_at, datetime):
+            started_at = started_at.isoformat(timespec="seconds")
+        db.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+        db.execute(
+            "INSERT INTO runs (id, kind, task_file, title, started_at, participants, meta) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (run_id, kind, task_file, title, started_at,
+             json.dumps(list(participants), ensure_ascii=False), json.dumps(meta or {}, ensure_ascii=False)))
+        db.executemany(
+            "INSERT OR REPLACE INTO turns (id, run_id, seq, agent, avatar, phase, text, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(m["id"], run_id, i + 1, m["agent"], m.get("avatar"), m.get("phase"), m["text"], started_at)
+             for i, m in enumerate(messages)])
+        now = datetime.now().isoformat()
+        items = [(f"{m['id']}-c{n}", run_id, m["id"], task_file, m["agent"], c["owner"], c["deliverable"],
+                  c["due"], now, now)
+                 for m in messages for n, c in enumerate(m.get("commitments") or (), 1)]
+        if task_file:
+            db.executemany(
+                "UPDATE commitments SET status = 'superseded', updated_at = ? "
+                "WHERE task_file = ? AND agent = ? AND status = 'open' AND run_id != ?",
+                [(now, task_file, agent, run_id) for agent in {item[4] for item in items}])
+        db.executemany(
+            "INSERT INTO commitments (id, run_id, turn_id, task_file, agent, owner, deliverable, due, "
+            "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", items)
+
+    @staticmethod
+    def _run(row):
+        run = dict(row)
+        run["participants"] = json.loads(run["participants"])
+        run["meta"] = json.loads(run["meta"])
+        return run
+
+    def get_run(self, run_id):
+        """(run dict, [turn dicts]) or (None, [])."""
+        db = self._conn()
+        row = db.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None, []
+        turns = db.execute("SELECT * FROM turns WHERE run_id = ? ORDER BY seq", (run_id,)).fetchall()
+        return self._run(row), [dict(t) for t in turns]
+
+    def recent_runs(self, limit=20, kind=None):
+        """Newest runs first, with a turn count."""
+        sql = ("SELECT r.*, (SELECT COUNT(*) FROM turns t WHERE t.run_id = r.id) AS turn_count FROM runs r"
+               + (" WHERE r.kind = ?" if kind else "") + " ORDER BY r.started_at DESC LIMIT ?")
+        params = ([kind] if kind else []) + [limit]
+        return [self._run(r) for r in self._conn().execute(sql, params)]
+
+    def runs_for_task(self, task_file, limit=20):
+        rows = self._conn().execute(
+            "SELECT * FROM runs WHERE task_file = ? ORDER BY started_at DESC LIMIT ?", (task_file, limit))
+        return [self._run(r) for r in rows]
+
+    def turns_for_agent(self, agent, since=None, limit=50):
+        """An agent's newest turns (oldest first), optionally only those at or after *since* (ISO)."""
+        sql = "SELECT * FROM turns WHERE agent = ?" + (" AND created_at >= ?" if since else "")
+        params = [agent] + ([since] if since else []) + [limit]
+        rows = self._conn().execute(sql + " ORDER BY created_at DESC, seq DESC LIMIT ?", params).fetchall()
+        return [dict(r) for r in reversed(rows)]
+
+    def export_markdown(self, run_id, directory=ROUNDTABLES_DIR):
+        """Write a roundtable run's markdown transcript (atomically); returns its path."""
+        run, turns = self.get_run(run_id)
+        if run is None:
+            return None
+        items = self._conn().execute("SELECT * FROM commitments WHERE run_id = ? ORDER BY turn_id, id",
+                                     (run_id,)).fetchall()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, markdown_filename(run))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(render_markdown(run, turns, [dict(c) for c in items]))
+        os.replace(tmp, path)
+        return path
+
+    # ─── Commitments ────────────────────────────────────
+
+    def commitments_for_task(self, task_file, agent=None, status="open"):
+        """A task's commitments by due date, optionally one agent's; *status* None means any."""
+        sql = "SELECT * FROM commitments WHERE task_file = ?"
+        params = [task_file]
+        if agent:
+            sql += " AND agent = ?"
+            params.append(agent)
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        return [dict(r) for r in self._conn().execute(sql + " ORDER BY due, id", params)]
+
+    def commitments_for_owner(self, owner, status="open", limit=50):
+        """What *owner* has to deliver, soonest first; *status* None means any."""
+        sql = "SELECT * FROM commitments WHERE owner = ?" + (" AND status = ?" if status else "")
+        params = [owner] + ([status] if status else []) + [limit]
+        return [dict(r) for r in self._conn().execute(sql + " ORDER BY due, id LIMIT ?", params)]
+
+    def open_commitments(self, limit=50):
+        rows = self._conn().execute(
+            "SELECT * FROM commitments WHERE status = 'open' ORDER BY due, id LIMIT ?", (limit,))
+        return [dict(r) for r in rows]
+
+    def set_commitment_status(self, commitment_id, status):
+        """Mark a commitment open, done or superseded; False if there is no such id."""
+        if status not in COMMITMENT_STATUSES:
+            raise ValueError(f"status must be one of {', '.join(COMMITMENT_STATUSES)}")
+        with self._conn() as db:
+            cur = db.execute("UPDATE commitments SET status = ?, updated_at = ? WHERE id = ?",
+                             (status, datetime.now().isoformat(), commitment_id))
+        return cur.rowcount > 0
+
+    def unpushed_commitments(self, limit=500):
+        """Commitments whose current version hasn't been pushed to Convex, with their run's title."""
+        rows = self._conn().execute(
+            "SELECT c.*, r.title FROM commitments c JOIN runs r ON r.id = c.run_id "
+            "WHERE c.pushed_at IS NULL OR c.pushed_at != c.updated_at ORDER BY c.updated_at LIMIT ?", (limit,))
+        return [dict(r) for r in rows]
+
+    def mark_pushed(self, versions):
+        """Record pushes: *versions* maps commitment id → the updated_at that was sent."""
+        with self._conn() as db:
+            db.executemany("UPDATE commitments SET pushed_at = updated_at WHERE id = ? AND updated_at = ?",
+                           list(versions.items()))
+
+    # ─── Tasks and state ────────────────────────────────
+
+    def discussed(self):
+        """{task file: fingerprint} for every discussed task."""
+        return {row["file"]: json.loads(row["fingerprint"])
+                for row in self._conn().execute("SELECT file, fingerprint FROM tasks")}
+
+    def mark_discussed(self, task_file, fingerprint, when=None):
+        when = (when or datetime.now()).isoformat()
+        with self._conn() as db:
+            db.execute("INSERT INTO tasks (file, fingerprint, discussed_at) VALUES (?, ?, ?) "
+                       "ON CONFLICT(file) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                       "discussed_at = excluded.discussed_at",
+                       (task_file, json.dumps(fingerprint), when))
+            self._set_state(db, "last_roundtable", when)
+
+    def refresh_fingerprints(self, fingerprints):
+        """Update stored fingerprints without touching discussed_at (touched, unchanged files)."""
+        with self._conn() as db:
+            db.executemany("UPDATE tasks SET fingerprint = ? WHERE file = ?",
+                           [(json.dumps(fp), name) for name, fp in fingerprints.items()])
+
+    def forget_tasks(self):
+        with self._conn() as db:
+            db.execute("DELETE FROM tasks")
+            db.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('state_imported', 'true')")
+
+    def get_state(self, key, default=None):
+        row = self._conn().execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def set_state(self, key, value):
+        with self._conn() as db:
+            self._set_state(db, key, value)
+
+    @staticmethod
+    def _set_state(db, key, value):
+        db.execute("INSERT INTO state (key, value) VALUES (?, ?) "
+                   "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, json.dumps(value)))
+
+    def import_state_once(self, state_file=STATE_FILE):
+        """Import *state_file* unless task state was already imported (or reset)."""
+        if not self.get_state("state_imported"):
+            self.import_state(state_file)
+
+    # ─── Import of the pre-store files ──────────────────
+
+    def import_state(self, state_file=STATE_FILE):
+        """Load roundtable-state.json's discussed tasks; returns how many."""
+        try:
+            with open(state_file, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        discussed = state.get("discussed") or {}
+        with self._conn() as db:
+            db.executemany("INSERT OR IGNORE INTO tasks (file, fingerprint, discussed_at) VALUES (?, ?, ?)",
+                           [(name, json.dumps(fp), state.get("last_roundtable")) for name, fp in discussed.items()])
+            if state.get("last_roundtable"):
+                db.execute("INSERT OR IGNORE INTO state (key, value) VALUES ('last_roundtable', ?)",
+                           (json.dumps(state["last_roundtable"]),))
+            self._set_state(db, "state_imported", True)
+        return len(discussed)
+
+    def import_markdown(self, directory=ROUNDTABLES_DIR):
+        """Load roundtable transcripts not already in the store; returns how many."""
+        runs = self.recent_runs(limit=-1, kind="roundtable")
+        known = {r["id"] for r in runs} | {markdown_filename(r) for r in runs}
+        imported = 0
+        try:
+            names = sorted(n for n in os.listdir(directory) if n.endswith(".md"))
+        except OSError:
+            return 0
+        for name in names:
+            run_id = f"md-{name[:-3]}"
+            if name in known or run_id in known:
+                continue
+            with open(os.path.join(directory, name), "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+            title = text.split("\n", 1)[0].removeprefix("# Roundtable:").strip()
+            fields = dict(m.groups() for m in map(FIELD_LINE.match, text.splitlines()) if m)
+            try:
+                started = datetime.strptime(fields.get("Date", ""), "%Y-%m-%d %H:%M")
+            except ValueError:
+                started = datetime.fromtimestamp(os.path.getmtime(os.path.join(directory, name)))
+            phase, messages, participants, in_body = None, [], {}, False
+            for line in text.splitlines():
+                if line == "---":
+                    in_body = True
+                    continue
+                if not in_body:
+                    continue
+                match = PHASE_LINE.match(line)
+                if match:
+                    phase = match.group(1).strip().lower()
+                    continue
+                match = TURN_LINE.match(line)
+                if match:
+                    avatar, agent, body = match.groups()
+                    messages.append({"id": f"{run_id}-{len(messages) + 1}", "agent": agent.strip(),
+                                     "avatar": avatar, "phase": phase, "text": body})
+                    participants.setdefault(agent.strip(), avatar)
+            self.save_run(run_id, "roundtable", messages, task_file=fields.get("Task File") or None,
+                          title=title, started_at=started,
+                          participants=[{"name": n, "avatar": a} for n, a in participants.items()],
+                          meta={"imported_from": name})
+            imported += 1
+        return imported
+
+    def import_banter_log(self, log_path=BANTER_LOG):
+        """Load watercooler conversations from the banter log (roundtable lines are skipped)."""
+        runs = {}
+        try:
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        msg = json.loads(line)
+                    except ValueError:
+                        continue
+                    msg_id = str(msg.get("id", ""))
+                    if not msg_id.startswith("wc-") or "-" not in msg_id[3:]:
+                        continue
+                    runs.setdefault(msg_id.rsplit("-", 1)[0], []).append(msg)
+        except OSError:
+            return 0
+        existing = {r["id"] for r in self.recent_runs(limit=-1, kind="banter")}
+        fresh = {run_id: msgs for run_id, msgs in runs.items() if run_id not in existing}
+        for run_id, msgs in fresh.items():
+            participants = {m["agent"]: m.get("avatar") for m in msgs}
+            self.save_run(run_id, "banter", msgs,
+                          participants=[{"name": n, "avatar": a} for n, a in participants.items()])
+        return len(fresh)
+
+
+_stores = {}
+
+
+def get_store(path=None):
+    """Shared store for *path* (default CONVERSATION_DB), one connection per process."""
+    path = path or CONVERSATION_DB
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = ConversationStore(path)
+    return store
+
+
+def arg_value(flag, cast=str, default=None):
+    """Return the value following *flag* in sys.argv, or *default*."""
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+if __name__ == "__main__":
+    store = get_store()
+    limit = arg_value("--limit", int, 20)
+    start = time.perf_counter()
+    if "--import" in sys.argv:
+        print(f"📥 Imported {store.import_state()} task state(s), {store.import_markdown()} roundtable(s), "
+              f"{store.import_banter_log()} watercooler conversation(s)")
+    elif "--export" in sys.argv:
+        runs = store.recent_runs(limit=-1, kind="roundtable")
+        for run in runs:
+            store.export_markdown(run["id"])
+        print(f"📄 Exported {len(runs)} roundtable(s) to {ROUNDTABLES_DIR}")
+    elif "--done" in sys.argv:
+        commitment_id = arg_value("--done")
+        if not store.set_commitment_status(commitment_id, "done"):
+            print(f"❌ No commitment {commitment_id}")
+            sys.exit(1)
+        print(f"✅ {commitment_id} done")
+    elif "--commitments" in sys.argv:
+        status = None if "--all" in sys.argv else "open"
+        if "--task" in sys.argv:
+            items = store.commitments_for_task(arg_value("--task"), agent=arg_value("--agent"), status=status)
+        elif "--owner" in sys.argv:
+            items = store.commitments_for_owner(arg_value("--owner"), status=status, limit=limit)
+        else:
+            items = store.open_commitments(limit)
+        for c in items:
+            print(f"  {c['due']}  {c['status']:<10} {c['owner']:<10} {c['deliverable']}  "
+                  f"[{c['task_file'] or '—'} · {c['id']}]")
+    elif "--agent" in sys.argv:
+        for t in store.turns_for_agent(arg_value("--agent"), since=arg_value("--since"), limit=limit):
+            print(f"  {t['created_at']}  [{t['phase'] or 'banter'}] {t['text']}")
+    else:
+        runs = store.runs_for_task(arg_value("--task"), limit) if "--task" in sys.argv else store.recent_runs(limit)
+        for r in runs:
+            names = ", ".join(p["name"] for p in r["participants"])
+            print(f"  {r['started_at']}  {r['kind']:<10} {r['id']:<14} {r.get('title') or r['meta'].get('topic', '')}"
+                  f"  ({names})")
+    print(f"⏱️ {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Convex Ingest — push roundtables, action items and banter into Convex
+
+Roundtable transcripts (ROUNDTABLES_DIR/*.md) become `memories` rows with
+source "roundtable", so globalSearch finds them; roundtable commitments from
+the conversation store become `scheduled_tasks` rows (source "roundtable",
+with owner, agent and task file) for the dashboard's ProjectBoard; banter
+messages from the append-only log become `activities` rows. Items are sent
+in chunks to the bulk mutations in convex/ingest.ts:
+
+  • every item has an idempotency key (roundtable:<file>, commitment:<id>,
+    banter:<message id>), so re-sending a chunk updates or skips instead of
+    duplicating;
+  • mutations are rate-limited (token bucket) and retried with backoff on
+    429/5xx, honoring Retry-After;
+  • progress is checkpointed after every acknowledged chunk, so an
+    interrupted run resumes where it stopped (for commitments, in the
+    store itself: each row remembers the version last pushed).
+
+Point CONVEX_URL at a local `npx convex dev` backend (with CONVEX_ADMIN_KEY
+if it needs one), or at stub_convex_server.py for offline runs.
+
+Usage:
+  python3 convex_ingest.py                  # Ingest whatever is new
+  python3 convex_ingest.py --dry-run        # Show what would be sent
+  python3 convex_ingest.py --chunk 50 --rate 2
+  python3 convex_ingest.py --reset          # Forget the checkpoint (keys still dedupe)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+import conversation_store
+from llm_resilience import RetryPolicy, parse_retry_after
+
+# ─── Paths ──────────────────────────────────────────────
+ROUNDTABLES_DIR = "/Users/scott/clawd/memory/roundtables"
+BANTER_LOG = "/Users/scott/clawd/memory/banter.jsonl"
+CHECKPOINT_FILE = "/Users/scott/clawd/memory/convex-ingest-state.json"
+CONVERSATION_DB = os.environ.get("NEXUS_CONVERSATION_DB", "/Users/scott/clawd/memory/conversations.sqlite")
+
+# ─── Convex ─────────────────────────────────────────────
+CONVEX_URL = os.environ.get("CONVEX_URL") or os.environ.get("NEXT_PUBLIC_CONVEX_URL", "")
+CONVEX_ADMIN_KEY = os.environ.get("CONVEX_ADMIN_KEY", "")
+MEMORIES_MUTATION = "ingest:upsertMemories"
+ACTIVITIES_MUTATION = "ingest:logActivities"
+SCHEDULED_TASKS_MUTATION = "ingest:upsertScheduledTasks"
+
+# conversation_store commitment status → scheduled_tasks status
+TASK_STATUS = {"open": "scheduled", "done": "completed", "superseded": "cancelled"}
+
+CHUNK_SIZE = 100           # items per mutation
+CHUNK_BYTES = 512 << 10    # ...and at most this much JSON per mutation
+RATE = 5.0                 # mutations per second
+REQUEST_TIMEOUT = 30
+
+PARTICIPANTS_LINE = re.compile(r"^\*\*Participants:\*\*\s*(.+)$", re.MULTILINE)
+TITLE_LINE = re.compile(r"^# Roundtable:\s*(.+)$", re.MULTILINE)
+
+
+class ConvexError(Exception):
+    """A mutation failed; ``status`` is the HTTP status when there was one."""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.kind = "network" if status is None else "http"
+
+
+class RateLimiter:
+    """Token bucket: at most *rate* acquisitions per second, bursts up to *burst*."""
+
+    def __init__(self, rate=RATE, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                time.sleep((1 - self._tokens) / self.rate)
+
+
+class ConvexClient:
+    """Minimal client for the Convex HTTP API (POST /api/mutation)."""
+
+    def __init__(self, url=CONVEX_URL, admin_key=CONVEX_ADMIN_KEY, rate=RATE, retry_policy=None,
+                 timeout=REQUEST_TIMEOUT):
+        if not url:
+            raise ConvexError("no Convex URL (set CONVEX_URL or pass --url)")
+        self.url = url.rstrip("/")
+        self.admin_key = admin_key
+        self.limiter = RateLimiter(rate)
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=30.0)
+        self.timeout = timeout
+        self.mutations = 0
+
+    def _post(self, path, args):
+        body = json.dumps({"path": path, "args": args, "format": "json"}).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.admin_key:
+            headers["Authorization"] = f"Convex {self.admin_key}"
+        req = urllib.request.Request(f"{self.url}/api/mutation", data=body, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                data = json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            raise ConvexError(f"HTTP {e.code}: {e.read()[:200].decode('utf-8', 'replace')}", status=e.code,
+                              retry_after=parse_retry_after(e.headers.get("Retry-After")))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise ConvexError(f"{type(e).__name__}: {e}")
+        if data.get("status") != "success":
+            raise ConvexError(f"{path} failed: {data.get('errorMessage') or data}", status=400)
+        return data.get("value")
+
+    def mutation(self, path, args):
+        """Run a mutation, rate-limited and retried on transient failures."""
+        attempt = 0
+        while True:
+            attempt += 1
+            self.limiter.acquire()
+            try:
+                value = self._post(path, args)
+                self.mutations += 1
+                return value
+            except ConvexError as e:
+                if not self.retry_policy.should_retry(e, attempt):
+                    raise
+                time.sleep(self.retry_policy.delay(attempt, e.retry_after))
+
+
+# ─── Checkpoint ─────────────────────────────────────────
+
+def load_checkpoint(path=CHECKPOINT_FILE):
+    try:
+        with open(path, "r") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        state = {}
+    state.setdefault("roundtables", {})
+    state.setdefault("banter", {"inode": None, "offset": 0, "last_id": None})
+    return state
+
+
+def save_checkpoint(state, path=CHECKPOINT_FILE):
+    """Atomic write, so a crash mid-save leaves the previous checkpoint intact."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# ─── Sources ────────────────────────────────────────────
+
+def roundtable_items(roundtables_dir, seen):
+    """
+    (memory item, checkpoint entry) for every transcript that is new or
+    changed since *seen* ({filename: [size, mtime_ns]}).
+    """
+    try:
+        entries = sorted((e for e in os.scandir(roundtables_dir) if e.name.endswith(".md")),
+                         key=lambda e: e.name)
+    except FileNotFoundError:
+        return []
+    items = []
+    for entry in entries:
+        st = entry.stat()
+        stamp = [st.st_size, st.st_mtime_ns]
+        if seen.get(entry.name) == stamp:
+            continue
+        with open(entry.path, "r", encoding="utf-8") as f:
+            content = f.read()
+        title = TITLE_LINE.search(content)
+        participants = PARTICIPANTS_LINE.search(content)
+        tags = ["roundtable"]
+        if participants:
+            tags += [re.sub(r"^\W+", "", p).strip() for p in participants.group(1).split(",")]
+        items.append(({
+            "ingestKey": f"roundtable:{entry.name}",
+            "title": f"Roundtable: {title.group(1).strip()}" if title else entry.name,
+            "content": content,
+            "tags": [t for t in tags if t],
+            "lastModified": st.st_mtime_ns // 1_000_000,
+            "source": "roundtable",
+        }, (entry.name, stamp)))
+    return items
+
+
+def commitment_items(store, limit=-1):
+    """
+    (scheduled task item, (commitment id, version)) for every commitment
+    whose current version hasn't been pushed yet.
+    """
+    items = []
+    for c in store.unpushed_commitments(limit):
+        due = datetime.strptime(c["due"], "%Y-%m-%d")
+        items.append(({
+            "ingestKey": f"commitment:{c['id']}",
+            "title": c["deliverable"],
+            "description": f"{c['owner']}, from the {c['title'] or c['task_file'] or 'roundtable'} roundtable",
+            "startTime": int(due.timestamp() * 1000),
+            "type": "task",
+            "status": TASK_STATUS.get(c["status"], "scheduled"),
+            "owner": c["owner"],
+            "agent": c["agent"],
+            "taskFile": c["task_file"] or "",
+            "runId": c["run_id"],
+            "source": "roundtable",
+        }, (c["id"], c["updated_at"])))
+    return items
+
+
+def message_key(message):
+    """Idempotency key for a banter message (content hash for pre-id messages)."""
+    if message.get("id"):
+        return f"banter:{message['id']}"
+    raw = json.dumps([message.get("agent"), message.get("text"), message.get("timestamp")], ensure_ascii=False)
+    return "banter:h-" + hashlib.blake2b(raw.encode("utf-8"), digest_size=10).hexdigest()
+
+
+def message_timestamp(message, file_mtime):
+    """
+    Epoch ms of a banter message. Messages only carry HH:MM:SS; anchor it to
+    the day the log line was written (its ``logged_at``, see banter_store),
+    or for lines logged before that field existed, the log file's mtime.
+    """
+    try:
+        written_at = datetime.fromisoformat(message["logged_at"])
+    except (KeyError, TypeError, ValueError):
+        written_at = file_mtime
+    try:
+        clock = datetime.strptime(message.get("timestamp", ""), "%H:%M:%S").time()
+    except ValueError:
+        return int(written_at.timestamp() * 1000)
+    stamp = datetime.combine(written_at.date(), clock)
+    if stamp > written_at + timedelta(minutes=1):
+        stamp -= timedelta(days=1)
+    return int(stamp.timestamp() * 1000)
+
+
+def banter_items(log_path, cursor):
+    """
+    (activity item, end offset) for log lines after *cursor*. If the log was
+    compacted (new inode or shorter than the offset), resume after
+    ``last_id`` when it can be found, otherwise from the top.
+    """
+    try:
+        st = os.stat(log_path)
+    except FileNotFoundError:
+        return [], None
+    offset = cursor.get("offset") or 0
+    resume_after = None
+    if cursor.get("inode") != st.st_ino or st.st_size < offset:
+        offset = 0
+        resume_after = cursor.get("last_id")
+    file_mtime = datetime.fromtimestamp(st.st_mtime)
+
+    items = []
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        pos = offset
+        for raw in f:
+            pos += len(raw)
+            if not raw.endswith(b"\n"):
+                break  # half-written line: pick it up next run
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                continue
+            key = message_key(message)
+            if resume_after:
+                if key == resume_after:
+                    resume_after = None
+                    items.clear()
+                    continue
+            items.append(({
+                "ingestKey": key,
+                "timestamp": message_timestamp(message, file_mtime),
+                "agent": message.get("agent", "?"),
+                "action": "banter",
+                "details": message.get("text", ""),
+                "status": "info",
+                "metadata": {k: message[k] for k in ("id", "avatar", "turn", "phase") if k in message},
+            }, pos))
+    return items, st.st_ino
+
+
+def chunks(items, size=CHUNK_SIZE, max_bytes=CHUNK_BYTES):
+    """Split (item, marker) pairs into chunks bounded by count and JSON size."""
+    chunk, nbytes = [], 0
+    for pair in items:
+        item_bytes = len(json.dumps(pair[0], ensure_ascii=False).encode("utf-8"))
+        if chunk and (len(chunk) >= size or nbytes + item_bytes > max_bytes):
+            yield chunk
+            chunk, nbytes = [], 0
+        chunk.append(pair)
+        nbytes += item_bytes
+    if chunk:
+        yield chunk
+
+
+# ─── Pipeline ───────────────────────────────────────────
+
+def ingest(client, roundtables_dir=ROUNDTABLES_DIR, log_path=BANTER_LOG, checkpoint_path=CHECKPOINT_FILE,
+           chunk_size=CHUNK_SIZE, dry_run=False, conversation_db=None):
+    """Send everything new since the checkpoint. Returns per-table totals."""
+    state = load_checkpoint(checkpoint_path)
+    totals = {"memories": {"inserted": 0, "updated": 0, "skipped": 0},
+              "scheduled_tasks": {"inserted": 0, "updated": 0, "skipped": 0},
+              "activities": {"inserted": 0, "updated": 0, "skipped": 0}}
+
+    def tally(table, result):
+        for k in totals[table]:
+            totals[table][k] += (result or {}).get(k, 0)
+
+    pending = roundtable_items(roundtables_dir, state["roundtables"])
+    print(f"📚 {len(pending)} roundtable transcript(s) to ingest")
+    for chunk in chunks(pending, chunk_size):
+        if dry_run:
+            continue
+        tally("memories", client.mutation(MEMORIES_MUTATION, {"items": [item for item, _ in chunk]}))
+        for _, (name, stamp) in chunk:
+            state["roundtables"][name] = stamp
+        save_checkpoint(state, checkpoint_path)
+
+    store = conversation_store.get_store(conversation_db or CONVERSATION_DB)
+    actions = commitment_items(store)
+    print(f"📌 {len(actions)} action item(s) to ingest")
+    for chunk in chunks(actions, chunk_size):
+        if dry_run:
+            continue
+        tally("scheduled_tasks", client.mutation(SCHEDULED_TASKS_MUTATION, {"items": [item for item, _ in chunk]}))
+        store.mark_pushed(dict(version for _, version in chunk))
+
+    messages, inode = banter_items(log_path, state["banter"])
+    print(f"💬 {len(messages)} banter message(s) to ingest")
+    for chunk in chunks(messages, chunk_size):
+        if dry_run:
+            continue
+        tally("activities", client.mutation(ACTIVITIES_MUTATION, {"items": [item for item, _ in chunk]}))
+        state["banter"] = {"inode": inode, "offset": chunk[-1][1], "last_id": chunk[-1][0]["ingestKey"]}
+        save_checkpoint(state, checkpoint_path)
+    if not messages and inode is not None and not dry_run and state["banter"].get("inode") != inode:
+        # Compacted log with nothing new: adopt the new file's position.
+        state["banter"] = {**state["banter"], "inode": inode, "offset": os.path.getsize(log_path)}
+        save_checkpoint(state, checkpoint_path)
+    return totals
+
+
+def arg_value(flag, cast=str, default=None):
+    """Return the value following *flag* in sys.argv, or *default*."""
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+if __name__ == "__main__":
+    if "--reset" in sys.argv and os.path.exists(CHECKPOINT_FILE):
+        os.remove(CHECKPOINT_FILE)
+        print(f"🧹 Removed checkpoint {CHECKPOINT_FILE}")
+    dry_run = "--dry-run" in sys.argv
+    try:
+        client = None if dry_run else ConvexClient(arg_value("--url", str, CONVEX_URL),
+                                                   rate=arg_value("--rate", float, RATE))
+        totals = ingest(client, chunk_size=arg_value("--chunk", int, CHUNK_SIZE), dry_run=dry_run)
+    except ConvexError as e:
+        print(f"❌ Ingest stopped: {e} (progress so far is checkpointed; rerun to resume)")
+        sys.exit(1)
+    if not dry_run:
+        for table, counts in totals.items():
+            print(f"✅ {table}: {counts['inserted']} inserted, {counts['updated']} updated, "
+                  f"{counts['skipped']} already present")
+        print(f"   {client.mutations} mutation(s)")
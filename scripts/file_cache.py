@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+File Cache — SOUL.md / task-file contents and rendered prompts, keyed on stat
+
+Entries are keyed on path and validated against (mtime_ns, size) on every
+access, so an edited SOUL.md is picked up immediately while unchanged files
+cost one stat() instead of an open+read. Rendered strings (system prompts,
+task excerpts) are cached against the same stamp, so they are rebuilt only
+when their source file changes. Both tables are LRU-bounded.
+
+Pass ``persist_path`` to keep file contents across process restarts (useful
+for --watch / batch runs); entries are still revalidated by stat on load.
+"""
+
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 256
+
+
+class FileCache:
+    """LRU cache of file contents and derived strings, invalidated by stat."""
+
+    def __init__(self, maxsize=MAX_ENTRIES, persist_path=None):
+        self.maxsize = maxsize
+        self.persist_path = persist_path
+        self.hits = 0
+        self.misses = 0
+        self._files = OrderedDict()     # path → (stamp, content)
+        self._rendered = OrderedDict()  # (key, path) → (stamp, text)
+        self._lock = threading.Lock()
+        self._dirty = False
+        if persist_path:
+            self._load()
+            atexit.register(self.flush)
+
+    @staticmethod
+    def stamp(path):
+        """Return (mtime_ns, size) for *path*, or None if it can't be stat'ed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _remember(self, table, key, value):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.maxsize:
+            table.popitem(last=False)
+
+    def read(self, path):
+        """Return the text of *path*, from cache when unchanged. None if unreadable."""
+        stamp = self.stamp(path)
+        if stamp is None:
+            return None
+        with self._lock:
+            cached = self._files.get(path)
+            if cached and cached[0] == stamp:
+                self._files.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+        try:
+            with open(path, 'r') as f:
+                content = f.read()
+        except Exception:
+            return None
+        with self._lock:
+            self.misses += 1
+            self._remember(self._files, path, (stamp, content))
+            self._dirty = True
+        return content
+
+    def render(self, key, path, build):
+        """
+        Return ``build(content)`` for *path*, cached under *key* until the file
+        changes. With ``path=None`` the result is built once and kept. Returns
+        None if the file can't be read.
+        """
+        stamp = self.stamp(path) if path else ()
+        if stamp is None:
+            return None
+        slot = (key, path)
+        with self._lock:
+            cached = self._rendered.get(slot)
+            if cached and cached[0] == stamp:
+                self._rendered.move_to_end(slot)
+                self.hits += 1
+                return cached[1]
+        content = self.read(path) if path else None
+        if path and content is None:
+            return None
+        text = build(content)
+        with self._lock:
+            self._remember(self._rendered, slot, (stamp, text))
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+            self._rendered.clear()
+
+    # ─── On-disk persistence ────────────────────────────
+
+    def _load(self):
+        try:
+            with open(self.persist_path, 'r') as f:
+                entries = json.load(f)
+        except Exception:
+            return
+        for path, entry in entries.items():
+            if self.stamp(path) == (entry["mtime_ns"], entry["size"]):
+                self._remember(self._files, path,
+                               ((entry["mtime_ns"], entry["size"]), entry["content"]))
+
+    def flush(self):
+        """Write file contents to ``persist_path`` (atomically), if configured."""
+        if not self.persist_path or not self._dirty:
+            return
+        with self._lock:
+            entries = {path: {"mtime_ns": stamp[0], "size": stamp[1], "content": content}
+                       for path, (stamp, content) in self._files.items()}
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+        tmp_path = f"{self.persist_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.persist_path)
+
+
+# ─── Process-wide cache ─────────────────────────────────
+
+_cache = None
+
+
+def get_cache():
+    """Return the shared cache. Set NEXUS_FILE_CACHE to persist it on disk."""
+    global _cache
+    if _cache is None:
+        _cache = FileCache(persist_path=os.environ.get("NEXUS_FILE_CACHE") or None)
+    return _cache
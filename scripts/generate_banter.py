@@ -6,46 +6,65 @@ Each agent gets their own LLM call with their actual SOUL.md personality.
 They see the conversation so far and respond independently, creating
 emergent, authentic dialogue — not one model scripting everyone.
 
-Cost: ~5 LLM calls × ~300 tokens = ~1500 tokens per conversation (~$0.001)
+The response cache is off by default: banter is sampled at a high
+temperature, and a tick whose prompt matched an earlier one would replay
+the same reply. --cache turns it on for dev iterations and replays.
+
+Cost: 3-5 LLM calls per conversation; measured tokens, latency and spend are
+printed at the end and logged by llm_metrics.py.
+
+Usage:
+  python3 generate_banter.py                  # One conversation
+  python3 generate_banter.py --stream         # Stream turns to the dashboard as they're typed
+  python3 generate_banter.py --cache          # Read/write the response cache (dev iteration)
+  python3 generate_banter.py --cache-only     # Replay responses stored by --cache runs, no network
+  python3 generate_banter.py --hedge           # Duplicate requests slower than the p95 latency
+  python3 generate_banter.py --no-context      # Skip retrieved history (context_builder.py)
+  python3 generate_banter.py --count 20 --workers 4  # 20 conversations over 4 processes, one write
 """
 
-import json
+import asyncio
 import os
 import random
-import urllib.request
-import urllib.error
+import sys
+import uuid
 from datetime import datetime
 
+import activity_store
+import agent_registry
+import banter_store
+import context_builder
+import conversation_store
+import llm_client
+import llm_metrics
+from file_cache import get_cache
+from llm_client import call_llm, stream_llm
+
 # ─── Paths ──────────────────────────────────────────────
 AGENTS_DIR = "/Users/scott/clawd/agents"
 ACTIVITY_LOG = "/Users/scott/clawd/memory/activity_log.json"
 BANTER_FILE = "/Users/scott/clawd/deliverables/nexus-ui/src/data/banter.json"
+BANTER_LOG = "/Users/scott/clawd/memory/banter.jsonl"
+BANTER_LIVE = "/Users/scott/clawd/deliverables/nexus-ui/src/data/banter-live.jsonl"
 TASKS_DIR = "/Users/scott/clawd/tasks/in-progress"
 RELATIONSHIPS_FILE = "/Users/scott/clawd/state/relationships.json"
-
-# ─── LLM Config ─────────────────────────────────────────
-OPENROUTER_API_KEY = "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"
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
-MODEL = "deepseek/deepseek-v3.2"
+CONVERSATION_DB = "/Users/scott/clawd/memory/conversations.sqlite"
 
 # ─── Agent Registry ─────────────────────────────────────
-# Maps agent directory name → display info
-AGENT_MAP = {
-    "analyst":      {"name": "Atlas",    "avatar": "📊", "dir": "analyst"},
-    "compliance":   {"name": "Vera",     "avatar": "🛡️", "dir": "compliance"},
-    "designer":     {"name": "DaVinci",  "avatar": "🎨", "dir": "designer"},
-    "developer":    {"name": "Jarvis",   "avatar": "⚙️", "dir": "developer"},
-    "editor":       {"name": "Athena",   "avatar": "📝", "dir": "editor"},
-    "growth":       {"name": "Hermes",   "avatar": "🚀", "dir": "growth"},
-    "producer":     {"name": "Orion",    "avatar": "🎬", "dir": "producer"},
-    "researcher":   {"name": "Friday",   "avatar": "🔍", "dir": "researcher"},
-    "security":     {"name": "Sentinel", "avatar": "🔒", "dir": "security"},
-    "seo-optimizer":{"name": "Nova",     "avatar": "🎯", "dir": "seo-optimizer"},
-    "social-media": {"name": "Mercury",  "avatar": "📱", "dir": "social-media"},
-    "strategic":    {"name": "Astra",    "avatar": "🌌", "dir": "strategic"},
-    "voice":        {"name": "Echo",     "avatar": "🎙️", "dir": "voice"},
-    "writer":       {"name": "Loki",     "avatar": "✍️", "dir": "writer"},
-}
+def registry():
+    """Agents by dir, display name and @handle (see agent_registry.py)."""
+    return agent_registry.get_registry(AGENTS_DIR)
+
+
+# Add past roundtable/activity snippets relevant to the topic (--no-context disables)
+RETRIEVAL_CONTEXT = True
+CONTEXT_TOKEN_BUDGET = 120  # kept small: the context is resent on every turn
+
+# Set to a banter_store.LiveFeed by --stream to publish turns as tokens arrive
+LIVE_FEED = None
+
+# Response cache mode without --cache / --cache-only: every tick gets fresh replies
+DEFAULT_CACHE_MODE = "off"
 
 # Interesting conversation pairings (agent dir names)
 GOOD_PAIRS = [
@@ -61,28 +80,40 @@ GOOD_PAIRS = [
 ]
 
 
+SYSTEM_PROMPT = """You are {name}, an AI agent in a team. Here is your personality:
+
+{soul}
+
+You are in a casual Slack-like chat with your coworkers. Respond naturally and in character.
+Keep it SHORT — 1-2 sentences max, like a real message. Be yourself.
+Use @mentions when referring to other agents. Occasional emoji is fine.
+Do NOT use quotation marks around your response. Just write the message directly."""
+
+
 def load_soul(agent_dir):
-    """Load an agent's SOUL.md personality file."""
-    path = os.path.join(AGENTS_DIR, agent_dir, "SOUL.md")
-    try:
-        with open(path, 'r') as f:
-            return f.read()
-    except Exception:
-        return None
+    """Load an agent's SOUL.md personality file (served from the file cache)."""
+    return get_cache().read(os.path.join(AGENTS_DIR, agent_dir, "SOUL.md"))
+
+
+def system_prompt_for(agent_dir):
+    """Rendered watercooler system prompt, rebuilt only when SOUL.md changes."""
+    info = registry().by_dir(agent_dir)
+    return get_cache().render(
+        f"watercooler:{info['name']}", os.path.join(AGENTS_DIR, agent_dir, "SOUL.md"),
+        lambda soul: SYSTEM_PROMPT.format(name=info["name"], soul=soul),
+    )
 
 
 def get_context():
     """Get current work context for grounding conversations."""
     parts = []
 
-    # Recent activity
+    # Recent activity (tail of the JSONL mirror, not a parse of the whole log)
     try:
-        if os.path.exists(ACTIVITY_LOG):
-            with open(ACTIVITY_LOG, 'r') as f:
-                logs = json.load(f)
-            if isinstance(logs, list) and logs:
-                recent = [f"- {l.get('agent','?')}: {l.get('action','?')}" for l in logs[-3:]]
-                parts.append("Recent activity:\n" + "\n".join(recent))
+        logs = activity_store.recent(3, ACTIVITY_LOG)
+        if logs:
+            recent = [f"- {l.get('agent','?')}: {l.get('action','?')}" for l in logs]
+            parts.append("Recent activity:\n" + "\n".join(recent))
     except Exception:
         pass
 
@@ -99,49 +130,17 @@ def get_context():
     return "\n".join(parts) if parts else "Working on AI agent projects and content."
 
 
-def call_llm(messages, temperature=0.85):
-    """Make a single LLM call."""
-    payload = json.dumps({
-        "model": MODEL,
-        "messages": messages,
-        "temperature": temperature,
-        "max_tokens": 150,  # Keep responses short like real Slack messages
-    }).encode('utf-8')
-
-    req = urllib.request.Request(OPENROUTER_URL, data=payload, headers={
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-    }, method="POST")
-
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read().decode('utf-8'))
-            return data['choices'][0]['message']['content'].strip()
-    except Exception as e:
-        print(f"  LLM error: {e}")
-        return None
-
-
-def generate_agent_response(agent_dir, conversation_so_far, context, topic):
+async def generate_agent_response(agent_dir, conversation_so_far, context, topic, on_text=None):
     """
     Generate a SINGLE agent's response by calling LLM with that agent's
     actual SOUL.md personality. The agent sees the conversation history
-    and responds in character.
+    and responds in character. With ``on_text``, the reply is streamed.
     """
-    info = AGENT_MAP[agent_dir]
-    soul = load_soul(agent_dir)
-    if not soul:
+    info = registry().by_dir(agent_dir)
+    system_prompt = system_prompt_for(agent_dir)
+    if not system_prompt:
         return None
 
-    system_prompt = f"""You are {info['name']}, an AI agent in a team. Here is your personality:
-
-{soul}
-
-You are in a casual Slack-like chat with your coworkers. Respond naturally and in character.
-Keep it SHORT — 1-2 sentences max, like a real message. Be yourself.
-Use @mentions when referring to other agents. Occasional emoji is fine.
-Do NOT use quotation marks around your response. Just write the message directly."""
-
     user_messages = []
     if conversation_so_far:
         chat_text = "\n".join([f"{m['agent']}: {m['text']}" for m in conversation_so_far])
@@ -157,119 +156,297 @@ Do NOT use quotation marks around your response. Just write the message directly
         })
 
     messages = [{"role": "system", "content": system_prompt}] + user_messages
-    return call_llm(messages)
+    # Short like real Slack messages: the banter route caps max_tokens (model_router.py)
+    if on_text:
+        return await stream_llm(messages, on_text, timeout=15)
+    return await call_llm(messages, timeout=15)
+
+
+def clean_response(response, names):
+    """Remove self-references like "Jarvis: " at the start, and wrapping quotes."""
+    for name in names:
+        if response.startswith(f"{name}: "):
+            response = response[len(f"{name}: "):]
+    if response.startswith('"') and response.endswith('"'):
+        response = response[1:-1]
+    return response
+
+
+TOPICS = [
+    "Something you noticed in the latest project work",
+    "A blocker or question you have for the team",
+    "An idea you want to bounce off your coworkers",
+    "Reacting to a recent task or deliverable",
+    "A quick status check with the team",
+    "Something interesting you found during your work",
+]
+
+
+def reuses_pair(participants, unused_pairs):
+    """True if *participants* include a GOOD_PAIRS pairing no longer in *unused_pairs*."""
+    return any(set(pair) <= set(participants) and list(pair) not in unused_pairs for pair in GOOD_PAIRS)
 
 
-def run_conversation():
+def pick_participants(unused_pairs=None):
     """
-    Run a multi-turn conversation where each agent independently responds.
-    Each turn is a separate LLM call with that agent's own SOUL.md.
+    Choose 2-3 agents for one conversation. With *unused_pairs*, a GOOD_PAIRS
+    pairing is used at most once (drawn or sampled, it is removed from that
+    list) until every pairing has been, when the list is refilled.
     """
-    # Pick agents
-    if random.random() < 0.7 and GOOD_PAIRS:
-        pair = random.choice(GOOD_PAIRS)
-        participants = list(pair)
+    if unused_pairs is not None and not unused_pairs:
+        unused_pairs.extend(list(p) for p in GOOD_PAIRS)  # all used: start a new round
+    agents = registry().dirs()
+    participants = None
+    if random.random() >= 0.7:
+        for _ in range(20):
+            sample = random.sample(agents, random.choice([2, 3]))
+            if unused_pairs is None or not reuses_pair(sample, unused_pairs):
+                participants = sample
+                break
+    if participants is None:
+        participants = list(random.choice(GOOD_PAIRS if unused_pairs is None else unused_pairs))
         # Sometimes add a third
         if random.random() < 0.3:
-            others = [k for k in AGENT_MAP if k not in participants]
-            participants.append(random.choice(others))
-    else:
-        participants = random.sample(list(AGENT_MAP.keys()), random.choice([2, 3]))
-
+            others = [k for k in agents if k not in participants
+                      and (unused_pairs is None or not reuses_pair(participants + [k], unused_pairs))]
+            if others:
+                participants.append(random.choice(others))
+    if unused_pairs is not None:
+        unused_pairs[:] = [p for p in unused_pairs if not set(p) <= set(participants)]
+    return participants
+
+
+def grounded_context(context, topic):
+    """*context* plus retrieved history relevant to it and *topic*."""
+    if not RETRIEVAL_CONTEXT:
+        return context
+    background = context_builder.build_context(f"{topic}\n{context}", k=2,
+                                               budget_tokens=CONTEXT_TOKEN_BUDGET)
+    return f"{context}\nRelated history:\n{background}" if background else context
+
+
+def plan_conversation(context, unused_pairs=None):
+    """Participants, topic and turn count for one conversation (picklable)."""
+    topic = random.choice(TOPICS)
+    return {
+        "run_id": uuid.uuid4().hex[:8],
+        "participants": pick_participants(unused_pairs),
+        "topic": topic,
+        "context": grounded_context(context, topic),
+        "turns": random.choice([3, 4, 4, 5]),  # 3-5 turns, alternating agents
+    }
+
+
+def plan_batch(count):
+    """Plans for *count* conversations; no GOOD_PAIRS pairing repeats until all have been used."""
     context = get_context()
+    unused_pairs = [list(p) for p in GOOD_PAIRS]
+    return [plan_conversation(context, unused_pairs) for _ in range(count)]
 
-    # Pick a conversation starter topic
-    topics = [
-        "Something you noticed in the latest project work",
-        "A blocker or question you have for the team",
-        "An idea you want to bounce off your coworkers",
-        "Reacting to a recent task or deliverable",
-        "A quick status check with the team",
-        "Something interesting you found during your work",
-    ]
-    topic = random.choice(topics)
 
-    agent_names = [AGENT_MAP[d]["name"] for d in participants]
-    print(f"🎭 Multi-turn conversation: {' ↔ '.join(agent_names)}")
+async def generate_conversation(plan, verbose=True):
+    """
+    Run one multi-turn conversation from *plan*, each agent responding
+    independently with its own SOUL.md. Returns dashboard-ready messages
+    (not yet saved), or [] if nothing was generated.
+    """
+    participants = plan["participants"]
+    roster = registry()
+    agent_names = [roster.by_dir(d)["name"] for d in participants]
+    if verbose:
+        print(f"🎭 Multi-turn conversation: {' ↔ '.join(agent_names)}")
 
     conversation = []
-    # 3-5 turns, alternating agents
-    num_turns = random.choice([3, 4, 4, 5])
-
-    for turn in range(num_turns):
-        # Pick which agent speaks this turn
-        if turn == 0:
-            speaker = participants[0]
-        else:
-            # Alternate, but allow natural flow
-            speaker = participants[turn % len(participants)]
-
-        info = AGENT_MAP[speaker]
-        print(f"  → {info['name']} thinking...", end=" ", flush=True)
-
-        response = generate_agent_response(speaker, conversation, context, topic)
-
+    run_id = plan["run_id"]
+    llm_metrics.set_labels(script="banter", run=run_id)
+
+    for turn in range(plan["turns"]):
+        # Alternate speakers, starting with the first participant
+        speaker = participants[turn % len(participants)]
+
+        info = roster.by_dir(speaker)
+        if verbose:
+            print(f"  → {info['name']} thinking...", end=" ", flush=True)
+
+        names = [info['name']] + [roster.by_dir(p)['name'] for p in participants]
+        msg_id = f"wc-{run_id}-{turn + 1}"
+        on_text = None
+        if LIVE_FEED:
+            live_msg = {"id": msg_id, "agent": info["name"], "avatar": info["avatar"]}
+            on_text = lambda text: LIVE_FEED.publish(live_msg, clean_response(text, names))
+
+        with llm_metrics.labels(agent=info["name"], turn=msg_id):
+            response = await generate_agent_response(speaker, conversation, plan["context"], plan["topic"],
+                                                     on_text=on_text)
         if response:
-            # Clean up: remove self-references like "Jarvis: " at the start
-            for name in [info['name']] + [AGENT_MAP[p]['name'] for p in participants]:
-                if response.startswith(f"{name}: "):
-                    response = response[len(f"{name}: "):]
-
-            # Remove wrapping quotes if present
-            if response.startswith('"') and response.endswith('"'):
-                response = response[1:-1]
+            response = clean_response(response, names)
+        if LIVE_FEED:
+            LIVE_FEED.finish(live_msg, response or None)
 
+        if response:
             conversation.append({
+                "id": msg_id,
                 "agent": info["name"],
                 "text": response,
             })
-            print(f"✓")
-        else:
+            if verbose:
+                print(f"✓")
+        elif verbose:
             print(f"✗ (skipped)")
 
-    if not conversation:
-        print("❌ No messages generated")
-        return
-
     # Format for frontend
     ts = datetime.now().strftime("%H:%M:%S")
     formatted = []
     for i, msg in enumerate(conversation):
-        # Find the agent info by name
-        agent_info = None
-        for key, val in AGENT_MAP.items():
-            if val["name"] == msg["agent"]:
-                agent_info = val
-                break
-        agent_info = agent_info or {"avatar": "🤖"}
-
         formatted.append({
+            "id": msg["id"],
             "agent": msg["agent"],
-            "avatar": agent_info["avatar"],
+            "avatar": roster.avatar_for(msg["agent"]),
             "color": "bg-blue-500",
             "text": msg["text"],
             "turn": i + 1,
             "timestamp": ts
         })
+    return formatted
 
-    # Load existing + append (keep last 30)
-    existing = []
-    try:
-        if os.path.exists(BANTER_FILE):
-            with open(BANTER_FILE, 'r') as f:
-                existing = json.load(f).get("messages", [])
-    except Exception:
-        pass
 
-    all_msgs = (existing + formatted)[-30:]
-    os.makedirs(os.path.dirname(BANTER_FILE), exist_ok=True)
-    with open(BANTER_FILE, 'w') as f:
-        json.dump({"messages": all_msgs, "last_updated": datetime.now().isoformat()}, f, indent=2)
+def stored_run(plan, formatted):
+    """conversation_store.save_run() arguments for a generated conversation."""
+    roster = registry()
+    return {
+        "run_id": f"wc-{plan['run_id']}",
+        "kind": "banter",
+        "messages": formatted,
+        "participants": [{"name": roster.by_dir(d)["name"], "avatar": roster.by_dir(d)["avatar"]}
+                         for d in plan["participants"]],
+        "meta": {"topic": plan["topic"]},
+    }
+
+
+async def run_conversation():
+    """
+    Run a multi-turn conversation where each agent independently responds.
+    Each turn is a separate LLM call with that agent's own SOUL.md.
+    Returns the saved messages, or None if nothing was generated.
+    """
+    plan = plan_conversation(get_context())
+    formatted = await generate_conversation(plan)
+    if not formatted:
+        print("❌ No messages generated")
+        return None
+
+    # Record the run, then export to the banter log; the dashboard snapshot keeps the latest 30
+    conversation_store.get_store(CONVERSATION_DB).save_run(**stored_run(plan, formatted))
+    banter_store.append_messages(formatted, log_path=BANTER_LOG, snapshot_path=BANTER_FILE)
 
     print(f"\n✅ {len(formatted)} messages saved:")
     for m in formatted:
         print(f"   {m['avatar']} {m['agent']}: {m['text']}")
 
+    metrics = llm_client.get_client().metrics
+    if metrics is not None:
+        print(f"\n📈 LLM calls (run {plan['run_id']}):")
+        print(llm_metrics.summary_table(metrics.select(run=plan["run_id"])))
+    return formatted
+
+
+# ─── Batch mode (--count / --workers) ───────────────────
+
+async def generate_many(plans):
+    """Generate every planned conversation concurrently on the shared client."""
+    results = await asyncio.gather(*[generate_conversation(plan, verbose=False) for plan in plans])
+    for plan, formatted in zip(plans, results):
+        names = " ↔ ".join(registry().by_dir(d)["name"] for d in plan["participants"])
+        print(f"  {'✓' if formatted else '✗'} {names} ({len(formatted)} message(s))", flush=True)
+    return results
+
+
+def apply_options(options):
+    """
+    Configure this process from the CLI options (workers don't inherit
+    globals under spawn). Options not given are reset to their defaults.
+    """
+    global LIVE_FEED
+    LIVE_FEED = banter_store.LiveFeed(BANTER_LIVE) if options.get("stream") else None
+    llm_client.set_cache_mode(options.get("cache_mode") or DEFAULT_CACHE_MODE)
+    llm_client.set_hedging(bool(options.get("hedge")))
+
+
+def _worker(plans, options):
+    """Process-pool entry point: generate *plans*, return (conversations, usage)."""
+    apply_options(options)
+    results = asyncio.run(generate_many(plans))
+    return results, dict(llm_client.get_client().usage)
+
+
+def run_batch(count, workers=1, options=None):
+    """
+    Generate *count* conversations across *workers* processes (asyncio
+    within each), then commit them to the banter store in one write.
+    """
+    options = options or {}
+    plans = plan_batch(count)
+    workers = max(1, min(workers, count))
+    print(f"🎭 Generating {count} conversation(s) with {workers} worker(s)...")
+
+    usage = {}
+    if workers == 1:
+        results = asyncio.run(generate_many(plans))
+        usage = dict(llm_client.get_client().usage)
+    else:
+        # Round-robin slices keep the workers' loads even; order is restored below.
+        slices = [plans[i::workers] for i in range(workers)]
+        results = [None] * count
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing: batch mode only
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_worker, chunk, options) for chunk in slices]
+            for i, future in enumerate(futures):
+                chunk_results, chunk_usage = future.result()
+                for j, formatted in enumerate(chunk_results):
+                    results[i + j * workers] = formatted
+                for key, value in chunk_usage.items():
+                    usage[key] = usage.get(key, 0) + value
+
+    messages = [m for formatted in results for m in formatted]
+    if not messages:
+        print("❌ No messages generated")
+        return []
+    conversation_store.get_store(CONVERSATION_DB).save_runs(
+        [stored_run(plan, formatted) for plan, formatted in zip(plans, results) if formatted])
+    banter_store.append_messages(messages, log_path=BANTER_LOG, snapshot_path=BANTER_FILE)
+    generated = sum(1 for formatted in results if formatted)
+    print(f"\n✅ {generated}/{count} conversation(s), {len(messages)} messages saved in one write "
+          f"({usage.get('prompt_tokens', 0) + usage.get('completion_tokens', 0)} tokens, "
+          f"~${usage.get('cost_usd', 0.0):.4f}, {usage.get('coalesced', 0)} coalesced, "
+          f"{usage.get('retries', 0)} retried)")
+    return results
+
+
+def arg_value(flag, cast=str, default=None):
+    """Return the value following *flag* in sys.argv, or *default*."""
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+def main():
+    """Run the command line in sys.argv (called once per job by nexus_agents.py)."""
+    global RETRIEVAL_CONTEXT
+    options = {
+        "stream": "--stream" in sys.argv,
+        "cache_mode": "only" if "--cache-only" in sys.argv else "use" if "--cache" in sys.argv else None,
+        "hedge": "--hedge" in sys.argv,
+    }
+    apply_options(options)
+    RETRIEVAL_CONTEXT = "--no-context" not in sys.argv  # plans (and their context) are built here
+    count = arg_value("--count", int)
+    if count:
+        run_batch(count, workers=arg_value("--workers", int, 1), options=options)
+    else:
+        asyncio.run(run_conversation())
+
 
 if __name__ == "__main__":
-    run_conversation()
+    main()
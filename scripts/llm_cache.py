@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache — content-addressed SQLite cache in front of the client
+
+Keys are the SHA-256 of the normalized request (model, messages,
+temperature, max_tokens), so re-discussing an unchanged task or retrying a
+crashed run replays answers instead of paying for them again. Entries
+expire after a TTL, and once the cache outgrows MAX_BYTES the least recently
+used entries are evicted.
+
+Modes (see llm_client.set_cache_mode, --no-cache / --cache / --cache-only):
+  use    read through the cache and store new answers (roundtable default)
+  off    bypass the cache entirely (banter default; --cache turns it on)
+  only   serve from the cache; a miss is an error, never a network call
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+CACHE_DB = os.environ.get("NEXUS_LLM_CACHE", "/Users/scott/clawd/memory/llm-cache.sqlite")
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+MAX_BYTES = 64 << 20
+EVICT_EVERY = 64             # puts between size checks
+
+CACHE_MODES = ("use", "off", "only")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key       TEXT PRIMARY KEY,
+    model     TEXT NOT NULL,
+    response  TEXT NOT NULL,
+    usage     TEXT,
+    size      INTEGER NOT NULL,
+    created   REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used);
+CREATE INDEX IF NOT EXISTS responses_created ON responses(created);
+"""
+
+
+def normalize_content(text):
+    """Whitespace-insensitive form of a message body."""
+    return "\n".join(line.rstrip() for line in str(text).strip().splitlines())
+
+
+def cache_key(payload):
+    """SHA-256 over the fields that determine a completion."""
+    canonical = {
+        "model": payload.get("model"),
+        "messages": [{"role": m.get("role"), "content": normalize_content(m.get("content", ""))}
+                     for m in payload.get("messages") or []],
+        "temperature": payload.get("temperature"),
+        "max_tokens": payload.get("max_tokens"),
+    }
+    if payload.get("response_format"):
+        # Only when set, so keys of plain-text requests are unchanged
+        canonical["response_format"] = payload["response_format"]
+    raw = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL and size-based LRU eviction."""
+
+    def __init__(self, path=CACHE_DB, ttl=DEFAULT_TTL, max_bytes=MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+        self._puts = 0
+
+    def _conn(self):
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+            self.evict()
+        return self._db
+
+    def reopen(self):
+        """Forget the connection without closing it (it belongs to the parent
+        after a fork); the next access reconnects."""
+        self._db = None
+
+    def get(self, key):
+        """Cached ``(text, usage)`` for *key*, or None if missing or expired."""
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT response, usage, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[2] > self.ttl:
+            self.misses += 1
+            return None
+        self._conn().execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0], json.loads(row[1]) if row[1] else {}
+
+    def put(self, key, model, text, usage=None):
+        now = time.time()
+        usage_json = json.dumps(usage) if usage else None
+        size = len(text.encode("utf-8")) + len(key) + len(usage_json or "")
+        self._conn().execute(
+            "INSERT OR REPLACE INTO responses (key, model, response, usage, size, created, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, model, text, usage_json, size, now, now))
+        self._puts += 1
+        if self._puts % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least-recently-used ones until under max_bytes."""
+        db = self._conn()
+        db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+"""
+Shared LLM Client — pooled, async access to the chat-completions endpoint
+
+Used by run_roundtable.py and generate_banter.py instead of building a fresh
+urllib request (and TLS handshake) per turn. Requests run on a small thread
+pool over persistent keep-alive ``http.client`` connections, so a 12-turn
+roundtable reuses the same socket instead of reconnecting 12 times.
+
+Point OPENROUTER_URL at a local server (see stub_llm_server.py) to run the
+generators without touching the real API.
+
+Completions are read through llm_cache.ResponseCache when one is attached
+(the shared client attaches one by default; see set_cache_mode()).
+
+Failed attempts are retried with jittered backoff (honoring Retry-After)
+behind a circuit breaker, and with ``hedge=True`` a duplicate request is
+raced against any call that outlives the observed p95 latency. Failures
+surface as LLMError with a ``kind`` (timeout, rate_limited, http, network,
+circuit_open, bad_response, cache_miss) and the attempts it took.
+
+Each call is recorded by llm_metrics.MetricsRecorder (wall time, TTFB,
+tokens, cost, attempts) under the labels active at the call site.
+
+Identical requests already in flight on the same event loop (same model,
+messages, temperature, max_tokens and response_format) are coalesced: one upstream call is
+made and every caller gets its result; counted as ``usage["coalesced"]``.
+Coalescing is independent of the cache mode: "off" only skips the
+persistent response cache. Pass ``coalesce=False`` to make every call.
+
+With a model_router.ModelRouter attached (the shared client has one), the
+model, max_tokens and temperature a caller leaves unset come from the route
+for those labels, and every call's latency and outcome feed the router's
+per-model health, which fails degraded models over.
+"""
+
+import asyncio
+import collections
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from llm_cache import CACHE_MODES, ResponseCache, cache_key
+from llm_metrics import MetricsRecorder, current_labels
+from model_router import get_router
+from llm_resilience import CircuitBreaker, LatencyTracker, RetryPolicy, parse_retry_after
+
+# ─── LLM Config ─────────────────────────────────────────
+OPENROUTER_API_KEY = os.environ.get(
+    "OPENROUTER_API_KEY",
+    "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",
+)
+OPENROUTER_URL = os.environ.get("OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions")
+MODEL = "deepseek/deepseek-v3.2"
+
+# USD per 1M (prompt, completion) tokens — used for budget estimates only.
+MODEL_PRICING = {
+    "deepseek/deepseek-v3.2": (0.27, 0.40),
+    "google/gemini-2.5-flash-lite": (0.10, 0.40),
+    "openai/gpt-4.1": (2.00, 8.00),
+}
+
+# Used when neither the caller nor the route sets them
+DEFAULT_MAX_TOKENS = 200
+DEFAULT_TEMPERATURE = 0.8
+
+# ─── Pool Config ────────────────────────────────────────
+MAX_CONNECTIONS = int(os.environ.get("NEXUS_LLM_CONNECTIONS", "4"))
+REQUEST_TIMEOUT = 20  # seconds, per request
+RETRY_ATTEMPTS = 3    # attempts per call, including the first
+HEDGE_MIN_DELAY = 0.1 # never hedge sooner than this, whatever the p95
+
+# Errors that mean a reused keep-alive socket was closed by the server
+# between requests; the request is safe to replay once on a fresh socket.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class LLMError(Exception):
+    """
+    A failed LLM call. ``kind`` classifies the failure; ``attempts`` and
+    ``elapsed`` are filled in once retries are exhausted.
+    """
+
+    def __init__(self, message, status=None, kind=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.kind = kind or ("rate_limited" if status == 429 else "http" if status else "bad_response")
+        self.retry_after = retry_after
+        self.attempts = 1
+        self.elapsed = 0.0
+
+    def describe(self):
+        return f"[{self.kind}] {self} (after {self.attempts} attempt(s), {self.elapsed:.1f}s)"
+
+
+def as_llm_error(exc):
+    """Classify any exception from an attempt as an LLMError."""
+    if isinstance(exc, LLMError):
+        return exc
+    if isinstance(exc, TimeoutError):
+        return LLMError(str(exc) or "timed out", kind="timeout")
+    if isinstance(exc, (OSError, http.client.HTTPException)):
+        return LLMError(f"{type(exc).__name__}: {exc}", kind="network")
+    return LLMError(f"{type(exc).__name__}: {exc}", kind="bad_response")
+
+
+class LLMClient:
+    """
+    Async chat-completions client backed by a keep-alive connection pool.
+
+    ``max_connections`` bounds both the number of pooled sockets and the
+    number of requests in flight; ``timeout`` is the default per-attempt
+    deadline in seconds.
+    """
+
+    def __init__(self, url=OPENROUTER_URL, api_key=OPENROUTER_API_KEY, model=MODEL,
+                 max_connections=MAX_CONNECTIONS, timeout=REQUEST_TIMEOUT,
+                 cache=None, cache_mode="use", retry_policy=None, breaker=None, hedge=False,
+                 metrics=None, router=None, coalesce=True):
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}")
+        parts = urlsplit(url)
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.max_connections = max(1, max_connections)
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+            "Connection": "keep-alive",
+        }
+        self._idle = []
+        self._lock = threading.Lock()
+        # Timed-out and losing hedged attempts finish on their worker thread
+        # after their slot is released, so leave headroom beyond the pool.
+        self._executor = ThreadPoolExecutor(max_workers=self.max_connections * 2,
+                                            thread_name_prefix="llm")
+        self._sem = None
+        self._sem_loop = None
+        self.cache = cache
+        self.cache_mode = cache_mode
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=RETRY_ATTEMPTS)
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.hedge = hedge
+        self.metrics = metrics
+        self.router = router
+        self.coalesce = coalesce
+        self._inflight = {}   # flight key → future of the request being made
+        self.usage = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+                      "cache_hits": 0, "coalesced": 0, "retries": 0, "hedges": 0, "failures": 0}
+        self.failure_kinds = collections.Counter()
+
+    # ─── Connection pool ────────────────────────────────
+
+    def _connect(self, timeout):
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=timeout)
+
+    def _checkout(self, timeout):
+        """Take an idle connection, or open a new one. Returns (conn, reused)."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            return self._connect(timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _checkin(self, conn):
+        with self._lock:
+            if len(self._idle) < self.max_connections:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _send(self, body, timeout):
+        """POST on a pooled connection; returns (conn, resp) once headers arrive."""
+        for attempt in range(2):
+            conn, reused = self._checkout(timeout)
+            try:
+                conn.request("POST", self._path, body=body, headers=self._headers)
+                return conn, conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+    def _release(self, conn, resp):
+        """Return a fully-read connection to the pool, or close it."""
+        if resp.will_close or not resp.isclosed():
+            conn.close()
+        else:
+            self._checkin(conn)
+
+    def _raise_for_status(self, resp, raw):
+        if resp.status >= 400:
+            snippet = raw[:200].decode("utf-8", "replace")
+            raise LLMError(f"HTTP {resp.status}: {snippet}", status=resp.status,
+                           retry_after=parse_retry_after(resp.getheader("Retry-After")))
+
+    def _post(self, body, timeout):
+        """
+        Blocking POST on a pooled connection. Returns the decoded JSON body
+        and the monotonic time the response headers arrived.
+        """
+        conn, resp = self._send(body, timeout)
+        first_byte = time.monotonic()
+        try:
+            raw = resp.read()
+        except Exception:
+            conn.close()
+            raise
+        self._release(conn, resp)
+        self._raise_for_status(resp, raw)
+        try:
+            return json.loads(raw.decode("utf-8")), first_byte
+        except ValueError as e:
+            raise LLMError(f"invalid JSON response: {e}", status=resp.status)
+
+    def _post_stream(self, body, timeout, emit):
+        """
+        Blocking POST of a ``stream: true`` request. Calls ``emit(text)`` for
+        every content delta in the SSE body and returns the final usage block
+        (``{"usage": {...}}``, possibly empty). *timeout* bounds the whole
+        stream, not just each read.
+        """
+        deadline = time.monotonic() + timeout
+        conn, resp = self._send(body, timeout)
+        if resp.status >= 400:
+            raw = resp.read()
+            self._release(conn, resp)
+            self._raise_for_status(resp, raw)
+        result = {}
+        try:
+            while True:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"stream exceeded {timeout}s")
+                line = resp.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue  # blank separators and ": keep-alive" comments
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    continue
+                if chunk.get("usage"):
+                    result["usage"] = chunk["usage"]
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        emit(delta)
+            resp.read()  # drain the terminating chunk so the socket can be reused
+        except Exception:
+            conn.close()
+            raise
+        self._release(conn, resp)
+        return result
+
+    def _semaphore(self):
+        # asyncio primitives bind to the loop that first awaits them, so keep
+        # one per loop in case the client outlives an asyncio.run() call.
+        loop = asyncio.get_running_loop()
+        if self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_connections)
+            self._sem_loop = loop
+        return self._sem
+
+    def _record_usage(self, data, model):
+        """Add a response's usage block to the totals; returns (prompt, completion, cost)."""
+        usage = data.get("usage") or {}
+        prompt = usage.get("prompt_tokens") or 0
+        completion = usage.get("completion_tokens") or 0
+        price = self.router.price(model) if self.router is not None else None
+        prompt_price, completion_price = price or MODEL_PRICING.get(model, (0.0, 0.0))
+        cost = (prompt * prompt_price + completion * completion_price) / 1_000_000
+        self.usage["requests"] += 1
+        self.usage["prompt_tokens"] += prompt
+        self.usage["completion_tokens"] += completion
+        self.usage["cost_usd"] += cost
+        return prompt, completion, cost
+
+    def _new_call(self, payload):
+        """Per-call bookkeeping shared by the retry loop and the metrics record."""
+        return {"model": payload["model"], "started": time.monotonic(), "attempts": 0,
+                "hedged": False, "first_byte": None}
+
+    def _observe(self, call, ok=True, usage=(0, 0, 0.0), cache_hit=False, coalesced=False, error=None):
+        now = time.monotonic()
+        if self.router is not None and not (cache_hit or coalesced):
+            self.router.observe(call["model"], now - call["started"], ok, error.kind if error else None)
+        if self.metrics is None:
+            return
+        prompt, completion, cost = usage
+        self.metrics.record(
+            model=call["model"], ok=ok, cache_hit=cache_hit, coalesced=coalesced,
+            wall_s=round(now - call["started"], 4),
+            ttfb_s=round(call["first_byte"] - call["started"], 4) if call["first_byte"] else None,
+            prompt_tokens=prompt, completion_tokens=completion, cost_usd=round(cost, 8),
+            attempts=call["attempts"], hedged=call["hedged"], error=error.kind if error else None)
+
+    @property
+    def total_tokens(self):
+        return self.usage["prompt_tokens"] + self.usage["completion_tokens"]
+
+    def _cache_lookup(self, payload):
+        """Return (key, cached_text). Raises on a miss in cache-only mode."""
+        if self.cache is None or self.cache_mode == "off":
+            return None, None
+        key = cache_key(payload)
+        hit = self.cache.get(key)
+        if hit is not None:
+            self.usage["cache_hits"] += 1
+            return key, hit[0]
+        if self.cache_mode == "only":
+            raise LLMError("cache miss in cache-only mode", kind="cache_miss")
+        return key, None
+
+    def _cache_store(self, key, payload, text, usage=None):
+        if key is not None and text:
+            self.cache.put(key, payload["model"], text, usage)
+
+    def build_payload(self, messages, max_tokens=None, temperature=None, model=None, response_format=None):
+        """
+        Request body; settings left as None come from the route for the
+        current labels. *response_format* (e.g. a JSON schema) is passed through.
+        """
+        route = {}
+        if self.router is not None and (model is None or max_tokens is None or temperature is None):
+            route = self.router.route(current_labels(), self.model)
+        payload = {
+            "model": model or route.get("model") or self.model,
+            "messages": messages,
+            "temperature": temperature if temperature is not None else route.get("temperature", DEFAULT_TEMPERATURE),
+            "max_tokens": max_tokens or route.get("max_tokens") or DEFAULT_MAX_TOKENS,
+        }
+        if response_format:
+            payload["response_format"] = response_format
+        return payload
+
+    # ─── Single flight ──────────────────────────────────
+
+    def _flight_key(self, payload, key):
+        """Key under which identical in-flight requests are coalesced, or None."""
+        if not self.coalesce:
+            return None
+        return key or cache_key(payload)
+
+    def _leader(self, flight_key):
+        """The in-flight request *flight_key* can wait for, on this loop, or None."""
+        flight = self._inflight.get(flight_key) if flight_key else None
+        if flight is None or flight.done() or flight.get_loop() is not asyncio.get_running_loop():
+            return None
+        return flight
+
+    def _lead(self, flight_key):
+        if flight_key is None:
+            return None
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = flight
+        return flight
+
+    def _land(self, flight_key, flight, text=None, error=None):
+        """Hand the leader's outcome to everyone waiting on *flight*."""
+        if flight is None:
+            return
+        if self._inflight.get(flight_key) is flight:
+            del self._inflight[flight_key]
+        if flight.done():
+            return
+        if error is None:
+            flight.set_result(text)
+        elif isinstance(error, Exception):
+            flight.set_exception(error)
+            flight.exception()  # retrieved: there may be no one waiting
+        else:
+            flight.cancel()
+
+    async def _follow(self, flight, call):
+        """Wait for an identical request already in flight instead of sending another."""
+        self.usage["coalesced"] += 1
+        try:
+            text = await asyncio.shield(flight)
+        except asyncio.CancelledError:
+            if not flight.cancelled():
+                raise  # we were cancelled, not the leader
+            error = LLMError("coalesced request was cancelled", kind="network")
+            self._observe(call, ok=False, coalesced=True, error=error)
+            raise error
+        except LLMError as e:
+            self._observe(call, ok=False, coalesced=True, error=e)
+            raise
+        self._observe(call, coalesced=True)
+        return text
+
+    # ─── Attempts, retries and hedging ──────────────────
+
+    async def _attempt(self, body, timeout):
+        """One buffered request, holding a pool slot for its duration."""
+        loop = asyncio.get_running_loop()
+        async with self._semaphore():
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, self._post, body, timeout), timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"timed out after {timeout}s")
+
+    async def _hedged(self, body, timeout, call):
+        """
+        Run an attempt; if hedging is on and it outlives the observed p95,
+        race a duplicate and take whichever answers first.
+        """
+        threshold = self.latency.p95() if self.hedge else None
+        if threshold is not None:
+            threshold = max(threshold, HEDGE_MIN_DELAY)
+        if threshold is None or threshold >= timeout:
+            return await self._attempt(body, timeout)
+        primary = asyncio.ensure_future(self._attempt(body, timeout))
+        done, _ = await asyncio.wait({primary}, timeout=threshold)
+        if done:
+            return primary.result()
+        self.usage["hedges"] += 1
+        call["hedged"] = True
+        pending = {primary, asyncio.ensure_future(self._attempt(body, timeout))}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    def _before_attempt(self, call):
+        if not self.breaker.allow():
+            self._fail(call, LLMError(f"circuit open, retry in {self.breaker.retry_in():.0f}s",
+                                      kind="circuit_open"))
+        call["attempts"] += 1
+
+    def _fail(self, call, error):
+        error.attempts = call["attempts"]
+        error.elapsed = time.monotonic() - call["started"]
+        self.usage["failures"] += 1
+        self.failure_kinds[error.kind] += 1
+        self._observe(call, ok=False, error=error)
+        raise error
+
+    async def _after_failure(self, call, exc, retry_allowed=True):
+        """Classify a failed attempt; sleep before the next one or raise."""
+        error = as_llm_error(exc)
+        retryable = self.retry_policy.should_retry(error, call["attempts"])
+        if error.kind in ("timeout", "network") or error.status in self.retry_policy.retry_statuses:
+            self.breaker.record_failure()
+        if not (retryable and retry_allowed):
+            self._fail(call, error)
+        self.usage["retries"] += 1
+        await asyncio.sleep(self.retry_policy.delay(call["attempts"], error.retry_after))
+
+    # ─── Public API ─────────────────────────────────────
+
+    async def complete(self, messages, max_tokens=None, temperature=None, timeout=None, model=None,
+                       response_format=None):
+        """Return the stripped completion text for *messages*; raises LLMError on failure."""
+        timeout = timeout or self.timeout
+        payload = self.build_payload(messages, max_tokens, temperature, model, response_format)
+        call = self._new_call(payload)
+        key, cached = self._cache_lookup(payload)
+        if cached is not None:
+            self._observe(call, cache_hit=True)
+            return cached
+        flight_key = self._flight_key(payload, key)
+        leader = self._leader(flight_key)
+        if leader is not None:
+            return await self._follow(leader, call)
+        flight = self._lead(flight_key)
+        try:
+            text = await self._complete(payload, call, key, timeout)
+        except BaseException as e:
+            self._land(flight_key, flight, error=e)
+            raise
+        self._land(flight_key, flight, text)
+        return text
+
+    async def _complete(self, payload, call, key, timeout):
+        body = json.dumps(payload).encode("utf-8")
+        while True:
+            self._before_attempt(call)
+            attempt_started = time.monotonic()
+            data = None
+            try:
+                data, call["first_byte"] = await self._hedged(body, timeout, call)
+            except Exception as e:
+                await self._after_failure(call, e)
+                continue
+            try:
+                text = data["choices"][0]["message"]["content"].strip()
+            except (KeyError, IndexError, TypeError, AttributeError):
+                await self._after_failure(call, LLMError(f"unexpected response shape: {str(data)[:200]}"))
+                continue
+            self.breaker.record_success()
+            self.latency.add(time.monotonic() - attempt_started)
+            break
+        usage = self._record_usage(data, payload["model"])
+        self._observe(call, usage=usage)
+        self._cache_store(key, payload, text, data.get("usage"))
+        return text
+
+    async def _stream_attempt(self, body, timeout, result):
+        """One streamed request; yields deltas and leaves the usage block in *result*."""
+        loop = asyncio.get_running_loop()
+        deltas = asyncio.Queue()
+
+        def emit(delta):
+            loop.call_soon_threadsafe(deltas.put_nowait, delta)
+
+        async with self._semaphore():
+            future = loop.run_in_executor(self._executor, self._post_stream, body, timeout, emit)
+            # The executor future resolves via call_soon_threadsafe after every
+            # emit() already queued, so None always arrives last.
+            future.add_done_callback(lambda _: deltas.put_nowait(None))
+            while True:
+                delta = await deltas.get()
+                if delta is None:
+                    break
+                yield delta
+            result.update(await future)
+
+    async def stream(self, messages, max_tokens=None, temperature=None, timeout=None, model=None):
+        """
+        Async generator of content deltas from a streamed completion.
+        Failures before the first delta are retried like ``complete()``;
+        once text has been yielded a failure is raised as-is.
+        """
+        timeout = timeout or self.timeout
+        payload = self.build_payload(messages, max_tokens, temperature, model)
+        call = self._new_call(payload)
+        key, cached = self._cache_lookup(payload)
+        if cached is not None:
+            self._observe(call, cache_hit=True)
+            yield cached
+            return
+        flight_key = self._flight_key(payload, key)
+        leader = self._leader(flight_key)
+        if leader is not None:
+            yield await self._follow(leader, call)  # the whole reply at once
+            return
+        flight = self._lead(flight_key)
+        parts = []
+        try:
+            async for delta in self._stream(payload, call, key, timeout):
+                parts.append(delta)
+                yield delta
+        except BaseException as e:
+            self._land(flight_key, flight, error=e)
+            raise
+        self._land(flight_key, flight, "".join(parts).strip())
+
+    async def _stream(self, payload, call, key, timeout):
+        payload["stream"] = True
+        body = json.dumps(payload).encode("utf-8")
+        while True:
+            self._before_attempt(call)
+            attempt_started = time.monotonic()
+            parts, result = [], {}
+            try:
+                async for delta in self._stream_attempt(body, timeout, result):
+                    if not parts:
+                        call["first_byte"] = time.monotonic()
+                    parts.append(delta)
+                    yield delta
+            except Exception as e:
+                await self._after_failure(call, e, retry_allowed=not parts)
+                continue
+            self.breaker.record_success()
+            self.latency.add(time.monotonic() - attempt_started)
+            break
+        usage = self._record_usage(result, payload["model"])
+        self._observe(call, usage=usage)
+        self._cache_store(key, payload, "".join(parts).strip(), result.get("usage"))
+
+    @property
+    def idle_connections(self):
+        """Pooled keep-alive sockets not currently in use."""
+        return len(self._idle)
+
+    def _after_fork(self):
+        """In a forked child: drop the parent's sockets, threads and cache connection."""
+        self._idle = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_connections * 2,
+                                            thread_name_prefix="llm")
+        self._sem = None
+        self._sem_loop = None
+        self._inflight = {}
+        if self.cache is not None:
+            self.cache.reopen()
+
+    def close(self):
+        """Close pooled connections and stop the worker threads."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+        self._executor.shutdown(wait=False)
+        if self.cache is not None:
+            self.cache.close()
+        if self.metrics is not None:
+            self.metrics.close()
+
+
+# ─── Process-wide client ────────────────────────────────
+
+_client = None
+
+
+def get_client():
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = LLMClient(cache=ResponseCache(), metrics=MetricsRecorder(), router=get_router())
+    return _client
+
+
+def _after_fork_in_child():
+    if _client is not None:
+        _client._after_fork()
+
+
+# A resident process (nexus_agents.py worker) forks banter workers after its
+# client has already pooled sockets; the children must open their own.
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def configure(**kwargs):
+    """
+    Replace the shared client, e.g. ``configure(max_connections=8)``.
+    Keeps the current cache mode and attaches the default response cache,
+    metrics recorder and model router unless ``cache`` / ``metrics`` /
+    ``router`` are given.
+    """
+    global _client
+    mode = _client.cache_mode if _client is not None else "use"
+    if _client is not None:
+        _client.close()
+    kwargs.setdefault("cache", ResponseCache())
+    kwargs.setdefault("metrics", MetricsRecorder())
+    kwargs.setdefault("router", get_router())
+    kwargs.setdefault("cache_mode", mode)
+    _client = LLMClient(**kwargs)
+    return _client
+
+
+def set_cache_mode(mode):
+    """Switch the shared client's response cache: "use", "off" or "only"."""
+    if mode not in CACHE_MODES:
+        raise ValueError(f"cache mode must be one of {CACHE_MODES}")
+    get_client().cache_mode = mode
+
+
+def set_hedging(enabled=True):
+    """Race a duplicate request against calls slower than the observed p95."""
+    get_client().hedge = enabled
+
+
+async def call_llm(messages, max_tokens=None, temperature=None, timeout=None, response_format=None):
+    """
+    Make a single LLM call on the shared client. Returns None on failure.
+    Settings left unset come from the model route for the active labels.
+    """
+    try:
+        return await get_client().complete(messages, max_tokens=max_tokens, temperature=temperature,
+                                           timeout=timeout, response_format=response_format)
+    except LLMError as e:
+        print(f"  LLM error: {e.describe()}")
+        return None
+    except Exception as e:
+        print(f"  LLM error: {e}")
+        return None
+
+
+async def stream_llm(messages, on_text, max_tokens=None, temperature=None, timeout=None):
+    """
+    Streamed variant of call_llm: ``on_text(text_so_far)`` is called as
+    tokens arrive. Returns the stripped full text, or None on failure.
+    """
+    text = ""
+    try:
+        async for delta in get_client().stream(messages, max_tokens=max_tokens,
+                                               temperature=temperature, timeout=timeout):
+            text += delta
+            on_text(text.lstrip())
+    except LLMError as e:
+        print(f"  LLM error: {e.describe()}")
+        return None
+    except Exception as e:
+        print(f"  LLM error: {e}")
+        return None
+    return text.strip() or None
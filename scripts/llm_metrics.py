@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+LLM Metrics — per-call latency, token and cost instrumentation
+
+Every completion made through llm_client is recorded here: wall time, time
+to first byte, prompt/completion tokens, cost, attempts, hedging, cache
+hits and coalesced duplicates, tagged with whatever labels are active
+(script, run, agent, phase). Records are appended to a JSONL log and
+aggregated into counters and histograms that can be exported in Prometheus
+text format (for the node_exporter textfile collector, or ``--prometheus``
+below).
+
+Tag calls with labels:
+
+  llm_metrics.set_labels(script="roundtable", run="ab12cd34")   # rest of this task
+  with llm_metrics.labels(agent="Jarvis", phase="propose"):       # just this block
+      await call_llm(...)
+
+Usage:
+  python3 llm_metrics.py                     # Summary table of the metrics log
+  python3 llm_metrics.py --run ab12cd34      # ...for one run
+  python3 llm_metrics.py --prometheus        # Aggregate the log as Prometheus text
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+METRICS_LOG = os.environ.get("NEXUS_LLM_METRICS", "/Users/scott/clawd/memory/llm-metrics.jsonl")
+PROM_FILE = os.environ.get("NEXUS_LLM_PROM", "/Users/scott/clawd/memory/llm-metrics.prom")
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0)  # seconds
+MAX_RECORDS = 10000  # calls kept in memory for summaries
+
+_labels = contextvars.ContextVar("llm_metric_labels", default={})
+
+
+def set_labels(**extra):
+    """
+    Attach *extra* labels to calls for the rest of the current context.
+    Each asyncio task runs in its own copy, so concurrent runs don't mix.
+    """
+    _labels.set({**_labels.get(), **extra})
+
+
+@contextlib.contextmanager
+def labels(**extra):
+    """Attach *extra* labels to every call recorded inside the block (task-local)."""
+    token = _labels.set({**_labels.get(), **extra})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+def current_labels():
+    """The labels active in the current context."""
+    return _labels.get()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def lines(self, name, label_text=""):
+        sep = "," if label_text else ""
+        out = [f'{name}_bucket{{{label_text}{sep}le="{bound:g}"}} {n}'
+               for bound, n in zip(self.buckets, self.counts)]
+        out.append(f'{name}_bucket{{{label_text}{sep}le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum{{{label_text}}} {self.sum:.6f}")
+        out.append(f"{name}_count{{{label_text}}} {self.count}")
+        return out
+
+
+class MetricsRecorder:
+    """
+    Collects one record per LLM call. ``log_path=None`` keeps records in
+    memory only.
+    """
+
+    def __init__(self, log_path=METRICS_LOG, max_records=MAX_RECORDS):
+        self.log_path = log_path
+        self.records = deque(maxlen=max_records)
+        self.counters = Counter()
+        self.wall = defaultdict(Histogram)  # by model
+        self.ttfb = defaultdict(Histogram)
+        self._lock = threading.Lock()
+        self._log = None
+
+    def record(self, **fields):
+        """Store one call record, merged with the active labels."""
+        rec = {"ts": round(time.time(), 3), **_labels.get(), **fields}
+        with self._lock:
+            self.records.append(rec)
+            self._aggregate(rec)
+            if self.log_path:
+                if self._log is None:
+                    os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                    self._log = open(self.log_path, "a", encoding="utf-8", buffering=1)
+                self._log.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        return rec
+
+    def _aggregate(self, rec):
+        model = rec.get("model", "unknown")
+        outcome = ("cache_hit" if rec.get("cache_hit") else "coalesced" if rec.get("coalesced")
+                   else "ok" if rec.get("ok") else "error")
+        self.counters[("requests", model, outcome)] += 1
+        self.counters[("prompt_tokens", model, "")] += rec.get("prompt_tokens") or 0
+        self.counters[("completion_tokens", model, "")] += rec.get("completion_tokens") or 0
+        self.counters[("cost_usd", model, "")] += rec.get("cost_usd") or 0.0
+        self.counters[("retries", model, "")] += max(0, (rec.get("attempts") or 1) - 1)
+        self.counters[("hedges", model, "")] += 1 if rec.get("hedged") else 0
+        if rec.get("error"):
+            self.counters[("errors", model, rec["error"])] += 1
+        if not (rec.get("cache_hit") or rec.get("coalesced")):
+            self.wall[model].observe(rec.get("wall_s") or 0.0)
+            if rec.get("ttfb_s") is not None:
+                self.ttfb[model].observe(rec["ttfb_s"])
+
+    def select(self, **match):
+        """Records whose labels equal every item in *match*."""
+        with self._lock:
+            return [r for r in self.records if all(r.get(k) == v for k, v in match.items())]
+
+    def prometheus(self):
+        """Aggregates in Prometheus text exposition format."""
+        metrics = {
+            "requests": ("nexus_llm_requests_total", "LLM calls by outcome", "outcome"),
+            "errors": ("nexus_llm_errors_total", "Failed LLM calls by error kind", "kind"),
+            "prompt_tokens": ("nexus_llm_prompt_tokens_total", "Prompt tokens billed", None),
+            "completion_tokens": ("nexus_llm_completion_tokens_total", "Completion tokens billed", None),
+            "cost_usd": ("nexus_llm_cost_usd_total", "Estimated spend in USD", None),
+            "retries": ("nexus_llm_retries_total", "Retried attempts", None),
+            "hedges": ("nexus_llm_hedges_total", "Hedged duplicate requests", None),
+        }
+        lines = []
+        with self._lock:
+            for key, (name, help_text, extra) in metrics.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (metric, model, label), value in sorted(self.counters.items()):
+                    if metric != key:
+                        continue
+                    label_text = f'model="{model}"' + (f',{extra}="{label}"' if extra else "")
+                    lines.append(f"{name}{{{label_text}}} {value:g}" if isinstance(value, int)
+                                 else f"{name}{{{label_text}}} {value:.6f}")
+            for name, help_text, hists in (
+                    ("nexus_llm_request_seconds", "Wall time per LLM call", self.wall),
+                    ("nexus_llm_ttfb_seconds", "Time to first byte per LLM call", self.ttfb)):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for model, hist in sorted(hists.items()):
+                    lines += hist.lines(name, f'model="{model}"')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=None):
+        """Atomically write ``prometheus()`` to *path* (textfile-collector style)."""
+        path = path or PROM_FILE
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+        return path
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+def summary_table(records):
+    """Printable per-call table with totals and latency percentiles."""
+    if not records:
+        return "  (no LLM calls recorded)"
+    lines = [f"  {'phase':<11} {'agent':<10} {'model':<21} {'wall':>6} {'ttfb':>6} {'prompt':>7} {'compl':>6} "
+             f"{'cost $':>9} {'try':>3}  note"]
+    for r in records:
+        note = ("cache" if r.get("cache_hit") else "coalesced" if r.get("coalesced")
+                else r.get("error") or ("hedged" if r.get("hedged") else ""))
+        ttfb = f"{r['ttfb_s']:.2f}" if r.get("ttfb_s") is not None else "-"
+        model = (r.get("model") or "-").rsplit("/", 1)[-1][:21]
+        lines.append(f"  {r.get('phase') or '-':<11} {r.get('agent') or '-':<10} {model:<21} {r.get('wall_s', 0):>6.2f} "
+                     f"{ttfb:>6} {r.get('prompt_tokens', 0):>7} {r.get('completion_tokens', 0):>6} "
+                     f"{r.get('cost_usd', 0):>9.6f} {r.get('attempts', 1):>3}  {note}")
+    live = [r["wall_s"] for r in records if not (r.get("cache_hit") or r.get("coalesced"))]
+    ttfbs = [r["ttfb_s"] for r in records if r.get("ttfb_s") is not None]
+    prompt = sum(r.get("prompt_tokens", 0) for r in records)
+    completion = sum(r.get("completion_tokens", 0) for r in records)
+    cost = sum(r.get("cost_usd", 0) for r in records)
+    lines.append(f"  {'total':<44} {sum(live):>6.2f} {'':>6} {prompt:>7} {completion:>6} {cost:>9.6f} "
+                 f"{sum(r.get('attempts', 1) for r in records):>3}  "
+                 f"{len(records)} call(s), {sum(1 for r in records if r.get('cache_hit'))} cached, "
+                 f"{sum(1 for r in records if r.get('coalesced'))} coalesced, "
+                 f"{sum(1 for r in records if not r.get('ok'))} failed")
+    if live:
+        p50, p95 = percentile(live, 50), percentile(live, 95)
+        ttfb_p50 = f"{percentile(ttfbs, 50):.2f}s" if ttfbs else "-"
+        lines.append(f"  latency p50 {p50:.2f}s · p95 {p95:.2f}s · ttfb p50 {ttfb_p50}")
+    return "\n".join(lines)
+
+
+def load_log(path=METRICS_LOG):
+    """Every record in the JSONL metrics log (skipping torn lines)."""
+    records = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+if __name__ == "__main__":
+    path = METRICS_LOG
+    if "--log" in sys.argv:
+        path = sys.argv[sys.argv.index("--log") + 1]
+    records = load_log(path)
+    if "--run" in sys.argv:
+        run = sys.argv[sys.argv.index("--run") + 1]
+        records = [r for r in records if r.get("run") == run]
+    if "--prometheus" in sys.argv:
+        recorder = MetricsRecorder(log_path=None, max_records=1)
+        for rec in records:
+            recorder._aggregate(rec)
+        sys.stdout.write(recorder.prometheus())
+    else:
+        print(f"📈 {len(records)} LLM call(s) in {path}")
+        print(summary_table(records))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+LLM Resilience — retry policy, circuit breaker and latency tracking
+
+Pieces used by llm_client.LLMClient to keep a roundtable's tail latency
+bounded instead of silently dropping turns:
+
+  RetryPolicy      exponential backoff with full jitter, honoring Retry-After
+  CircuitBreaker   stops calling an endpoint that keeps failing, then probes
+                   it again after a cool-down
+  LatencyTracker   rolling latency window; its p95 is the hedging threshold
+"""
+
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped at ``max_delay``."""
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0,
+                 retry_statuses=RETRYABLE_STATUSES):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+
+    def should_retry(self, error, attempt):
+        if attempt >= self.max_attempts:
+            return False
+        status = getattr(error, "status", None)
+        if status is not None:
+            return status in self.retry_statuses
+        return getattr(error, "kind", None) in ("timeout", "network")
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to sleep before attempt ``attempt + 1``."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker. After ``failure_threshold`` consecutive
+    failures it opens and rejects calls for ``reset_timeout`` seconds, then
+    lets a single probe through (half-open); the probe's outcome closes or
+    re-opens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self):
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = "half-open"
+            self._probing = False
+        if self.state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+    def retry_in(self):
+        """Seconds until an open breaker will allow a probe."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+
+class LatencyTracker:
+    """Rolling window of request latencies (seconds)."""
+
+    def __init__(self, window=200, min_samples=20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, pct):
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def p95(self):
+        return self.percentile(95)
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Memory Index — local full-text search over transcripts, tasks and souls
+
+A SQLite FTS5 index over memory/roundtables/*.md, the task files, every
+agent's SOUL.md and the activity log. Documents are split into passages (by markdown section,
+capped at CHUNK_CHARS) so results point at the relevant part of a long
+transcript, ranked with BM25 (titles weigh more than bodies). Activity
+log entries are indexed in runs of ACTIVITY_CHUNK.
+
+refresh() is incremental: one scandir pass per source, and only files whose
+size or mtime changed are re-read; deleted files drop out of the index.
+Activity comes from activity_store's JSONL mirror and its offset index:
+only entries after the last indexed offset are read (plus the last,
+still-open run of ACTIVITY_CHUNK), never the whole JSON array.
+Every refresh that changes something bumps ``generation``, which callers
+caching search results (context_builder.py) key on.
+Queries take a few milliseconds, so prompts can be grounded in prior
+discussion without re-reading files.
+
+Usage:
+  python3 memory_index.py "onboarding flow"             # Refresh, then search
+  python3 memory_index.py "pricing" --kind roundtable --limit 5
+  python3 memory_index.py --rebuild                     # Drop and re-index everything
+  python3 memory_index.py --stats
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import time
+
+import activity_store
+
+# ─── Paths ──────────────────────────────────────────────
+INDEX_DB = os.environ.get("NEXUS_MEMORY_INDEX", "/Users/scott/clawd/memory/memory-index.sqlite")
+ROUNDTABLES_DIR = "/Users/scott/clawd/memory/roundtables"
+TASKS_DIR = "/Users/scott/clawd/tasks/in-progress"
+AGENTS_DIR = "/Users/scott/clawd/agents"
+ACTIVITY_LOG = "/Users/scott/clawd/memory/activity_log.json"   # mirrored to JSONL by activity_store
+
+CHUNK_CHARS = 1200    # max characters per indexed passage
+TITLE_WEIGHT = 5.0    # BM25 weight of the title column vs the body
+SNIPPET_TOKENS = 24
+ACTIVITY_CHUNK = 20   # activity log entries per passage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id       INTEGER PRIMARY KEY,
+    path     TEXT UNIQUE NOT NULL,
+    kind     TEXT NOT NULL,
+    title    TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(
+    title, body, doc_id UNINDEXED, kind UNINDEXED, tokenize = 'porter unicode61'
+);
+"""
+
+HEADING = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
+WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def default_sources():
+    """{kind: (directory, relative file pattern)} for the standard locations; a
+    pattern of None means the path is a single file."""
+    return {
+        "roundtable": (ROUNDTABLES_DIR, "*.md"),
+        "task": (TASKS_DIR, "*.md"),
+        "soul": (AGENTS_DIR, "*/SOUL.md"),
+        "activity": (ACTIVITY_LOG, None),
+    }
+
+
+def iter_files(directory, pattern):
+    """Yield (path, stat) for files matching *pattern* ("*.md", "*/NAME" or None)."""
+    if pattern is None:
+        try:
+            yield directory, os.stat(directory)
+        except OSError:
+            pass
+        return
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    if pattern.startswith("*/"):
+        name = pattern[2:]
+        for entry in entries:
+            if entry.is_dir():
+                path = os.path.join(entry.path, name)
+                try:
+                    yield path, os.stat(path)
+                except OSError:
+                    continue
+        return
+    suffix = pattern[1:]
+    for entry in entries:
+        if entry.name.endswith(suffix) and entry.is_file():
+            yield entry.path, entry.stat()
+
+
+def split_passages(text, limit=CHUNK_CHARS):
+    """[(section heading or None, passage)] — markdown sections, split further on paragraphs."""
+    sections = []
+    starts = [m.start() for m in HEADING.finditer(text)]
+    bounds = [0] + starts + [len(text)]
+    for start, end in zip(bounds, bounds[1:]):
+        block = text[start:end].strip()
+        if not block:
+            continue
+        match = HEADING.match(block)
+        heading = match.group(1).strip() if match else None
+        current = ""
+        for para in re.split(r"\n\s*\n", block):
+            if current and len(current) + len(para) > limit:
+                sections.append((heading, current.strip()))
+                current = ""
+            current += para + "\n\n"
+        if current.strip():
+            sections.append((heading, current.strip()))
+    return sections
+
+
+def activity_line(entry):
+    """One "- agent: action — details (time)" line for an activity entry."""
+    when = entry.get("timestamp") or entry.get("time")
+    details = entry.get("details") or entry.get("target")
+    line = f"- {entry.get('agent', '?')}: {entry.get('action', '?')}"
+    if details:
+        line += f" — {details}"
+    return f"{line} ({when})" if when else line
+
+
+def doc_title(path, kind, text):
+    if kind == "activity":
+        return "Activity log"
+    match = HEADING.search(text)
+    if match:
+        return match.group(1).strip()
+    if kind == "soul":
+        return os.path.basename(os.path.dirname(path))
+    return os.path.basename(path)[:-3].replace("-", " ").title()
+
+
+def match_query(text, mode="any"):
+    """FTS5 query for free text: every word quoted, joined with OR (or AND)."""
+    words = WORD.findall(text)
+    if not words:
+        return None
+    joiner = " OR " if mode == "any" else " "
+    return joiner.join(f'"{w}"' for w in words)
+
+
+class MemoryIndex:
+    """Incrementally refreshed FTS5 index; ``sources`` maps kind → (dir, pattern)."""
+
+    def __init__(self, path=None, sources=None):
+        self.path = path or INDEX_DB
+        self.sources = sources or default_sources()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def refresh(self):
+        """Re-index new/changed files and drop deleted ones. Returns (indexed, removed)."""
+        db = self._conn()
+        known = {path: (doc_id, size, mtime)
+                 for doc_id, path, size, mtime in db.execute("SELECT id, path, size, mtime_ns FROM docs")}
+        seen = set()
+        indexed = 0
+        with db:
+            for kind, (directory, pattern) in self.sources.items():
+                if kind == "activity":
+                    path, changed = self._refresh_activity(db, directory, known)
+                    if path:
+                        seen.add(path)
+                    indexed += changed
+                    continue
+                for path, st in iter_files(directory, pattern):
+                    seen.add(path)
+                    prev = known.get(path)
+                    if prev and prev[1] == st.st_size and prev[2] == st.st_mtime_ns:
+                        continue
+                    try:
+                        with open(path, "r", encoding="utf-8", errors="replace") as f:
+                            text = f.read()
+                    except OSError:
+                        continue
+                    title = doc_title(path, kind, text)
+                    if prev:
+                        doc_id = prev[0]
+                        db.execute("DELETE FROM passages WHERE doc_id = ?", (doc_id,))
+                        db.execute("UPDATE docs SET kind = ?, title = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                                   (kind, title, st.st_size, st.st_mtime_ns, doc_id))
+                    else:
+                        doc_id = db.execute(
+                            "INSERT INTO docs (path, kind, title, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                            (path, kind, title, st.st_size, st.st_mtime_ns)).lastrowid
+                    db.executemany(
+                        "INSERT INTO passages (title, body, doc_id, kind) VALUES (?, ?, ?, ?)",
+                        [(f"{title} — {heading}" if heading and heading != title else title, body, doc_id, kind)
+                         for heading, body in split_passages(text)])
+                    indexed += 1
+            removed = [(doc_id,) for path, (doc_id, _, _) in known.items() if path not in seen]
+            db.executemany("DELETE FROM passages WHERE doc_id = ?", removed)
+            db.executemany("DELETE FROM docs WHERE id = ?", removed)
+            if indexed or removed:
+                db.execute("INSERT INTO meta (key, value) VALUES ('generation', 1) "
+                           "ON CONFLICT(key) DO UPDATE SET value = value + 1")
+        return indexed, len(removed)
+
+    def _refresh_activity(self, db, legacy_path, known):
+        """
+        Index activity entries appended since the last refresh. Returns (JSONL
+        path or None, 1 if the index changed else 0).
+
+        meta keeps the log's inode, the offset where the open (not yet full)
+        run of ACTIVITY_CHUNK entries starts, the rowid of its passage and
+        the end of the last indexed entry. Each refresh re-reads from the
+        open run only; a replaced or truncated log is re-indexed in full.
+        """
+        log = activity_store.get_log(legacy_path)
+        log.sync_legacy()
+        try:
+            st = os.stat(log.log_path)
+        except OSError:
+            return None, 0
+        state = dict(db.execute("SELECT key, value FROM meta WHERE key LIKE 'activity_%'"))
+        prev = known.get(log.log_path)
+        start, tail = state.get("activity_start", 0), state.get("activity_tail", 0)
+        reset = prev is None or state.get("activity_ino") != st.st_ino or st.st_size < state.get("activity_end", 0)
+        if reset:
+            if prev:
+                db.execute("DELETE FROM passages WHERE doc_id = ?", (prev[0],))
+            start, tail = 0, 0
+        elif st.st_size == state.get("activity_end"):
+            return log.log_path, 0
+        rows = log.read_from(start)
+        if not reset and (not rows or rows[-1][0] + rows[-1][1] + 1 == state.get("activity_end")):
+            return log.log_path, 0  # only a partial line was appended
+        title = "Activity log"
+        if prev:
+            doc_id = prev[0]
+            db.execute("UPDATE docs SET size = ?, mtime_ns = ? WHERE id = ?", (st.st_size, st.st_mtime_ns, doc_id))
+        else:
+            doc_id = db.execute("INSERT INTO docs (path, kind, title, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                                (log.log_path, "activity", title, st.st_size, st.st_mtime_ns)).lastrowid
+        if tail:
+            db.execute("DELETE FROM passages WHERE rowid = ?", (tail,))
+        tail, end = 0, start
+        for i in range(0, len(rows), ACTIVITY_CHUNK):
+            run = rows[i:i + ACTIVITY_CHUNK]
+            body = "\n".join(activity_line(e) for _, _, e in run if isinstance(e, dict))
+            rowid = db.execute("INSERT INTO passages (title, body, doc_id, kind) VALUES (?, ?, ?, ?)",
+                               (title, body, doc_id, "activity")).lastrowid
+            end = run[-1][0] + run[-1][1] + 1
+            if len(run) < ACTIVITY_CHUNK:
+                start, tail = run[0][0], rowid
+            else:
+                start = end
+        db.executemany("INSERT INTO meta (key, value) VALUES (?, ?) "
+                       "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                       [("activity_ino", st.st_ino), ("activity_start", start),
+                        ("activity_tail", tail), ("activity_end", end)])
+        return log.log_path, 1
+
+    @property
+    def generation(self):
+        """Counter bumped by every refresh that changed the index."""
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def rebuild(self):
+        db = self._conn()
+        with db:
+            db.execute("DELETE FROM passages")
+            db.execute("DELETE FROM docs")
+            db.execute("DELETE FROM meta WHERE key LIKE 'activity_%'")
+        return self.refresh()
+
+    def search(self, query, kinds=None, limit=10, mode="any", raw=False):
+        """
+        Ranked passages for *query*: dicts with path, kind, title, snippet,
+        text and score (BM25, lower is better). ``raw=True`` passes *query*
+        through as FTS5 syntax.
+        """
+        fts = query if raw else match_query(query, mode)
+        if not fts:
+            return []
+        sql = ("SELECT d.path, p.kind, p.title, "
+               f"snippet(passages, 1, '[', ']', '…', {SNIPPET_TOKENS}), p.body, "
+               f"bm25(passages, {TITLE_WEIGHT}, 1.0) AS score "
+               "FROM passages p JOIN docs d ON d.id = p.doc_id WHERE passages MATCH ?")
+        params = [fts]
+        if kinds:
+            sql += f" AND p.kind IN ({','.join('?' * len(kinds))})"
+            params += list(kinds)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        try:
+            rows = self._conn().execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            return []  # malformed raw query
+        return [{"path": path, "kind": kind, "title": title, "snippet": snippet, "text": body,
+                 "score": round(score, 4)}
+                for path, kind, title, snippet, body, score in rows]
+
+    def stats(self):
+        db = self._conn()
+        return {kind: (docs, passages) for kind, docs, passages in db.execute(
+            "SELECT d.kind, COUNT(DISTINCT d.id), COUNT(p.rowid) FROM docs d "
+            "LEFT JOIN passages p ON p.doc_id = d.id GROUP BY d.kind")}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_index = None
+
+
+def get_index():
+    """Shared index on INDEX_DB with the default sources."""
+    global _index
+    if _index is None:
+        _index = MemoryIndex()
+    return _index
+
+
+def arg_value(flag, cast=str, default=None):
+    """Return the value following *flag* in sys.argv, or *default*."""
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+if __name__ == "__main__":
+    index = get_index()
+    start = time.perf_counter()
+    indexed, removed = index.rebuild() if "--rebuild" in sys.argv else index.refresh()
+    refresh_ms = (time.perf_counter() - start) * 1000
+    print(f"🗂️ Index refreshed in {refresh_ms:.1f} ms ({indexed} file(s) indexed, {removed} removed)")
+
+    if "--stats" in sys.argv:
+        for kind, (docs, passages) in sorted(index.stats().items()):
+            print(f"   {kind:<11} {docs:>6} file(s) {passages:>7} passage(s)")
+
+    flags_with_values = {"--kind", "--limit"}
+    words = [a for i, a in enumerate(sys.argv[1:], 1)
+             if not a.startswith("--") and sys.argv[i - 1] not in flags_with_values]
+    if words:
+        kind = arg_value("--kind")
+        start = time.perf_counter()
+        results = index.search(" ".join(words), kinds=[kind] if kind else None,
+                               limit=arg_value("--limit", int, 10))
+        query_ms = (time.perf_counter() - start) * 1000
+        print(f"🔎 {len(results)} result(s) in {query_ms:.1f} ms")
+        for r in results:
+            print(f"\n  [{r['kind']}] {r['title']}  ({r['score']:.2f})")
+            print(f"  {r['path']}")
+            print(f"  {' '.join(r['snippet'].split())}")
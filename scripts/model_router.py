@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Model Router — model, max_tokens and temperature per script, phase and agent
+
+Every turn used to go to one MODEL with fixed max_tokens. The router picks
+them from a routes file (model-routes.json), matched against the metric
+labels active at the call site (script, phase, agent; see llm_metrics.py):
+
+  {
+    "defaults": {"max_tokens": 200, "temperature": 0.8},
+    "models": {
+      "deepseek/deepseek-v3.2": {"fallback": ["google/gemini-2.5-flash-lite"], "p95_s": 8},
+      "google/gemini-2.5-flash-lite": {"price": [0.10, 0.40]}
+    },
+    "routes": [
+      {"match": {"script": "banter"}, "model": "google/gemini-2.5-flash-lite", "max_tokens": 150},
+      {"match": {"script": "roundtable", "phase": "commit"}, "model": "openai/gpt-4.1"}
+    ]
+  }
+
+Every matching route is applied in file order over the defaults, so later,
+narrower routes win. A match value may be a list (any of). A route without
+a model uses the client's MODEL. Arguments passed explicitly to
+call_llm() / stream_llm() take precedence over the route.
+
+The router also tracks each model's latency and error rate over its last
+WINDOW calls (cache hits excluded). A model whose p95 exceeds its ``p95_s``
+or whose error rate exceeds ``max_error_rate`` is degraded for COOLDOWN
+seconds: its calls go to the first healthy model in its ``fallback`` chain.
+After the cool-down it gets traffic again with a fresh window.
+
+The file is re-read when it changes; without one, DEFAULT_CONFIG applies.
+
+Usage:
+  python3 model_router.py                                  # Routes for the usual call sites
+  python3 model_router.py script=roundtable phase=commit   # Route for these labels
+  python3 model_router.py --init                           # Write DEFAULT_CONFIG to the routes file
+"""
+
+import copy
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from llm_resilience import LatencyTracker
+
+# ─── Paths ──────────────────────────────────────────────
+ROUTES_FILE = os.environ.get("NEXUS_MODEL_ROUTES", "/Users/scott/clawd/config/model-routes.json")
+
+# ─── Health ─────────────────────────────────────────────
+WINDOW = 50            # recent calls per model
+MIN_SAMPLES = 10       # calls before a model can be judged
+P95_LIMIT = 8.0        # seconds, unless the model sets "p95_s"
+MAX_ERROR_RATE = 0.25  # unless the model sets "max_error_rate"
+COOLDOWN = 60.0        # seconds a degraded model is skipped
+
+# Failures that say nothing about the model itself
+NEUTRAL_ERRORS = {"circuit_open", "cache_miss"}
+
+DEFAULT_CONFIG = {
+    "defaults": {"max_tokens": 200, "temperature": 0.8},
+    "models": {
+        "deepseek/deepseek-v3.2": {"fallback": ["google/gemini-2.5-flash-lite"]},
+        "openai/gpt-4.1": {"fallback": ["deepseek/deepseek-v3.2"], "p95_s": 10.0},
+        "google/gemini-2.5-flash-lite": {},
+    },
+    "routes": [
+        # Watercooler quips: short, cheap and fast
+        {"match": {"script": "banter"}, "model": "google/gemini-2.5-flash-lite",
+         "max_tokens": 150, "temperature": 0.85},
+        # Commitments are what the team acts on: stronger model, a little more room
+        {"match": {"script": "roundtable", "phase": "commit"}, "model": "openai/gpt-4.1",
+         "max_tokens": 240, "temperature": 0.6},
+        # History summaries (--summarize-history)
+        {"match": {"script": "roundtable", "phase": "summary"}, "max_tokens": 120, "temperature": 0.3},
+    ],
+}
+
+# Label sets shown by the CLI
+SAMPLE_CALLS = [
+    {"script": "banter"},
+    {"script": "roundtable", "phase": "understand"},
+    {"script": "roundtable", "phase": "propose"},
+    {"script": "roundtable", "phase": "refine"},
+    {"script": "roundtable", "phase": "commit"},
+    {"script": "roundtable", "phase": "summary"},
+]
+
+
+def matches(match, labels):
+    """True if every key of *match* equals (or, for a list, is one of) the label."""
+    for key, want in match.items():
+        have = labels.get(key)
+        if isinstance(want, list) and have not in want or not isinstance(want, list) and have != want:
+            return False
+    return True
+
+
+class ModelHealth:
+    """Rolling latency and error rate of one model's calls."""
+
+    def __init__(self, window=WINDOW, min_samples=MIN_SAMPLES):
+        self.latency = LatencyTracker(window=window, min_samples=min_samples)
+        self.outcomes = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.degraded_until = 0.0
+        self.reason = None
+
+    def add(self, seconds, ok):
+        self.outcomes.append(ok)
+        if ok:
+            self.latency.add(seconds)
+
+    def error_rate(self):
+        if len(self.outcomes) < self.min_samples:
+            return None
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def check(self, p95_limit, max_error_rate):
+        """Reason the model should be degraded, or None."""
+        p95 = self.latency.p95()
+        if p95 is not None and p95 > p95_limit:
+            return f"p95 {p95:.1f}s > {p95_limit:g}s"
+        errors = self.error_rate()
+        if errors is not None and errors > max_error_rate:
+            return f"error rate {errors:.0%} > {max_error_rate:.0%}"
+        return None
+
+    def degrade(self, reason, cooldown):
+        self.degraded_until = time.monotonic() + cooldown
+        self.reason = reason
+        self.latency.samples.clear()
+        self.outcomes.clear()
+
+    def healthy(self):
+        return time.monotonic() >= self.degraded_until
+
+
+class ModelRouter:
+    """Routes from *path* (re-read when it changes), plus per-model health."""
+
+    def __init__(self, path=None, config=None, cooldown=COOLDOWN):
+        self.path = path or ROUTES_FILE
+        self.cooldown = cooldown
+        self._config = config
+        self._stamp = None
+        self._fixed = config is not None
+        self.health = {}
+        self.failovers = Counter()   # (from model, to model) → calls rerouted
+        self._lock = threading.Lock()
+
+    # ─── Config ─────────────────────────────────────────
+
+    def config(self):
+        if self._fixed:
+            return self._config
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if self._config is None or stamp != self._stamp:
+            self._config = DEFAULT_CONFIG
+            if stamp is not None:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._config = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"  ⚠️ Model routes unreadable ({e}); using the defaults")
+            self._stamp = stamp
+        return self._config
+
+    def model_config(self, model):
+        return self.config().get("models", {}).get(model) or {}
+
+    def price(self, model):
+        """(prompt, completion) USD per 1M tokens from the routes file, or None."""
+        price = self.model_config(model).get("price")
+        return tuple(price) if price else None
+
+    # ─── Routing ────────────────────────────────────────
+
+    def resolve(self, labels):
+        """The configured route for *labels*: dict of model, max_tokens, temperature (any may be missing)."""
+        config = self.config()
+        route = dict(config.get("defaults", {}))
+        for rule in config.get("routes", []):
+            if matches(rule.get("match", {}), labels):
+                route.update({k: v for k, v in rule.items() if k != "match"})
+        return route
+
+    def candidates(self, model):
+        """*model*, then its fallback chain (depth first, no repeats)."""
+        order, stack = [], [model]
+        while stack:
+            name = stack.pop(0)
+            if name in order:
+                continue
+            order.append(name)
+            stack = list(self.model_config(name).get("fallback", [])) + stack
+        return order
+
+    def route(self, labels, default_model):
+        """resolve() with the model swapped for a healthy one if it is degraded."""
+        route = self.resolve(labels)
+        primary = route.get("model") or default_model
+        chosen = primary
+        with self._lock:
+            for name in self.candidates(primary):
+                health = self.health.get(name)
+                if health is None or health.healthy():
+                    chosen = name
+                    break
+            if chosen != primary:
+                self.failovers[(primary, chosen)] += 1
+        route["model"] = chosen
+        return route
+
+    # ─── Health ─────────────────────────────────────────
+
+    def observe(self, model, seconds, ok=True, error_kind=None):
+        """Record one finished call; degrades *model* when it crosses a threshold."""
+        if error_kind in NEUTRAL_ERRORS:
+            return
+        settings = self.model_config(model)
+        with self._lock:
+            health = self.health.setdefault(model, ModelHealth())
+            health.add(seconds, ok)
+            if not health.healthy():
+                return
+            reason = health.check(settings.get("p95_s", P95_LIMIT),
+                                  settings.get("max_error_rate", MAX_ERROR_RATE))
+            if reason:
+                health.degrade(reason, self.cooldown)
+        if reason:
+            print(f"  ⚠️ {model} degraded ({reason}); failing over for {self.cooldown:.0f}s")
+
+    def stats(self):
+        """{model: {p95_s, error_rate, calls, degraded}} from the current windows."""
+        with self._lock:
+            return {model: {
+                "p95_s": h.latency.p95(),
+                "error_rate": h.error_rate(),
+                "calls": len(h.outcomes),
+                "degraded": None if h.healthy() else h.reason,
+            } for model, h in self.health.items()}
+
+    def summary(self):
+        """One line per model with traffic, plus failover counts."""
+        lines = []
+        for model, s in sorted(self.stats().items()):
+            p95 = f"{s['p95_s']:.2f}s" if s["p95_s"] is not None else "—"
+            errors = f"{s['error_rate']:.0%}" if s["error_rate"] is not None else "—"
+            state = f"degraded: {s['degraded']}" if s["degraded"] else "ok"
+            lines.append(f"  {model:<32} p95 {p95:>7}  errors {errors:>4}  {s['calls']:>3} call(s)  {state}")
+        for (source, target), count in sorted(self.failovers.items()):
+            lines.append(f"  ↪ {source} → {target}: {count} call(s)")
+        return "\n".join(lines)
+
+
+_router = None
+
+
+def get_router():
+    """The process-wide router on ROUTES_FILE."""
+    global _router
+    if _router is None:
+        _router = ModelRouter()
+    return _router
+
+
+def write_default(path=None):
+    """Atomically write DEFAULT_CONFIG to *path* (the routes file)."""
+    path = path or ROUTES_FILE
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(copy.deepcopy(DEFAULT_CONFIG), f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+if __name__ == "__main__":
+    if "--init" in sys.argv:
+        if os.path.exists(ROUTES_FILE) and "--force" not in sys.argv:
+            print(f"❌ {ROUTES_FILE} exists (add --force to overwrite)")
+            sys.exit(1)
+        print(f"📝 Wrote {write_default()}")
+        sys.exit(0)
+
+    from llm_client import MODEL
+    router = get_router()
+    source = ROUTES_FILE if os.path.exists(ROUTES_FILE) else "built-in defaults"
+    print(f"🧭 Routes from {source}")
+    pairs = [a.split("=", 1) for a in sys.argv[1:] if "=" in a]
+    calls = [dict(pairs)] if pairs else SAMPLE_CALLS
+    for labels in calls:
+        route = router.resolve(labels)
+        where = " ".join(f"{k}={v}" for k, v in labels.items())
+        chain = " → ".join(router.candidates(route.get("model") or MODEL))
+        print(f"  {where:<36} {chain}  max_tokens={route.get('max_tokens')} "
+              f"temperature={route.get('temperature')}")
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Nexus Agents — one CLI for the generators, with an optional resident worker
+
+Every cron tick of generate_banter.py or run_roundtable.py used to pay for
+interpreter start, ~130 ms of imports (asyncio, http.client, sqlite3, ...)
+and a cold registry, SOUL cache and connection pool before doing any work.
+
+`nexus-agents worker` starts a resident process that imports the generators
+once, keeps the agent registry, SOUL/prompt cache and keep-alive LLM
+connections warm, and listens on a Unix socket. Every other invocation is a
+thin client: it imports only os, sys, socket and json, submits the job, and
+streams the job's output back. Jobs run one at a time, in arrival order,
+with the worker's environment. When no worker is listening the job runs
+in-process, exactly as the generator scripts do.
+
+Usage:
+  nexus-agents banter [generate_banter.py options]      # e.g. banter --count 4
+  nexus-agents roundtable [run_roundtable.py options]   # e.g. roundtable --auto
+  nexus-agents worker                                   # Run the resident worker (foreground)
+  nexus-agents status                                   # Worker pid, uptime, jobs, warm state
+  nexus-agents ping                                     # Round trip to the worker
+  nexus-agents stop                                     # Stop the worker
+  nexus-agents --local banter ...                       # Run in-process even if a worker is up
+
+Some jobs always run in-process (local_only()): roundtable --watch never
+returns and would hold the worker, and banter --workers N (N > 1) forks a
+process pool, whose children would inherit the worker's redirected stdout
+and its warm connection pool.
+
+The worker snapshots the shared LLM client's pool size, cache mode and
+hedging, and the turn scheduler, before each job and restores them after,
+so one job's flags (roundtable --max-inflight, banter --cache) never leak
+into the next.
+
+The socket is $NEXUS_AGENTS_SOCKET, or /tmp/nexus-agents-<uid>.sock.
+"""
+
+import json
+import os
+import socket
+import sys
+
+SOCKET_PATH = os.environ.get("NEXUS_AGENTS_SOCKET") or f"/tmp/nexus-agents-{os.getuid()}.sock"
+
+# command → generator module; each exposes main(), which reads sys.argv
+COMMANDS = {
+    "banter": "generate_banter",
+    "roundtable": "run_roundtable",
+}
+
+CONNECT_TIMEOUT = 0.5   # seconds to reach the worker before running locally
+
+
+def local_only(command, args):
+    """Reason *command* with *args* must run in the calling process, or None."""
+    if command == "roundtable" and "--watch" in args:
+        return "--watch never returns"
+    if command == "banter" and "--workers" in args:
+        idx = args.index("--workers")
+        try:
+            workers = int(args[idx + 1])
+        except (IndexError, ValueError):
+            workers = 1
+        if workers > 1:
+            return "--workers forks a process pool"
+    return None
+
+
+# ─── Running a job ──────────────────────────────────────
+
+def run_job(command, args):
+    """Run *command* with *args* in this process. Returns its exit status."""
+    import importlib
+    module = importlib.import_module(COMMANDS[command])
+    saved = sys.argv
+    sys.argv = [f"{module.__name__}.py"] + list(args)
+    try:
+        module.main()
+        return 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        sys.argv = saved
+
+
+# ─── Worker ─────────────────────────────────────────────
+
+class SocketWriter:
+    """File-like stdout for a job: each write is sent as an ``{"out": ...}`` line."""
+
+    def __init__(self, conn):
+        import threading
+        self.conn = conn
+        self.closed_by_peer = False
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        if text and not self.closed_by_peer:
+            line = (json.dumps({"out": text}) + "\n").encode("utf-8")
+            with self._lock:
+                try:
+                    self.conn.sendall(line)
+                except OSError:
+                    self.closed_by_peer = True  # client went away; the job still finishes
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+class Worker:
+    """Resident process serving jobs on a Unix socket, one at a time."""
+
+    def __init__(self, path=None):
+        self.path = path or SOCKET_PATH
+        self.started = None
+        self.jobs = 0
+        self.failed = 0
+        self.last_job = None
+
+    def warm(self):
+        """Import the generators and load what every job needs."""
+        import time
+        start = time.perf_counter()
+        import generate_banter
+        import llm_client
+        import run_roundtable
+        for module in (generate_banter, run_roundtable):
+            roster = module.registry()
+            for agent_dir in roster.dirs():
+                module.load_soul(agent_dir)
+        llm_client.get_client()
+        return (time.perf_counter() - start) * 1000
+
+    def settings(self):
+        """Snapshot of the process-wide LLM client and turn scheduler settings a job may change."""
+        import llm_client
+        import turn_graph
+        client = llm_client.get_client()
+        scheduler = turn_graph.get_scheduler()
+        return {"max_connections": client.max_connections, "cache_mode": client.cache_mode,
+                "hedge": client.hedge, "max_concurrency": scheduler.max_concurrency, "rate": scheduler.rate}
+
+    def restore(self, settings):
+        """Put back a settings() snapshot, so one job's flags don't carry over to the next."""
+        import llm_client
+        import turn_graph
+        if llm_client.get_client().max_connections != settings["max_connections"]:
+            llm_client.configure(max_connections=settings["max_connections"])
+        llm_client.set_cache_mode(settings["cache_mode"])
+        llm_client.set_hedging(settings["hedge"])
+        scheduler = turn_graph.get_scheduler()
+        if (scheduler.max_concurrency, scheduler.rate) != (settings["max_concurrency"], settings["rate"]):
+            turn_graph.configure(max_concurrency=settings["max_concurrency"], rate=settings["rate"])
+
+    def status(self):
+        import time
+        from file_cache import get_cache
+        import llm_client
+        client = llm_client.get_client()
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime_s": round(time.time() - self.started, 1),
+            "jobs": self.jobs,
+            "failed": self.failed,
+            "last_job": self.last_job,
+            "file_cache": {"hits": get_cache().hits, "misses": get_cache().misses},
+            "max_connections": client.max_connections,
+            "idle_connections": client.idle_connections,
+            "llm_usage": dict(client.usage),
+            "models": client.router.stats() if client.router is not None else {},
+        }
+
+    def listen(self):
+        """Bind the socket, replacing a stale one. Raises RuntimeError if a worker is already up."""
+        if os.path.exists(self.path):
+            if ping(self.path):
+                raise RuntimeError(f"a worker is already listening on {self.path}")
+            os.unlink(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)  # socket is owner-only
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        return server
+
+    def serve(self):
+        import time
+        server = self.listen()
+        self.started = time.time()
+        warm_ms = self.warm()
+        print(f"🧠 Worker {os.getpid()} warm in {warm_ms:.0f} ms, listening on {self.path}", flush=True)
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    if not self.handle(conn):
+                        break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            print("👋 Worker stopped.", flush=True)
+
+    def handle(self, conn):
+        """Serve one request. Returns False to stop the worker."""
+        import contextlib
+        import time
+        import traceback
+        try:
+            request = json.loads(conn.makefile("rb").readline() or b"{}")
+        except ValueError:
+            request = {}
+        cmd = request.get("cmd")
+        args = [str(a) for a in request.get("argv", [])]
+        refused = local_only(cmd, args) if cmd in COMMANDS else None
+        if cmd == "ping":
+            send(conn, {"exit": 0})
+        elif cmd == "status":
+            send(conn, {"status": self.status(), "exit": 0})
+        elif cmd == "stop":
+            send(conn, {"exit": 0})
+            return False
+        elif refused:
+            send(conn, {"out": f"worker won't run this job ({refused}); run it with --local\n", "exit": 2})
+        elif cmd in COMMANDS:
+            out = SocketWriter(conn)
+            start = time.perf_counter()
+            print(f"▶️  {cmd} {' '.join(args)}", flush=True)
+            settings = self.settings()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+                try:
+                    code = run_job(cmd, args)
+                except Exception:
+                    traceback.print_exc()
+                    code = 1
+                finally:
+                    self.restore(settings)
+            seconds = time.perf_counter() - start
+            self.jobs += 1
+            self.failed += code != 0
+            self.last_job = {"cmd": cmd, "argv": args, "exit": code, "seconds": round(seconds, 3)}
+            print(f"   exit {code} in {seconds:.2f}s", flush=True)
+            if not out.closed_by_peer:
+                send(conn, {"exit": code})
+        else:
+            send(conn, {"out": f"unknown command {cmd!r}\n", "exit": 2})
+        return True
+
+
+# ─── Client ─────────────────────────────────────────────
+
+def send(conn, message):
+    try:
+        conn.sendall((json.dumps(message) + "\n").encode("utf-8"))
+    except OSError:
+        pass
+
+
+def connect(path=None, timeout=CONNECT_TIMEOUT):
+    """A socket connected to the worker, or None if none is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path or SOCKET_PATH)
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)  # jobs take as long as they take
+    return sock
+
+
+def submit(request, path=None):
+    """
+    Send *request* to the worker and stream its output to stdout. Returns
+    (exit status, last reply), or (None, None) if no worker is listening.
+    """
+    sock = connect(path)
+    if sock is None:
+        return None, None
+    with sock:
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        reply = {}
+        for line in sock.makefile("rb"):
+            reply = json.loads(line)
+            if "out" in reply:
+                sys.stdout.write(reply["out"])
+                sys.stdout.flush()
+            if "exit" in reply:
+                return reply["exit"], reply
+    return 1, {"out": "worker closed the connection mid-job\n"}
+
+
+def ping(path=None):
+    code, _ = submit({"cmd": "ping"}, path)
+    return code == 0
+
+
+def main(argv):
+    local = "--local" in argv
+    argv = [a for a in argv if a != "--local"]
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(__doc__)
+        return 0 if argv else 2
+    cmd, args = argv[0], argv[1:]
+
+    if cmd == "worker":
+        try:
+            Worker().serve()
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        return 0
+    if cmd in ("ping", "status", "stop"):
+        code, reply = submit({"cmd": cmd})
+        if code is None:
+            print(f"💤 No worker on {SOCKET_PATH}")
+            return 1
+        if cmd == "status":
+            print(json.dumps(reply["status"], indent=2))
+        elif cmd == "stop":
+            print("👋 Worker stopping.")
+        else:
+            print(f"🏓 Worker on {SOCKET_PATH}")
+        return code
+    if cmd not in COMMANDS:
+        print(f"❌ Unknown command {cmd!r} (expected one of: {', '.join(COMMANDS)}, worker, status, ping, stop)")
+        return 2
+
+    if not local and not local_only(cmd, args):
+        code, _ = submit({"cmd": cmd, "argv": args})
+        if code is not None:
+            return code
+    return run_job(cmd, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
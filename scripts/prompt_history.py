@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Prompt History — bounded, cache-friendly discussion transcripts
+
+Roundtable turns used to resend the whole "DISCUSSION SO FAR" on every call,
+so prompt size grew with every turn of every phase. ConversationHistory
+renders the transcript within a token budget:
+
+  • the current phase always stays verbatim, and so do the
+    KEEP_RECENT_PHASES before it when they fit;
+  • older phases are replaced by a summary (LLM-written when a summarizer
+    is configured, otherwise each message clipped to its first sentence);
+  • if that still doesn't fit, the oldest phases are dropped.
+
+Rendering is deterministic and append-only within a phase, so together with
+the stable per-agent system prompt the request prefix stays identical from
+turn to turn — which is what provider-side prompt caching keys on.
+
+Token counts are estimates (≈4 characters per token); no tokenizer needed.
+"""
+
+import re
+
+HISTORY_TOKEN_BUDGET = 900   # tokens of transcript per prompt
+KEEP_RECENT_PHASES = 1       # completed phases kept verbatim when they fit
+CLIP_CHARS = 160             # max characters per clipped message
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+SUMMARY_PROMPT = """Summarize this phase of a team planning discussion in at most {words} words.
+Keep every concrete proposal, owner (@name) and commitment; drop pleasantries.
+
+{transcript}"""
+
+
+def estimate_tokens(text):
+    """Rough token count for *text* (≈4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def clip(text, limit=CLIP_CHARS):
+    """First sentence of *text*, capped at *limit* characters."""
+    first = SENTENCE_END.split(text.strip(), 1)[0]
+    if len(first) > limit:
+        first = first[:limit - 1].rstrip() + "…"
+    return first
+
+
+def group_by_phase(conversation):
+    """[(phase, [messages...]), ...] in discussion order."""
+    groups = []
+    for msg in conversation:
+        phase = msg.get("phase")
+        if not groups or groups[-1][0] != phase:
+            groups.append((phase, []))
+        groups[-1][1].append(msg)
+    return groups
+
+
+def format_lines(messages):
+    return "\n".join(f"{m['agent']}: {m['text']}" for m in messages)
+
+
+class ConversationHistory:
+    """
+    Renders a roundtable's transcript under a token budget and records the
+    prompt size of every turn built from it.
+
+    ``summarizer`` is an optional ``async (prompt) -> str | None`` used by
+    ``summarize_old_phases()``; summaries are cached per phase.
+    """
+
+    def __init__(self, budget_tokens=HISTORY_TOKEN_BUDGET, keep_recent=KEEP_RECENT_PHASES,
+                 summarizer=None):
+        self.budget_tokens = budget_tokens
+        self.keep_recent = keep_recent
+        self.summarizer = summarizer
+        self.summaries = {}
+        self.turns = []
+
+    def _compacted(self, phase, messages):
+        if phase in self.summaries:
+            return f"[{(phase or 'earlier').upper()} — summary] {self.summaries[phase]}"
+        return f"[{(phase or 'earlier').upper()} — condensed]\n" + "\n".join(
+            f"{m['agent']}: {clip(m['text'])}" for m in messages)
+
+    def render(self, conversation, current_phase):
+        """The transcript for a turn in *current_phase*, within the token budget."""
+        if not conversation:
+            return ""
+        full = format_lines(conversation)
+        if estimate_tokens(full) <= self.budget_tokens:
+            return full
+
+        groups = group_by_phase(conversation)
+        completed = [g for g in groups if g[0] != current_phase]
+        current_text = "\n".join(format_lines(msgs) for phase, msgs in groups if phase == current_phase)
+
+        # Condense old phases first; if the recent ones alone still overflow,
+        # condense those too. The current phase is always verbatim.
+        for keep in (min(self.keep_recent, len(completed)), 0):
+            cut = len(completed) - keep
+            blocks = ([self._compacted(phase, msgs) for phase, msgs in completed[:cut]]
+                      + [format_lines(msgs) for _, msgs in completed[cut:]])
+            if estimate_tokens("\n".join(blocks + [current_text])) <= self.budget_tokens:
+                return "\n".join(blocks + [current_text]).strip()
+
+        # Still too long: drop the oldest condensed phases until it fits.
+        dropped = 0
+        while blocks and estimate_tokens("\n".join(blocks + [current_text])) > self.budget_tokens:
+            blocks.pop(0)
+            dropped += 1
+        if dropped:
+            blocks.insert(0, f"(… {dropped} earlier phase(s) omitted …)")
+        return "\n".join(blocks + [current_text]).strip()
+
+    async def summarize_old_phases(self, conversation, current_phase, words=60):
+        """
+        Ask the summarizer for summaries of phases that will be compacted.
+        Only called when the transcript is over budget; each phase is
+        summarized at most once.
+        """
+        if not self.summarizer:
+            return
+        if estimate_tokens(format_lines(conversation)) <= self.budget_tokens:
+            return
+        completed = [g for g in group_by_phase(conversation) if g[0] != current_phase]
+        for phase, messages in completed[:max(0, len(completed) - self.keep_recent)]:
+            if phase in self.summaries:
+                continue
+            summary = await self.summarizer(SUMMARY_PROMPT.format(words=words, transcript=format_lines(messages)))
+            if summary:
+                self.summaries[phase] = " ".join(summary.split())
+
+    def record(self, agent, phase, messages):
+        """Note the estimated prompt size of a turn built from this history."""
+        tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        self.turns.append({"agent": agent, "phase": phase, "prompt_tokens": tokens})
+        return tokens
+
+    def report(self):
+        """Printable per-turn prompt token report."""
+        if not self.turns:
+            return ""
+        lines = [f"  {t['phase'] or '-':<11} {t['agent']:<10} ~{t['prompt_tokens']:>5} prompt tokens"
+                 for t in self.turns]
+        total = sum(t["prompt_tokens"] for t in self.turns)
+        lines.append(f"  {'total':<22} ~{total:>5} prompt tokens over {len(self.turns)} turn(s)")
+        return "\n".join(lines)
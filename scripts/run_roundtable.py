@@ -7,88 +7,168 @@ and runs a structured multi-turn discussion where each agent contributes
 their expertise to produce an actionable solution.
 
 Each agent gets their own LLM call with their actual SOUL.md personality.
-The output is saved to memory/roundtables/ AND streamed to banter.json.
+The output is saved to the conversation store (conversation_store.py),
+exported to memory/roundtables/ AND streamed to banter.json.
+
+Commit-phase turns reply in schema-checked JSON (commitments.py); their
+action items (owner, deliverable, due date) are stored with the run.
 
 Usage:
   python3 run_roundtable.py                  # Auto-pick a random task
   python3 run_roundtable.py --task <file>     # Specific task file
   python3 run_roundtable.py --auto            # Auto-detect new/changed tasks
+  python3 run_roundtable.py --parallel-phases # Run independent phase turns concurrently
+  python3 run_roundtable.py --stream          # Stream turns to the dashboard as they're typed
+  python3 run_roundtable.py --max-agents 8    # Larger roster (default 5)
+  python3 run_roundtable.py --summarize-history  # LLM-summarize old phases when over budget
+  python3 run_roundtable.py --no-context      # Skip retrieved prior discussion (context_builder.py)
+  python3 run_roundtable.py --no-cache        # Always call the LLM (skip the response cache)
+  python3 run_roundtable.py --cache-only      # Replay cached responses only, no network
+  python3 run_roundtable.py --hedge           # Duplicate requests slower than the p95 latency
+  python3 run_roundtable.py --auto --batch 4  # Drain the backlog, 4 roundtables at a time
+      [--max-inflight 8]                      #   cap on concurrent LLM requests and turns
+      [--turn-rate 2]                         #   max turns started per second, across roundtables
+      [--budget-tokens 200000] [--budget-usd 0.50]
+  python3 run_roundtable.py --watch           # Daemon: roundtable tasks as they change
+      [--workers 2] [--debounce 2] [--poll-interval 5]
 """
 
-import json
+import asyncio
 import os
 import sys
 import random
-import hashlib
-import urllib.request
-import urllib.error
+import uuid
 from datetime import datetime
 
+import agent_registry
+import banter_store
+import commitments
+import context_builder
+import conversation_store
+import llm_client
+import llm_metrics
+import task_index
+import task_watcher
+import turn_graph
+from file_cache import get_cache
+from llm_client import call_llm, stream_llm
+from prompt_history import ConversationHistory
+
 # ─── Paths ──────────────────────────────────────────────
 AGENTS_DIR = "/Users/scott/clawd/agents"
 TASKS_DIR = "/Users/scott/clawd/tasks/in-progress"
 ROUNDTABLES_DIR = "/Users/scott/clawd/memory/roundtables"
 BANTER_FILE = "/Users/scott/clawd/deliverables/nexus-ui/src/data/banter.json"
-STATE_FILE = "/Users/scott/clawd/memory/roundtable-state.json"
-
-# ─── LLM Config ─────────────────────────────────────────
-OPENROUTER_API_KEY = "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"
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
-MODEL = "deepseek/deepseek-v3.2"
+BANTER_LOG = "/Users/scott/clawd/memory/banter.jsonl"
+BANTER_LIVE = "/Users/scott/clawd/deliverables/nexus-ui/src/data/banter-live.jsonl"
+STATE_FILE = "/Users/scott/clawd/memory/roundtable-state.json"  # imported once into the store
+CONVERSATION_DB = "/Users/scott/clawd/memory/conversations.sqlite"
 
 # ─── Agent Registry ─────────────────────────────────────
-AGENT_LOOKUP = {
-    "jarvis":   {"name": "Jarvis",   "avatar": "⚙️",  "dir": "developer"},
-    "friday":   {"name": "Friday",   "avatar": "🔍",  "dir": "researcher"},
-    "loki":     {"name": "Loki",     "avatar": "✍️",  "dir": "writer"},
-    "nova":     {"name": "Nova",     "avatar": "🎯",  "dir": "seo-optimizer"},
-    "mercury":  {"name": "Mercury",  "avatar": "📱",  "dir": "social-media"},
-    "echo":     {"name": "Echo",     "avatar": "🎙️",  "dir": "voice"},
-    "atlas":    {"name": "Atlas",    "avatar": "📊",  "dir": "analyst"},
-    "hermes":   {"name": "Hermes",   "avatar": "🚀",  "dir": "growth"},
-    "vera":     {"name": "Vera",     "avatar": "🛡️",  "dir": "compliance"},
-    "astra":    {"name": "Astra",    "avatar": "🌌",  "dir": "strategic"},
-    "athena":   {"name": "Athena",   "avatar": "📝",  "dir": "editor"},
-    "sentinel": {"name": "Sentinel", "avatar": "🔒",  "dir": "security"},
-    "davinci":  {"name": "DaVinci",  "avatar": "🎨",  "dir": "designer"},
-    "orion":    {"name": "Orion",    "avatar": "🎬",  "dir": "producer"},
-    "pixel":    {"name": "Pixel",    "avatar": "👾",  "dir": None},  # Main agent, no sub-folder
-    "designer": {"name": "DaVinci",  "avatar": "🎨",  "dir": "designer"},
+def registry():
+    """Agents by @handle, display name and dir (see agent_registry.py)."""
+    return agent_registry.get_registry(AGENTS_DIR)
+
+
+# Most agents pulled into one roundtable (--max-agents). Prompt size is bounded
+# by ConversationHistory, so larger rosters cost turns, not quadratic context.
+DEFAULT_MAX_AGENTS = 5
+MAX_AGENTS = DEFAULT_MAX_AGENTS
+
+# Summarize old phases with the LLM instead of clipping them (--summarize-history)
+SUMMARIZE_HISTORY = False
+
+# Ground turns in relevant past roundtables and activity (--no-context disables)
+RETRIEVAL_CONTEXT = True
+
+# Set to a banter_store.LiveFeed by --stream to publish turns as tokens arrive
+LIVE_FEED = None
+
+# Phases where each speaker only needs the conversation as it stood when the
+# phase began. "refine" and "commit" react to each other and stay ordered.
+PARALLEL_PHASES = {"understand", "propose"}
+
+# Phases whose replies are structured JSON (commitments.COMMIT_SCHEMA), not streamed
+STRUCTURED_PHASES = {"commit"}
+
+# --watch: a task whose roundtable failed (empty file, LLM down) is retried
+# once it changes, or after a backoff doubling from FAILED_RETRY_BASE seconds
+FAILED_RETRY_BASE = 60.0
+FAILED_RETRY_MAX = 3600.0
+# --watch: longest a steady stream of saves can hold off a rescan
+MAX_DEBOUNCE = 30.0
+
+# ─── Phase Plan ─────────────────────────────────────────
+# (phase, speakers as a slice of the roster). Rosters of two always speak in full.
+PHASE_PLAN = [
+    ("understand", slice(0, 3)),   # First few agents set the stage
+    ("propose", slice(None)),      # Everyone proposes
+    ("refine", slice(1, 3)),       # Key contributors refine
+    ("commit", slice(0, 3)),       # Leads commit
+]
+
+# ─── Prompts ────────────────────────────────────────────
+PIXEL_SOUL = "You are Pixel, the orchestrator. Coordinating, pragmatic, slightly playful. Keeps things moving."
+
+SYSTEM_PROMPT = """You are {name}, an AI agent in a team. Your personality:
+
+{soul}
+
+You are in a TASK ROUNDTABLE — a structured work session to plan how to tackle a real project.
+This is not casual chat. You are here to contribute your expertise and commit to deliverables.
+Keep responses SHORT (2-3 sentences max). Be specific. Reference the actual task details.
+Use @mentions when addressing teammates."""
+
+PHASE_INSTRUCTIONS = {
+    "understand": "Read the task and share YOUR understanding of what needs to happen from YOUR role's perspective. What part is yours? What concerns do you have?",
+    "propose": "Based on the discussion so far, propose your specific contribution. What will YOU do? Be concrete — mention specific tools, approaches, or steps.",
+    "refine": "React to others' proposals. Do you see gaps? Conflicts? Suggest improvements. Push back if something won't work.",
+    "commit": "Finalize your commitment. What exactly will you deliver, and by when? Keep it to 1-2 concrete action items.",
 }
 
+TASK_EXCERPT_CHARS = 1500
+
+
+def soul_path(agent_dir):
+    return os.path.join(AGENTS_DIR, agent_dir, "SOUL.md") if agent_dir else None
+
 
 def load_soul(agent_dir):
-    """Load an agent's SOUL.md."""
+    """Load an agent's SOUL.md (served from the stat-validated file cache)."""
     if not agent_dir:
-        return "You are Pixel, the orchestrator. Coordinating, pragmatic, slightly playful. Keeps things moving."
-    path = os.path.join(AGENTS_DIR, agent_dir, "SOUL.md")
-    try:
-        with open(path, 'r') as f:
-            return f.read()
-    except Exception:
-        return None
+        return PIXEL_SOUL
+    return get_cache().read(soul_path(agent_dir))
+
+
+def system_prompt_for(agent_key):
+    """Rendered roundtable system prompt, rebuilt only when SOUL.md changes."""
+    info = registry().by_handle(agent_key)
+    return get_cache().render(
+        f"roundtable:{info['name']}", soul_path(info["dir"]),
+        lambda soul: SYSTEM_PROMPT.format(name=info["name"], soul=soul or PIXEL_SOUL),
+    )
 
 
 def pick_task(specific_file=None):
     """Pick a task from in-progress."""
+    cache = get_cache()
     if specific_file:
         path = os.path.join(TASKS_DIR, specific_file) if not specific_file.startswith('/') else specific_file
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                return f.read(), os.path.basename(path)
+        content = cache.read(path)
+        if content is not None:
+            return content, os.path.basename(path)
     # Auto-pick
     try:
         tasks = [f for f in os.listdir(TASKS_DIR) if f.endswith('.md')]
         if tasks:
             chosen = random.choice(tasks)
-            with open(os.path.join(TASKS_DIR, chosen), 'r') as f:
-                return f.read(), chosen
+            return cache.read(os.path.join(TASKS_DIR, chosen)), chosen
     except Exception:
         pass
     return None, None
 
 
-def extract_agents(task_content):
+def extract_agents(task_content, max_agents=None):
     """Extract assigned agents from task file."""
     agents = []
     for line in task_content.split('\n'):
@@ -97,101 +177,177 @@ def extract_agents(task_content):
             import re
             mentions = re.findall(r'@(\w+)', line.lower())
             for m in mentions:
-                if m in AGENT_LOOKUP:
-                    agents.append(m)
+                agent = registry().by_handle(m)
+                if agent and agent["handle"] not in agents:
+                    agents.append(agent["handle"])
     # Always include pixel as facilitator if not already there
     if 'pixel' not in agents:
         agents.insert(0, 'pixel')
-    return agents[:5]  # Cap at 5 to keep costs reasonable
+    return agents[:max_agents or MAX_AGENTS]  # Cap to keep costs reasonable
 
 
-def call_llm(messages, max_tokens=200):
-    """Make a single LLM call."""
-    payload = json.dumps({
-        "model": MODEL,
-        "messages": messages,
-        "temperature": 0.8,
-        "max_tokens": max_tokens,
-    }).encode('utf-8')
-
-    req = urllib.request.Request(OPENROUTER_URL, data=payload, headers={
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-    }, method="POST")
-
-    try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            data = json.loads(resp.read().decode('utf-8'))
-            return data['choices'][0]['message']['content'].strip()
-    except Exception as e:
-        print(f"  LLM error: {e}")
-        return None
+def plan_turns(agents, run_id, parallel_phases=False):
+    """
+    The roundtable as a turn graph (see turn_graph.py). Every turn depends on
+    the whole previous phase; in ordered phases it also depends on the turn
+    before it, while PARALLEL_PHASES (with *parallel_phases*) leave a phase's
+    turns independent of each other.
+    """
+    turns, previous = [], []
+    for phase, speakers in PHASE_PLAN:
+        speakers = agents[speakers] if len(agents) > 2 else agents
+        ordered = not (parallel_phases and phase in PARALLEL_PHASES)
+        current = []
+        for agent_key in speakers:
+            deps = [current[-1].id] if ordered and current else [t.id for t in previous]
+            current.append(turn_graph.Turn(f"rt-{run_id}-{len(turns) + len(current) + 1}", agent_key, phase, deps))
+        turns += current
+        previous = current or previous
+    return turns
 
 
-def agent_respond(agent_key, task_content, conversation, phase):
+def turn_messages(agent_key, task_excerpt, conversation, phase, history):
     """
-    Generate ONE agent's contribution to the task discussion.
-    Each agent sees the task + conversation history + their role.
+    The prompt for ONE agent's turn, or None for an unknown agent.
+    Each agent sees the task excerpt + conversation history + their role.
+
+    The system prompt and task message form a prefix that stays identical
+    for this agent across the whole roundtable; only the trailing
+    discussion message changes, compacted by *history* to its token budget.
     """
-    info = AGENT_LOOKUP[agent_key]
-    soul = load_soul(info["dir"])
-    if not soul:
+    info = registry().by_handle(agent_key)
+    system_prompt = system_prompt_for(agent_key)
+    if not system_prompt:
         return None
 
-    other_names = [AGENT_LOOKUP[k]["name"] for k in conversation
-                   if k != agent_key] if isinstance(conversation, dict) else []
-
-    phase_instruction = {
-        "understand": "Read the task and share YOUR understanding of what needs to happen from YOUR role's perspective. What part is yours? What concerns do you have?",
-        "propose": "Based on the discussion so far, propose your specific contribution. What will YOU do? Be concrete — mention specific tools, approaches, or steps.",
-        "refine": "React to others' proposals. Do you see gaps? Conflicts? Suggest improvements. Push back if something won't work.",
-        "commit": "Finalize your commitment. What exactly will you deliver, and by when? Keep it to 1-2 concrete action items.",
-    }
+    chat_history = history.render(conversation, phase)
+    instructions = PHASE_INSTRUCTIONS.get(phase, '')
+    if phase in STRUCTURED_PHASES:
+        instructions += "\n" + commitments.instructions()
 
-    system_prompt = f"""You are {info['name']}, an AI agent in a team. Your personality:
-
-{soul}
+    user_msg = f"""{'DISCUSSION SO FAR:' + chr(10) + chat_history if chat_history else '(You are starting the discussion.)'}
 
-You are in a TASK ROUNDTABLE — a structured work session to plan how to tackle a real project.
-This is not casual chat. You are here to contribute your expertise and commit to deliverables.
-Keep responses SHORT (2-3 sentences max). Be specific. Reference the actual task details.
-Use @mentions when addressing teammates."""
+PHASE: {phase.upper()}
+{instructions}
 
-    chat_history = ""
-    if isinstance(conversation, list) and conversation:
-        chat_history = "\n".join([f"{m['agent']}: {m['text']}" for m in conversation])
+Respond as {info['name']} — stay in character, be specific about this task."""
 
-    user_msg = f"""TASK:
-{task_content[:1500]}
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"TASK:\n{task_excerpt}"},
+        {"role": "user", "content": user_msg},
+    ]
+    history.record(info["name"], phase, messages)
+    return messages
 
-{'DISCUSSION SO FAR:' + chr(10) + chat_history if chat_history else '(You are starting the discussion.)'}
 
-PHASE: {phase.upper()}
-{phase_instruction.get(phase, '')}
+async def agent_respond(agent_key, task_excerpt, conversation, phase, on_text=None, history=None):
+    """
+    Generate ONE agent's contribution to the task discussion.
+    With ``on_text``, the reply is streamed and passed along as it grows.
+    """
+    messages = turn_messages(agent_key, task_excerpt, conversation, phase, history or ConversationHistory())
+    if not messages:
+        return None
+    # Model, max_tokens and temperature come from the route for this phase (model_router.py)
+    if on_text:
+        return await stream_llm(messages, on_text, timeout=20)
+    return await call_llm(messages, timeout=20)
 
-Respond as {info['name']} — stay in character, be specific about this task."""
 
+async def agent_commit(agent_key, task_excerpt, conversation, history=None):
+    """
+    A commit-phase turn: the reply is requested as commitments.COMMIT_SCHEMA
+    JSON and validated, with one retry that quotes the errors back.
+    Returns (message, [commitment dicts]); message is None on failure.
+    """
+    messages = turn_messages(agent_key, task_excerpt, conversation, "commit", history or ConversationHistory())
+    if not messages:
+        return None, []
+    fmt = commitments.response_format()
+    reply = await call_llm(messages, timeout=20, response_format=fmt)
+    message, items, errors = commitments.parse_reply(reply, roster=registry())
+    if errors and reply:
+        retry = messages + [{"role": "assistant", "content": reply},
+                            {"role": "user", "content": commitments.repair_prompt(errors)}]
+        reply = await call_llm(retry, timeout=20, response_format=fmt)
+        message, items, errors = commitments.parse_reply(reply, roster=registry())
+    if errors:
+        print(f"  ⚠️ Unusable commitment from @{agent_key}: {'; '.join(errors[:3])}")
+        # Keep the spoken part if there was one; never the raw JSON
+        return message, []
+    return message, items
+
+
+async def summarize(prompt):
+    """History summarizer for --summarize-history: one short, low-temperature call."""
     messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_msg}
+        {"role": "system", "content": "You condense meeting transcripts. Be terse and factual."},
+        {"role": "user", "content": prompt},
     ]
+    return await call_llm(messages, timeout=20)  # routed as phase "summary"
 
-    return call_llm(messages)
 
+def clean_response(response, agent_names):
+    """Strip self-references ("Jarvis: ...") and wrapping quotes."""
+    for name in agent_names:
+        if response.startswith(f"{name}: "):
+            response = response[len(f"{name}: "):]
+    if response.startswith('"') and response.endswith('"'):
+        response = response[1:-1]
+    return response
 
-def run_roundtable(task_file=None):
-    """Run a structured multi-agent roundtable on a real task."""
+
+async def take_turn(agent_key, task_excerpt, conversation, phase, msg_id, agent_names, history=None):
+    """
+    Run one agent turn, streaming it to LIVE_FEED when enabled.
+    Returns (cleaned reply, [commitments]); only commit turns have commitments.
+    """
+    info = registry().by_handle(agent_key)
+    on_text = None
+    live_msg = {"id": msg_id, "agent": info["name"], "avatar": info["avatar"], "phase": phase}
+    if LIVE_FEED and phase not in STRUCTURED_PHASES:
+        on_text = lambda text: LIVE_FEED.publish(live_msg, clean_response(text, agent_names))
+    items = []
+    with llm_metrics.labels(agent=info["name"], phase=phase, turn=msg_id):
+        if phase in STRUCTURED_PHASES:
+            response, items = await agent_commit(agent_key, task_excerpt, conversation, history=history)
+        else:
+            response = await agent_respond(agent_key, task_excerpt, conversation, phase,
+                                           on_text=on_text, history=history)
+    response = clean_response(response, agent_names) if response else None
+    if LIVE_FEED:
+        LIVE_FEED.finish(live_msg, response)
+    return response, items
+
+
+async def run_roundtable(task_file=None, parallel_phases=False):
+    """
+    Run a structured multi-agent roundtable on a real task.
+
+    Turns come from plan_turns() and run on the shared turn scheduler as
+    soon as the turns they depend on are done. With ``parallel_phases``,
+    speakers in PARALLEL_PHASES run concurrently. Returns the conversation
+    (in plan order), or None if nothing was generated.
+    """
     task_content, filename = pick_task(task_file)
     if not task_content:
         print("❌ No tasks found in /tasks/in-progress/")
-        return
+        return None
 
+    task_excerpt = task_content[:TASK_EXCERPT_CHARS]
+    if RETRIEVAL_CONTEXT:
+        # Part of the task message, so the per-agent prompt prefix stays stable.
+        background = context_builder.build_context(task_content)
+        if background:
+            task_excerpt += f"\n\nRELEVANT PRIOR DISCUSSION:\n{background}"
     agents = extract_agents(task_content)
     if len(agents) < 2:
         # Add some relevant agents
         agents.extend(random.sample(['jarvis', 'friday', 'nova'], min(2, 3 - len(agents))))
 
-    agent_names = [AGENT_LOOKUP[a]["name"] for a in agents]
+    roster = registry()
+    agent_names = [roster.by_handle(a)["name"] for a in agents]
     title = filename.replace('.md', '').replace('-', ' ').title() if filename else "Unknown Task"
 
     print(f"╔══════════════════════════════════════════╗")
@@ -199,116 +355,73 @@ def run_roundtable(task_file=None):
     print(f"║  👥 {', '.join(agent_names):<39} ║")
     print(f"╚══════════════════════════════════════════╝")
 
-    conversation = []
-    # Structured phases: understand → propose → refine → commit
-    phases = ["understand", "propose", "refine", "commit"]
-
-    for phase in phases:
-        print(f"\n📋 Phase: {phase.upper()}")
-        # Each agent speaks once per relevant phase
-        # Not all agents speak in every phase
-        if phase == "understand":
-            speakers = agents[:3]  # First few agents set the stage
-        elif phase == "propose":
-            speakers = agents  # Everyone proposes
-        elif phase == "refine":
-            speakers = agents[1:3] if len(agents) > 2 else agents  # Key contributors refine
-        else:  # commit
-            speakers = agents[:3]  # Leads commit
-
-        for agent_key in speakers:
-            info = AGENT_LOOKUP[agent_key]
-            print(f"  → {info['name']} ({phase})...", end=" ", flush=True)
-
-            response = agent_respond(agent_key, task_content, conversation, phase)
-
-            if response:
-                # Clean self-references
-                for name in agent_names:
-                    if response.startswith(f"{name}: "):
-                        response = response[len(f"{name}: "):]
-                if response.startswith('"') and response.endswith('"'):
-                    response = response[1:-1]
-
-                conversation.append({
-                    "agent": info["name"],
-                    "text": response,
-                    "phase": phase,
-                })
-                print("✓")
-            else:
-                print("✗")
+    run_id = uuid.uuid4().hex[:8]
+    llm_metrics.set_labels(script="roundtable", run=run_id, task=filename, agent=None, phase="summary")
+    history = ConversationHistory(summarizer=summarize if SUMMARIZE_HISTORY else None)
+    turns = plan_turns(agents, run_id, parallel_phases)
+    by_id = {t.id: t for t in turns}
+    replies = {}
+    started_phases = set()
+    summarizing = asyncio.Lock()
+
+    async def run_turn(turn):
+        if turn.phase not in started_phases:
+            started_phases.add(turn.phase)
+            print(f"\n📋 Phase: {turn.phase.upper()}")
+        # A turn sees exactly the replies it depends on, in plan order.
+        seen = turn_graph.ancestors(turn, by_id)
+        visible = [replies[t.id] for t in turns if t.id in seen and t.id in replies]
+        async with summarizing:
+            await history.summarize_old_phases(visible, turn.phase)
+        info = roster.by_handle(turn.agent)
+        response, items = await take_turn(turn.agent, task_excerpt, visible, turn.phase, turn.id,
+                                          agent_names, history)
+        if response:
+            replies[turn.id] = {"id": turn.id, "agent": info["name"], "text": response, "phase": turn.phase}
+            if items:
+                replies[turn.id]["commitments"] = items
+        pinned = f" — 📌 {len(items)} commitment(s)" if items else ""
+        print(f"  {'✓' if response else '✗'} {info['name']} ({turn.phase}){pinned}")
+        return response
+
+    _, schedule = await turn_graph.get_scheduler().run(turns, run_turn)
+    conversation = [replies[t.id] for t in turns if t.id in replies]
 
     if not conversation:
         print("❌ No messages generated")
-        return
+        return None
 
-    # ─── Save to memory/roundtables/ ────────────────────
-    os.makedirs(ROUNDTABLES_DIR, exist_ok=True)
+    # ─── Save to the conversation store ─────────────────
+    # The markdown transcript under memory/roundtables/ is an export of it.
     now = datetime.now()
-    rt_filename = f"{now.strftime('%Y-%m-%d-%H%M')}-{filename.replace('.md','')[:30]}.md" if filename else f"{now.strftime('%Y-%m-%d-%H%M')}-roundtable.md"
-    rt_path = os.path.join(ROUNDTABLES_DIR, rt_filename)
-
-    md_lines = [
-        f"# Roundtable: {title}",
-        f"**Date:** {now.strftime('%Y-%m-%d %H:%M')}",
-        f"**Format:** Task collaboration — structured problem-solving",
-        f"**Participants:** {', '.join([AGENT_LOOKUP[a]['avatar'] + ' ' + AGENT_LOOKUP[a]['name'] for a in agents])}",
-        f"**Task File:** `{filename}`",
-        "",
-        "---",
-        "",
-    ]
-
-    current_phase = None
-    for msg in conversation:
-        if msg.get("phase") != current_phase:
-            current_phase = msg["phase"]
-            md_lines.append(f"### Phase: {current_phase.title()}")
-            md_lines.append("")
-        avatar = AGENT_LOOKUP.get(msg['agent'].lower(), {}).get('avatar', '🤖')
-        # Find avatar by name
-        for k, v in AGENT_LOOKUP.items():
-            if v['name'] == msg['agent']:
-                avatar = v['avatar']
-                break
-        md_lines.append(f"**{avatar} {msg['agent']}:** {msg['text']}")
-        md_lines.append("")
-
-    with open(rt_path, 'w') as f:
-        f.write("\n".join(md_lines))
+    critical_path, _ = schedule.critical_path()
+    conversations = store()
+    conversations.sync_agents(roster.agents)
+    conversations.save_run(
+        f"rt-{run_id}", "roundtable", [{**m, "avatar": roster.avatar_for(m["agent"])} for m in conversation],
+        task_file=filename, title=title, started_at=now,
+        participants=[{"name": roster.by_handle(a)["name"], "avatar": roster.by_handle(a)["avatar"]} for a in agents],
+        meta={"wall_s": round(schedule.wall, 3), "critical_path_s": round(critical_path, 3),
+              "parallelism": round(schedule.parallelism, 2)},
+    )
+    rt_path = conversations.export_markdown(f"rt-{run_id}", ROUNDTABLES_DIR)
     print(f"\n📄 Saved roundtable: {rt_path}")
 
     # ─── Also push to banter.json for dashboard ─────────
     ts = now.strftime("%H:%M:%S")
     formatted = []
     for i, msg in enumerate(conversation):
-        avatar = "🤖"
-        for k, v in AGENT_LOOKUP.items():
-            if v['name'] == msg['agent']:
-                avatar = v['avatar']
-                break
         formatted.append({
+            "id": msg["id"],
             "agent": msg["agent"],
-            "avatar": avatar,
+            "avatar": roster.avatar_for(msg["agent"]),
             "color": "bg-blue-500",
             "text": msg["text"],
             "turn": i + 1,
             "timestamp": ts,
         })
 
-    existing = []
-    try:
-        if os.path.exists(BANTER_FILE):
-            with open(BANTER_FILE, 'r') as f:
-                existing = json.load(f).get("messages", [])
-    except Exception:
-        pass
-
-    all_msgs = (existing + formatted)[-30:]
-    os.makedirs(os.path.dirname(BANTER_FILE), exist_ok=True)
-    with open(BANTER_FILE, 'w') as f:
-        json.dump({"messages": all_msgs, "last_updated": now.isoformat()}, f, indent=2)
+    banter_store.append_messages(formatted, log_path=BANTER_LOG, snapshot_path=BANTER_FILE)
 
     print(f"💬 Pushed {len(formatted)} messages to dashboard")
 
@@ -317,76 +430,72 @@ def run_roundtable(task_file=None):
     print(f"📋 ROUNDTABLE SUMMARY")
     print(f"{'='*50}")
     for msg in conversation:
-        avatar = "🤖"
-        for k, v in AGENT_LOOKUP.items():
-            if v['name'] == msg['agent']:
-                avatar = v['avatar']
-                break
+        avatar = roster.avatar_for(msg['agent'])
         phase_tag = f"[{msg.get('phase','').upper()}]" if msg.get('phase') else ""
         print(f"  {avatar} {msg['agent']} {phase_tag}: {msg['text']}")
     print()
+    print("🧮 Prompt size per turn (estimated):")
+    print(history.report())
+    print(f"🕸️ Schedule: {schedule.summary()}")
+    print_run_metrics(run_id)
+    return conversation
 
 
-
-def load_state():
-    """Load roundtable tracking state."""
+def print_run_metrics(run_id):
+    """Per-call latency/token/cost table for one run; refreshes the Prometheus file."""
+    metrics = llm_client.get_client().metrics
+    if metrics is None:
+        return
+    print(f"\n📈 LLM calls (run {run_id}):")
+    print(llm_metrics.summary_table(metrics.select(run=run_id)))
+    router = llm_client.get_client().router
+    if router is not None and (router.failovers or any(s["degraded"] for s in router.stats().values())):
+        print(f"\n🧭 Model health:\n{router.summary()}")
     try:
-        if os.path.exists(STATE_FILE):
-            with open(STATE_FILE, 'r') as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {"discussed": {}}
+        metrics.write_prometheus()
+    except OSError as e:
+        print(f"  ⚠️ Could not write Prometheus metrics: {e}")
+    print()
 
 
-def save_state(state):
-    """Save roundtable tracking state."""
-    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
 
+def store():
+    """Runs, turns and task state (see conversation_store.py)."""
+    conversations = conversation_store.get_store(CONVERSATION_DB)
+    conversations.import_state_once(STATE_FILE)
+    return conversations
 
-def get_task_hash(filepath):
-    """Get content hash of a task file to detect changes."""
-    try:
-        with open(filepath, 'r') as f:
-            return hashlib.md5(f.read().encode()).hexdigest()
-    except Exception:
-        return None
+
+# Fingerprints from the latest scan, so mark_discussed records exactly the
+# content that was discussed without rehashing it.
+_scanned = {}
 
 
 def find_undiscussed_tasks():
     """Find tasks that are new or have changed since last roundtable."""
-    state = load_state()
-    discussed = state.get("discussed", {})
-    needs_discussion = []
-
     try:
-        for fn in os.listdir(TASKS_DIR):
-            if not fn.endswith('.md'):
-                continue
-            filepath = os.path.join(TASKS_DIR, fn)
-            current_hash = get_task_hash(filepath)
-            if current_hash and discussed.get(fn) != current_hash:
-                needs_discussion.append(fn)
-    except Exception:
-        pass
+        changed, refreshed = task_index.scan(TASKS_DIR, store().discussed())
+    except OSError:
+        return []
+
+    if refreshed:
+        # Touched but unchanged (or legacy MD5) entries: store fresh stat
+        # fields so the next scan skips them without opening the file.
+        store().refresh_fingerprints(refreshed)
 
-    return needs_discussion
+    _scanned.update(changed)
+    return sorted(changed)
 
 
-def mark_discussed(filename):
-    """Mark a task as discussed with its current content hash."""
-    state = load_state()
-    filepath = os.path.join(TASKS_DIR, filename)
-    current_hash = get_task_hash(filepath)
-    if current_hash:
-        state["discussed"][filename] = current_hash
-        state["last_roundtable"] = datetime.now().isoformat()
-        save_state(state)
+def mark_discussed(filename, fingerprint=None):
+    """Mark a task as discussed with its fingerprint (size, mtime, inode, hash)."""
+    fp = (fingerprint or _scanned.pop(filename, None)
+          or task_index.fingerprint(os.path.join(TASKS_DIR, filename)))
+    if fp:
+        store().mark_discussed(filename, fp)
 
 
-def auto_roundtable():
+async def auto_roundtable(parallel_phases=False, batch=None, budget_tokens=None, budget_usd=None):
     """Auto-detect new/changed tasks and run roundtables on them."""
     undiscussed = find_undiscussed_tasks()
 
@@ -398,10 +507,14 @@ def auto_roundtable():
     for t in undiscussed:
         print(f"   • {t}")
 
+    if batch:
+        await batch_roundtable(undiscussed, batch, parallel_phases, budget_tokens, budget_usd)
+        return
+
     # Run 1 roundtable per auto-run (keeps costs low)
     task_file = undiscussed[0]
     print(f"\n🏛️ Starting roundtable for: {task_file}")
-    run_roundtable(task_file)
+    await run_roundtable(task_file, parallel_phases=parallel_phases)
     mark_discussed(task_file)
     print(f"✅ Marked as discussed: {task_file}")
 
@@ -410,12 +523,200 @@ def auto_roundtable():
         print(f"📋 {remaining} more task(s) will be discussed in the next run.")
 
 
-if __name__ == "__main__":
-    if "--auto" in sys.argv:
-        auto_roundtable()
+def over_budget(budget_tokens=None, budget_usd=None):
+    """True once the shared LLM client has spent the token or cost budget."""
+    client = llm_client.get_client()
+    if budget_tokens is not None and client.total_tokens >= budget_tokens:
+        return True
+    if budget_usd is not None and client.usage["cost_usd"] >= budget_usd:
+        return True
+    return False
+
+
+async def batch_roundtable(task_files, batch, parallel_phases=False, budget_tokens=None, budget_usd=None):
+    """
+    Run roundtables for every task in *task_files*, up to *batch* at a time.
+
+    Concurrent LLM requests across all roundtables are capped by the shared
+    client's pool. Each task is marked discussed as soon as its roundtable
+    finishes, so a crash only repeats the ones still in flight. Once the
+    token/cost budget is spent, no new roundtables are started. Returns the
+    task files whose roundtable completed.
+    """
+    slots = asyncio.Semaphore(batch)
+    completed, skipped = [], []
+
+    async def run_one(task_file):
+        async with slots:
+            if over_budget(budget_tokens, budget_usd):
+                skipped.append(task_file)
+                return
+            print(f"\n🏛️ Starting roundtable for: {task_file}")
+            conversation = await run_roundtable(task_file, parallel_phases=parallel_phases)
+            if conversation:
+                mark_discussed(task_file)
+                completed.append(task_file)
+                print(f"✅ Marked as discussed: {task_file}")
+            else:
+                skipped.append(task_file)
+
+    await asyncio.gather(*[run_one(t) for t in task_files])
+
+    usage = llm_client.get_client().usage
+    print(f"\n📦 Batch complete: {len(completed)}/{len(task_files)} roundtable(s), "
+          f"{usage['prompt_tokens'] + usage['completion_tokens']} tokens, ~${usage['cost_usd']:.4f}, "
+          f"{usage['cache_hits']} cache hit(s), {usage['coalesced']} coalesced, {usage['retries']} retried, "
+          f"{usage['failures']} failed call(s)")
+    if skipped:
+        reason = "budget spent or no messages" if (budget_tokens or budget_usd) else "no messages"
+        print(f"📋 {len(skipped)} task(s) left for the next run ({reason}).")
+    return completed
+
+
+async def watch_roundtables(workers=2, debounce=2.0, poll_interval=task_watcher.POLL_INTERVAL,
+                            parallel_phases=False):
+    """
+    Daemon mode: watch TASKS_DIR and run a roundtable whenever a task changes.
+
+    Filesystem events (inotify, or polling where unavailable) are debounced
+    so a burst of saves triggers one rescan, at most MAX_DEBOUNCE seconds
+    late; the stat-based scan then queues new/changed tasks for a pool of
+    *workers*. A task is never queued
+    twice while pending, and finishing a roundtable triggers a rescan in
+    case the file changed while it was being discussed. A task whose
+    roundtable failed is held back until its fingerprint changes or its
+    retry backoff runs out, so a broken task or a down LLM can't spin.
+    """
+    watcher = task_watcher.open_watcher(TASKS_DIR, poll_interval=poll_interval)
+    queue = asyncio.Queue()
+    pending = set()
+    failed = {}   # task file → (fingerprint, retry at (loop time), failures)
+    loop = asyncio.get_running_loop()
+    rescan = asyncio.Event()
+    rescan.set()  # initial scan picks up anything changed while we were down
+
+    print(f"👀 Watching {TASKS_DIR} ({watcher.kind}, {workers} worker(s), {debounce:g}s debounce)")
+
+    async def worker():
+        while True:
+            task_file, fp = await queue.get()
+            done = False
+            try:
+                print(f"\n🏛️ Starting roundtable for: {task_file}")
+                conversation = await run_roundtable(task_file, parallel_phases=parallel_phases)
+                if conversation:
+                    mark_discussed(task_file, fp)
+                    failed.pop(task_file, None)
+                    done = True
+                    print(f"✅ Marked as discussed: {task_file}")
+            except Exception as e:
+                print(f"❌ Roundtable failed for {task_file}: {e}")
+            finally:
+                if not done:
+                    last_fp, _, failures = failed.get(task_file, (fp, 0.0, 0))
+                    if last_fp != fp:
+                        failures = 0  # a new version of the task starts a fresh backoff
+                    delay = min(FAILED_RETRY_MAX, FAILED_RETRY_BASE * 2 ** failures)
+                    failed[task_file] = (fp, loop.time() + delay, failures + 1)
+                    loop.call_later(delay, rescan.set)
+                    print(f"⏸️ {task_file}: retrying in {delay:.0f}s, or as soon as it changes")
+                pending.discard(task_file)
+                queue.task_done()
+                rescan.set()
+
+    async def watch():
+        while True:
+            names = await asyncio.to_thread(watcher.wait, 1.0)
+            if names is not None and not any(n.endswith('.md') for n in names):
+                continue
+            # Debounce: wait for the directory to go quiet before rescanning,
+            # but no longer than MAX_DEBOUNCE. None (a polling tick or an
+            # inotify overflow) carries no "quiet" signal, so rescan now.
+            deadline = loop.time() + MAX_DEBOUNCE
+            while loop.time() < deadline:
+                more = await asyncio.to_thread(watcher.wait, min(debounce, deadline - loop.time()))
+                if not more:
+                    break
+            rescan.set()
+
+    async def scanner():
+        while True:
+            await rescan.wait()
+            rescan.clear()
+            for task_file in find_undiscussed_tasks():
+                if task_file in pending:
+                    continue
+                fp = _scanned.pop(task_file, None)
+                held = failed.get(task_file)
+                if held and held[0] == fp and loop.time() < held[1]:
+                    continue  # failed at this fingerprint; backing off
+                pending.add(task_file)
+                queue.put_nowait((task_file, fp))
+                print(f"📥 Queued: {task_file}")
+
+    tasks = [asyncio.create_task(worker()) for _ in range(max(1, workers))]
+    tasks += [asyncio.create_task(watch()), asyncio.create_task(scanner())]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+        watcher.close()
+
+
+def arg_value(flag, cast=str, default=None):
+    """Return the value following *flag* in sys.argv, or *default*."""
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+def main():
+    """
+    Run the command line in sys.argv. Every option is reset on each call,
+    so a resident worker (nexus_agents.py) can run job after job.
+    """
+    global LIVE_FEED, MAX_AGENTS, SUMMARIZE_HISTORY, RETRIEVAL_CONTEXT
+    parallel = "--parallel-phases" in sys.argv
+    LIVE_FEED = banter_store.LiveFeed(BANTER_LIVE) if "--stream" in sys.argv else None
+    MAX_AGENTS = arg_value("--max-agents", int, DEFAULT_MAX_AGENTS)
+    SUMMARIZE_HISTORY = "--summarize-history" in sys.argv
+    RETRIEVAL_CONTEXT = "--no-context" not in sys.argv
+    max_inflight = arg_value("--max-inflight", int)
+    max_connections = max_inflight or llm_client.MAX_CONNECTIONS
+    if max_connections != llm_client.get_client().max_connections:
+        llm_client.configure(max_connections=max_connections)
+    turn_graph.configure(max_concurrency=max_inflight or turn_graph.MAX_CONCURRENT_TURNS,
+                         rate=arg_value("--turn-rate", float))
+    llm_client.set_cache_mode("off" if "--no-cache" in sys.argv
+                              else "only" if "--cache-only" in sys.argv else "use")
+    llm_client.set_hedging("--hedge" in sys.argv)
+    if "--watch" in sys.argv:
+        try:
+            asyncio.run(watch_roundtables(
+                workers=arg_value("--workers", int, 2),
+                debounce=arg_value("--debounce", float, 2.0),
+                poll_interval=arg_value("--poll-interval", float, task_watcher.POLL_INTERVAL),
+                parallel_phases=parallel,
+            ))
+        except KeyboardInterrupt:
+            print("\n👋 Watch stopped.")
+    elif "--auto" in sys.argv:
+        asyncio.run(auto_roundtable(
+            parallel_phases=parallel,
+            batch=arg_value("--batch", int),
+            budget_tokens=arg_value("--budget-tokens", int),
+            budget_usd=arg_value("--budget-usd", float),
+        ))
     elif "--task" in sys.argv:
         idx = sys.argv.index("--task")
         task_file = sys.argv[idx + 1] if idx + 1 < len(sys.argv) else None
-        run_roundtable(task_file)
+        asyncio.run(run_roundtable(task_file, parallel_phases=parallel))
     else:
-        run_roundtable()
+        asyncio.run(run_roundtable(parallel_phases=parallel))
+
+
+if __name__ == "__main__":
+    main()
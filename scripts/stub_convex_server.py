@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Stub Convex Server — local stand-in for the Convex HTTP API
+
+Implements POST /api/mutation for the bulk mutations in convex/ingest.ts
+(ingest:upsertMemories, ingest:upsertScheduledTasks, ingest:logActivities)
+against in-memory tables with
+the same idempotency-key semantics, so convex_ingest.py can be exercised
+without a deployment. ``failure_rate`` of requests get a 503 with
+Retry-After, to exercise retries and resumption.
+
+Usage:
+  python3 stub_convex_server.py                    # Listen on 127.0.0.1:3210
+  python3 stub_convex_server.py --failure-rate 0.2
+
+  CONVEX_URL=http://127.0.0.1:3210 python3 convex_ingest.py
+"""
+
+import json
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubConvexHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"status": "error", "errorMessage": "invalid JSON"})
+            return
+        if self.path.split("?")[0] != "/api/mutation":
+            self._send_json(404, {"status": "error", "errorMessage": f"unknown path {self.path}"})
+            return
+        if self.server.should_fail():
+            self._send_json(503, {"status": "error", "errorMessage": "stub: injected failure"},
+                            {"Retry-After": "0"})
+            return
+        handler = self.server.mutations.get(request.get("path"))
+        if handler is None:
+            self._send_json(200, {"status": "error",
+                                  "errorMessage": f"Could not find function for '{request.get('path')}'"})
+            return
+        value = handler(request.get("args") or {})
+        self._send_json(200, {"status": "success", "value": value, "logLines": []})
+
+
+class StubConvexServer(ThreadingHTTPServer):
+    """Threaded stub with in-memory ``memories``, ``scheduled_tasks`` and ``activities`` tables."""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), failure_rate=0.0):
+        super().__init__(address, StubConvexHandler)
+        self.failure_rate = failure_rate
+        self.failure_count = 0
+        self.mutation_count = 0
+        self.tables = {"memories": {}, "scheduled_tasks": {}, "activities": {}}  # ingestKey → row
+        self._lock = threading.Lock()
+        self.mutations = {
+            "ingest:upsertMemories": self.upsert_memories,
+            "ingest:upsertScheduledTasks": self.upsert_scheduled_tasks,
+            "ingest:logActivities": self.log_activities,
+        }
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def should_fail(self):
+        if not self.failure_rate or random.random() >= self.failure_rate:
+            return False
+        with self._lock:
+            self.failure_count += 1
+        return True
+
+    def upsert_memories(self, args):
+        inserted = updated = skipped = 0
+        with self._lock:
+            self.mutation_count += 1
+            table = self.tables["memories"]
+            for item in args.get("items", []):
+                existing = table.get(item["ingestKey"])
+                if existing is None:
+                    table[item["ingestKey"]] = dict(item)
+                    inserted += 1
+                elif existing["content"] != item["content"] or existing["title"] != item["title"]:
+                    existing.update(item)
+                    updated += 1
+                else:
+                    skipped += 1
+        return {"inserted": inserted, "updated": updated, "skipped": skipped}
+
+    def upsert_scheduled_tasks(self, args):
+        inserted = updated = skipped = 0
+        with self._lock:
+            self.mutation_count += 1
+            table = self.tables["scheduled_tasks"]
+            for item in args.get("items", []):
+                existing = table.get(item["ingestKey"])
+                if existing is None:
+                    table[item["ingestKey"]] = dict(item)
+                    inserted += 1
+                elif any(existing.get(k) != v for k, v in item.items()):
+                    existing.update(item)
+                    updated += 1
+                else:
+                    skipped += 1
+        return {"inserted": inserted, "updated": updated, "skipped": skipped}
+
+    def log_activities(self, args):
+        inserted = skipped = 0
+        with self._lock:
+            self.mutation_count += 1
+            table = self.tables["activities"]
+            for item in args.get("items", []):
+                if item["ingestKey"] in table:
+                    skipped += 1
+                    continue
+                table[item["ingestKey"]] = dict(item)
+                inserted += 1
+        return {"inserted": inserted, "updated": 0, "skipped": skipped}
+
+
+def start_stub_server(port=0, failure_rate=0.0):
+    """Start a stub Convex server on a background thread and return it."""
+    server = StubConvexServer(("127.0.0.1", port), failure_rate=failure_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    port = 3210
+    if "--port" in sys.argv:
+        port = int(sys.argv[sys.argv.index("--port") + 1])
+    failure_rate = 0.0
+    if "--failure-rate" in sys.argv:
+        failure_rate = float(sys.argv[sys.argv.index("--failure-rate") + 1])
+    server = StubConvexServer(("127.0.0.1", port), failure_rate=failure_rate)
+    print(f"🧪 Stub Convex server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
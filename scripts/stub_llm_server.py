@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Stub LLM Server — local stand-in for the OpenRouter chat-completions endpoint
+
+Answers POST /api/v1/chat/completions with an OpenAI-shaped body over
+HTTP/1.1 keep-alive, so the generators can be exercised without API credits.
+Requests with ``"stream": true`` get an SSE body (chunked transfer encoding)
+with one delta per word, like the real endpoint. Requests with a
+``response_format`` get a JSON reply in the roundtable commitment shape.
+
+Usage:
+  python3 stub_llm_server.py                  # Listen on 127.0.0.1:8765
+  python3 stub_llm_server.py --port 9000
+  python3 stub_llm_server.py --failure-rate 0.2   # 20% of requests get a 503
+  python3 stub_llm_server.py --latency lognormal:0.8,0.5 --token-latency 0.02
+
+Latency specs (seconds): 0.3 or fixed:0.3, uniform:LO,HI, normal:MEAN,SD,
+lognormal:MEDIAN,SIGMA (long right tail, like a real provider), exp:MEAN.
+
+  OPENROUTER_URL=http://127.0.0.1:8765/api/v1/chat/completions \\
+      python3 run_roundtable.py --task some-task.md
+"""
+
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATH = "/api/v1/chat/completions"
+
+
+def latency_sampler(spec):
+    """Zero-argument callable drawing a delay in seconds from a latency spec."""
+    if not spec:
+        return lambda: 0.0
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+    kind, _, args = str(spec).partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    params = [float(a) for a in args.split(",")]
+    if kind == "fixed":
+        return lambda: params[0]
+    if kind == "uniform":
+        return lambda: random.uniform(params[0], params[1])
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(params[0], params[1]))
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(math.log(params[0]), params[1])
+    if kind == "exp":
+        return lambda: random.expovariate(1.0 / params[0])
+    raise ValueError(f"unknown latency distribution {kind!r}")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+
+    def setup(self):
+        super().setup()
+        self.server.record_connection()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+        if self.path.split("?")[0] != CHAT_PATH:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        self.server.record_request(payload)
+        if self.server.should_fail():
+            self.send_response(self.server.failure_status)
+            raw = b'{"error": {"message": "stub: injected failure"}}'
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(raw)
+            return
+        messages = payload.get("messages") or []
+        reply = self.server.reply_for(payload)
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        completion_tokens = max(1, len(reply) // 4)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        if payload.get("stream"):
+            self._stream_reply(payload, reply, usage)
+            return
+        self._send_json(200, {
+            "id": f"stub-{self.server.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _stream_reply(self, payload, reply, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._write_chunk(b": STUB PROCESSING\n\n")
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            if self.server.token_latency:
+                time.sleep(self.server.token_latency)
+            chunk = {
+                "id": f"stub-{self.server.request_count}",
+                "object": "chat.completion.chunk",
+                "model": payload.get("model", "stub"),
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}}],
+            }
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        final = {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+        self._write_chunk(f"data: {json.dumps(final)}\n\n".encode())
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """
+    Threaded stub server that counts connections and requests. ``latency``
+    is a number or a latency spec (see latency_sampler); ``failure_rate``
+    of requests are answered with ``failure_status`` instead.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency=0.0, token_latency=0.0,
+                 failure_rate=0.0, failure_status=503):
+        super().__init__(address, StubHandler)
+        self.latency = latency  # property: parses the spec
+        self.token_latency = token_latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.failure_count = 0
+        self.connection_count = 0
+        self.request_count = 0
+        self.requests = []
+        self._stats_lock = threading.Lock()
+
+    @property
+    def latency(self):
+        return self._latency
+
+    @latency.setter
+    def latency(self, spec):
+        self._sample_latency = latency_sampler(spec)
+        self._latency = spec
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{CHAT_PATH}"
+
+    def record_connection(self):
+        with self._stats_lock:
+            self.connection_count += 1
+
+    def record_request(self, payload):
+        with self._stats_lock:
+            self.request_count += 1
+            self.requests.append(payload)
+
+    def should_fail(self):
+        """Roll for an injected failure (counted in failure_count)."""
+        if not self.failure_rate or random.random() >= self.failure_rate:
+            return False
+        with self._stats_lock:
+            self.failure_count += 1
+        return True
+
+    def reply_for(self, payload):
+        """Build a deterministic reply naming the agent from the system prompt."""
+        delay = self._sample_latency()
+        if delay:
+            time.sleep(delay)
+        system = next((m.get("content", "") for m in payload.get("messages") or []
+                       if m.get("role") == "system"), "")
+        name = "Agent"
+        if system.startswith("You are "):
+            name = system[len("You are "):].split(",", 1)[0]
+        text = f"{name} here — stub reply #{self.request_count}."
+        if payload.get("response_format"):
+            # Structured request (roundtable commit phase): one schema-valid commitment
+            due = time.strftime("%Y-%m-%d", time.localtime(time.time() + 3 * 86400))
+            return json.dumps({"message": text, "commitments": [
+                {"owner": name, "deliverable": f"Stub deliverable #{self.request_count}", "due": due}]})
+        return text
+
+
+def start_stub_server(port=0, latency=0.0, token_latency=0.0, failure_rate=0.0, failure_status=503):
+    """Start a stub server on a background thread and return it."""
+    server = StubLLMServer(("127.0.0.1", port), latency=latency, token_latency=token_latency,
+                           failure_rate=failure_rate, failure_status=failure_status)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    port = 8765
+    if "--port" in sys.argv:
+        idx = sys.argv.index("--port")
+        port = int(sys.argv[idx + 1])
+    options = {}
+    for flag, key, cast in (("--latency", "latency", str), ("--token-latency", "token_latency", float),
+                            ("--failure-rate", "failure_rate", float),
+                            ("--failure-status", "failure_status", int)):
+        if flag in sys.argv:
+            options[key] = cast(sys.argv[sys.argv.index(flag) + 1])
+    server = StubLLMServer(("127.0.0.1", port), **options)
+    print(f"🧪 Stub LLM server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
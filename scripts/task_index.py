@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Task Index — incremental change detection for task files
+
+Each discussed task is recorded in the conversation store's tasks table
+(formerly roundtable-state.json) as a fingerprint:
+
+    {"size": 1234, "mtime_ns": 1700000000000000000, "inode": 42, "hash": "..."}
+
+A scan is a single os.scandir() pass. Files whose (size, mtime_ns, inode)
+match their fingerprint are skipped without being opened; only touched files
+are rehashed (blake2b), and a touched file whose content hash is unchanged
+just gets its stat fields refreshed.
+
+Older state files stored a bare MD5 hex digest per task; those entries are
+compared with MD5 once and upgraded in place.
+"""
+
+import hashlib
+import os
+
+HASH_CHUNK = 1 << 16
+
+
+def hash_file(path):
+    """blake2b digest of a file's bytes, or None if it can't be read."""
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def legacy_md5(path):
+    """The MD5 digest older state files recorded (hash of the decoded text)."""
+    try:
+        with open(path, 'r') as f:
+            return hashlib.md5(f.read().encode()).hexdigest()
+    except Exception:
+        return None
+
+
+def stat_matches(record, st):
+    return (isinstance(record, dict)
+            and record.get("size") == st.st_size
+            and record.get("mtime_ns") == st.st_mtime_ns
+            and record.get("inode") == st.st_ino)
+
+
+def fingerprint(path, st=None):
+    """Build a fingerprint dict for *path*, or None if it can't be read."""
+    try:
+        st = st or os.stat(path)
+    except OSError:
+        return None
+    digest = hash_file(path)
+    if digest is None:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino, "hash": digest}
+
+
+def scan(tasks_dir, discussed):
+    """
+    Compare *tasks_dir* against the *discussed* fingerprints.
+
+    Returns ``(changed, refreshed)``: ``changed`` maps task filenames that
+    are new or whose content changed to their current fingerprint;
+    ``refreshed`` maps filenames whose content is unchanged but whose stored
+    record needs updating (touched files, legacy MD5 entries).
+    """
+    changed, refreshed = {}, {}
+    with os.scandir(tasks_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.md') or not entry.is_file():
+                continue
+            record = discussed.get(entry.name)
+            st = entry.stat()
+            if stat_matches(record, st):
+                continue
+            fp = fingerprint(entry.path, st)
+            if fp is None:
+                continue
+            if isinstance(record, dict) and record.get("hash") == fp["hash"]:
+                refreshed[entry.name] = fp
+            elif isinstance(record, str) and record == legacy_md5(entry.path):
+                refreshed[entry.name] = fp
+            else:
+                changed[entry.name] = fp
+    return changed, refreshed
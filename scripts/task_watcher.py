@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Task Watcher — wake up when files in a tasks directory change
+
+Uses inotify (Linux, via ctypes) so an idle watcher sleeps in select() with
+no CPU cost, and falls back to fixed-interval polling elsewhere. Watchers
+only answer "did something change?" — callers rescan with task_index, which
+skips unchanged files on stat alone, so a missed or coalesced event can
+never lose a change.
+
+    watcher = open_watcher(TASKS_DIR)
+    names = watcher.wait(timeout=1.0)   # set of names, None (rescan), or empty
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB | IN_MODIFY
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+POLL_INTERVAL = 5.0  # seconds, fallback watcher only
+
+
+class InotifyWatcher:
+    """Directory watcher backed by inotify."""
+
+    kind = "inotify"
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout=None):
+        """
+        Block up to *timeout* seconds. Returns the set of changed names
+        (empty on timeout), or None if the kernel queue overflowed.
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names, offset = set(), 0
+        while offset + EVENT_HEADER.size <= len(buf):
+            _, mask, _, length = EVENT_HEADER.unpack_from(buf, offset)
+            offset += EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if name:
+                names.add(name)
+        return names
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Fallback watcher: wakes every *interval* seconds and asks for a rescan."""
+
+    kind = "polling"
+
+    def __init__(self, path, interval=POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._next = time.monotonic()
+
+    def wait(self, timeout=None):
+        delay = max(0.0, self._next - time.monotonic())
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(delay)
+        self._next = time.monotonic() + self.interval
+        return None
+
+    def close(self):
+        pass
+
+
+def open_watcher(path, poll_interval=POLL_INTERVAL, force_polling=False):
+    """Return an inotify watcher for *path*, or a polling one if unavailable."""
+    if not force_polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(path, interval=poll_interval)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Turn Graph — dependency-driven scheduling of roundtable turns
+
+A roundtable is a DAG of turns: each turn names the turns whose replies it
+must see. TurnScheduler starts every turn as soon as its dependencies have
+finished, so independent turns run together, and turns from several
+roundtables interleave on the same loop. All of them draw from one shared
+limit on turns in flight (and optionally turns started per second), so a
+batch can't outrun the provider's rate limit.
+
+After a run, ScheduleReport gives the wall time, the critical path (the
+longest dependency chain, by measured turn duration) and the achieved
+parallelism (total turn time / wall time).
+"""
+
+import asyncio
+import time
+
+MAX_CONCURRENT_TURNS = 8   # turns in flight across all roundtables
+
+
+class Turn:
+    """One speaker's contribution; *deps* are the ids of the turns it must see."""
+
+    __slots__ = ("id", "agent", "phase", "deps")
+
+    def __init__(self, turn_id, agent, phase, deps=()):
+        self.id = turn_id
+        self.agent = agent
+        self.phase = phase
+        self.deps = tuple(deps)
+
+    def __repr__(self):
+        return f"Turn({self.id!r}, {self.agent!r}, {self.phase!r}, deps={list(self.deps)})"
+
+
+def ancestors(turn, by_id):
+    """Ids of every turn *turn* depends on, directly or not."""
+    seen = set()
+    stack = list(turn.deps)
+    while stack:
+        dep = stack.pop()
+        if dep not in seen:
+            seen.add(dep)
+            stack.extend(by_id[dep].deps)
+    return seen
+
+
+def validate(turns):
+    """Raise ValueError on unknown or forward dependencies (which also rules out cycles)."""
+    position = {t.id: i for i, t in enumerate(turns)}
+    if len(position) != len(turns):
+        raise ValueError("duplicate turn ids")
+    for i, t in enumerate(turns):
+        for dep in t.deps:
+            if dep not in position:
+                raise ValueError(f"{t.id} depends on unknown turn {dep}")
+            if position[dep] >= i:
+                raise ValueError(f"{t.id} depends on later turn {dep}; list turns in dependency order")
+
+
+class AsyncRateLimiter:
+    """Token bucket for coroutines: at most *rate* acquisitions per second."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ScheduleReport:
+    """Timings of one graph run."""
+
+    def __init__(self, turns, spans, wall):
+        self.turns = turns
+        self.spans = spans   # turn id → (start, end), monotonic seconds
+        self.wall = wall
+
+    def duration(self, turn_id):
+        start, end = self.spans.get(turn_id, (0.0, 0.0))
+        return end - start
+
+    def critical_path(self):
+        """(seconds, [turn ids]) of the longest dependency chain."""
+        best = {}
+        for t in self.turns:  # dependency order
+            prev = max((best[d] for d in t.deps), key=lambda b: b[0], default=(0.0, []))
+            best[t.id] = (prev[0] + self.duration(t.id), prev[1] + [t.id])
+        return max(best.values(), key=lambda b: b[0], default=(0.0, []))
+
+    @property
+    def busy(self):
+        return sum(self.duration(t.id) for t in self.turns)
+
+    @property
+    def parallelism(self):
+        return self.busy / self.wall if self.wall else 0.0
+
+    def summary(self):
+        seconds, path = self.critical_path()
+        return (f"{len(self.turns)} turn(s) in {self.wall:.2f}s — critical path {seconds:.2f}s "
+                f"({len(path)} turn(s)), parallelism {self.parallelism:.2f}x")
+
+
+class TurnScheduler:
+    """Runs turn graphs; the in-flight cap and rate limit are shared by every run."""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENT_TURNS, rate=None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate = rate
+        self._loop = None
+
+    def _limits(self):
+        # asyncio primitives bind to the loop that first awaits them.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._limiter = AsyncRateLimiter(self.rate) if self.rate else None
+            self._loop = loop
+        return self._slots, self._limiter
+
+    async def run(self, turns, run_turn):
+        """
+        Await ``run_turn(turn)`` for every turn once its deps are done.
+        Returns ({turn id: result}, ScheduleReport); a turn that raises
+        records None and its dependents still run.
+        """
+        validate(turns)
+        slots, limiter = self._limits()
+        waiting = {t.id: len(t.deps) for t in turns}
+        dependents = {t.id: [] for t in turns}
+        for t in turns:
+            for dep in t.deps:
+                dependents[dep].append(t)
+        results, spans = {}, {}
+
+        async def launch(turn):
+            async with slots:
+                if limiter:
+                    await limiter.acquire()
+                start = time.monotonic()
+                try:
+                    return await run_turn(turn)
+                except Exception as e:
+                    print(f"  ⚠️ Turn {turn.id} failed: {e}")
+                    return None
+                finally:
+                    spans[turn.id] = (start, time.monotonic())
+
+        started = time.monotonic()
+        running = {asyncio.ensure_future(launch(t)): t for t in turns if not t.deps}
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                turn = running.pop(task)
+                results[turn.id] = task.result()
+                for child in dependents[turn.id]:
+                    waiting[child.id] -= 1
+                    if waiting[child.id] == 0:
+                        running[asyncio.ensure_future(launch(child))] = child
+        return results, ScheduleReport(turns, spans, time.monotonic() - started)
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """The process-wide scheduler shared by concurrent roundtables."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TurnScheduler()
+    return _scheduler
+
+
+def configure(**kwargs):
+    """Replace the shared scheduler, e.g. ``configure(max_concurrency=4, rate=2)``."""
+    global _scheduler
+    _scheduler = TurnScheduler(**kwargs)
+    return _scheduler
@@ -0,0 +1,83 @@
+import fs from 'fs';
+import path from 'path';
+
+// Written by the Python generators when run with --stream (one JSON line per
+// partial/final message). We tail it and forward each line as an SSE event.
+const LIVE_PATH = path.join(process.cwd(), 'src', 'data', 'banter-live.jsonl');
+const POLL_MS = 200;
+const KEEPALIVE_MS = 15000;
+
+export const dynamic = 'force-dynamic';
+
+export async function GET(request: Request) {
+  const encoder = new TextEncoder();
+
+  // Start at the current end of the feed: clients only want what's new.
+  let offset = 0;
+  let inode = 0;
+  try {
+    const stat = fs.statSync(LIVE_PATH);
+    offset = stat.size;
+    inode = stat.ino;
+  } catch { /* not created yet */ }
+  let timer: ReturnType<typeof setInterval> | undefined;
+  let keepAlive: ReturnType<typeof setInterval> | undefined;
+
+  const stream = new ReadableStream({
+    start(controller) {
+      const send = (chunk: string) => controller.enqueue(encoder.encode(chunk));
+
+      const poll = () => {
+        let stat: fs.Stats;
+        try {
+          stat = fs.statSync(LIVE_PATH);
+        } catch {
+          return;
+        }
+        // The feed is replaced when it gets large: start again from the top.
+        if (stat.ino !== inode || stat.size < offset) {
+          inode = stat.ino;
+          offset = 0;
+        }
+        if (stat.size === offset) return;
+
+        const fd = fs.openSync(LIVE_PATH, 'r');
+        try {
+          const buf = Buffer.alloc(stat.size - offset);
+          fs.readSync(fd, buf, 0, buf.length, offset);
+          // Only consume complete lines; a half-written one is re-read next poll.
+          const end = buf.lastIndexOf(0x0a);
+          if (end < 0) return;
+          offset += end + 1;
+          for (const line of buf.subarray(0, end).toString('utf-8').split('\n')) {
+            if (line.trim()) send(`data: ${line}\n\n`);
+          }
+        } finally {
+          fs.closeSync(fd);
+        }
+      };
+
+      send(': connected\n\n');
+      timer = setInterval(poll, POLL_MS);
+      keepAlive = setInterval(() => send(': ping\n\n'), KEEPALIVE_MS);
+
+      request.signal.addEventListener('abort', () => {
+        clearInterval(timer);
+        clearInterval(keepAlive);
+        try { controller.close(); } catch { /* already closed */ }
+      });
+    },
+    cancel() {
+      clearInterval(timer);
+      clearInterval(keepAlive);
+    },
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache, no-transform',
+      Connection: 'keep-alive',
+    },
+  });
+}
@@ -3,6 +3,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import AgentChatLog from './AgentChatLog';
+import { agentByName } from '@/data/agents';
 
 /* ─── Types ────────────────────────────────────────── */
 
@@ -92,10 +93,10 @@ export default function AgentEnvironment() {
             lastBanterUpdate.current = data.last_updated;
             const newMessages: LogEntry[] = (data.messages || [])
               .map((m: any, i: number) => {
-                const agent = INITIAL_AGENTS.find(a => a.name.toLowerCase() === m.agent.toLowerCase());
+                const agent = agentByName(m.agent);
                 return {
-                  id: `banter-${data.last_updated}-${i}`,
-                  agentId: agent?.id || m.agent.toLowerCase(),
+                  id: m.id ? `banter-${m.id}` : `banter-${data.last_updated}-${i}`,
+                  agentId: agent?.handle || m.agent.toLowerCase(),
                   agentName: m.agent,
                   avatar: m.avatar || agent?.avatar || '🤖',
                   timestamp: m.timestamp || new Date().toLocaleTimeString('en-US', { hour12: false, hour: '2-digit', minute: '2-digit' }),
@@ -116,6 +117,47 @@ export default function AgentEnvironment() {
     return () => clearInterval(interval);
   }, []);
 
+  // Live feed: messages from generators run with --stream appear as they're
+  // typed and are updated in place; the poller above then skips them by id.
+  useEffect(() => {
+    const source = new EventSource('/api/banter/stream');
+    source.onmessage = (event) => {
+      let m: any;
+      try { m = JSON.parse(event.data); } catch { return; }
+      if (!m.id || !m.agent) return;
+
+      const id = `banter-${m.id}`;
+      displayedIds.current.add(id);
+      messageQueue.current = messageQueue.current.filter(q => q.id !== id);
+      if (m.failed) {
+        setLogs(prev => prev.filter(l => l.id !== id));
+        return;
+      }
+
+      setLogs(prev => {
+        const idx = prev.findIndex(l => l.id === id);
+        if (idx >= 0) {
+          const next = [...prev];
+          next[idx] = { ...prev[idx], message: m.text };
+          return next;
+        }
+        const agent = agentByName(m.agent);
+        const now = new Date();
+        const entry: LogEntry = {
+          id,
+          agentId: agent?.handle || m.agent.toLowerCase(),
+          agentName: m.agent,
+          avatar: m.avatar || agent?.avatar || '🤖',
+          timestamp: `${now.getHours().toString().padStart(2, '0')}:${now.getMinutes().toString().padStart(2, '0')}`,
+          message: m.text,
+          type: 'talk',
+        };
+        return [...prev, entry].slice(-60);
+      });
+    };
+    return () => source.close();
+  }, []);
+
   // Drip-feed: reveal one queued message every 5 seconds
   useEffect(() => {
     const interval = setInterval(() => {
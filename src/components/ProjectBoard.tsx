@@ -7,10 +7,16 @@ import {
   ArrowUpRight,
   ClipboardList,
   Zap,
-  LayoutDashboard
+  LayoutDashboard,
+  Target
 } from 'lucide-react';
+import { useQuery } from 'convex/react';
+import { anyApi } from 'convex/server';
 import dataFile from '../app/data.json';
 
+// Action items need the Convex provider, which is only mounted when this is set
+const convexUrl = process.env.NEXT_PUBLIC_CONVEX_URL;
+
 interface Project {
   name: string;
   last_worked: string;
@@ -21,6 +27,15 @@ interface Project {
   priority: 'high' | 'medium' | 'low';
 }
 
+// A roundtable commitment (convex/tasks.ts listActionItems)
+interface ActionItem {
+  _id: string;
+  title: string;
+  startTime: number;
+  owner?: string;
+  taskFile?: string;
+}
+
 export default function ProjectBoard() {
   const [projects, setProjects] = useState<Project[]>([]);
 
@@ -71,6 +86,9 @@ export default function ProjectBoard() {
           {ongoing.map((p, i) => <ProjectCard key={i} project={p} />)}
         </Section>
 
+        {/* Action Items */}
+        {convexUrl && <ActionItems />}
+
         {/* Pipeline */}
         <Section icon={<Clock style={{ width: '12px', height: '12px', color: '#5B7BAA' }} />} title="Pipeline" count={upcoming.length} color="#5B7BAA">
           {upcoming.map((p, i) => <ProjectCard key={i} project={p} />)}
@@ -90,6 +108,39 @@ export default function ProjectBoard() {
   );
 }
 
+function ActionItems() {
+  const items = useQuery(anyApi.tasks.listActionItems, { limit: 20 }) as ActionItem[] | undefined;
+  if (!items) return null;
+
+  return (
+    <Section icon={<Target style={{ width: '12px', height: '12px', color: '#8B5CF6' }} />} title="Action Items" count={items.length} color="#8B5CF6">
+      {items.map(item => <ActionItemCard key={item._id} item={item} />)}
+    </Section>
+  );
+}
+
+function ActionItemCard({ item }: { item: ActionItem }) {
+  const due = new Date(item.startTime);
+  const overdue = due.getTime() < new Date().setHours(0, 0, 0, 0);
+
+  return (
+    <div style={{ padding: '10px 12px', borderRadius: '8px', border: '1px solid #E8E0D0', backgroundColor: '#FAFAF5' }}>
+      <h3 style={{ fontSize: '12px', fontWeight: 600, color: '#333', lineHeight: '1.3' }}>
+        {item.title}
+      </h3>
+      <div style={{ display: 'flex', alignItems: 'center', justifyContent: 'space-between', marginTop: '6px', fontSize: '11px' }}>
+        <span style={{ color: overdue ? '#DC2626' : '#888', fontWeight: overdue ? 700 : 400 }}>
+          Due {due.toLocaleDateString(undefined, { month: 'short', day: 'numeric' })}
+        </span>
+        <div style={{ display: 'flex', alignItems: 'center', gap: '4px', color: '#AAA' }}>
+          <span>→</span>
+          <span style={{ color: '#5B7BAA', fontWeight: 600 }}>{item.owner}</span>
+        </div>
+      </div>
+    </div>
+  );
+}
+
 function Section({ icon, title, count, color, children }: { icon: React.ReactNode; title: string; count: number; color: string; children: React.ReactNode }) {
   return (
     <section style={{ marginBottom: '20px' }}>
@@ -0,0 +1,27 @@
+import registry from './agents.json';
+
+// Generated by scripts/agent_registry.py --write-json; the Python generators
+// read the same roster, so names and avatars stay in sync with banter.json.
+export interface RegistryAgent {
+  handle: string;
+  name: string;
+  avatar: string;
+  dir: string | null;
+}
+
+export const AGENTS: RegistryAgent[] = registry.agents;
+
+const byHandle = new Map<string, RegistryAgent>(AGENTS.map(a => [a.handle, a]));
+for (const [alias, handle] of Object.entries(registry.aliases as Record<string, string>)) {
+  const agent = byHandle.get(handle);
+  if (agent && !byHandle.has(alias)) byHandle.set(alias, agent);
+}
+const byName = new Map<string, RegistryAgent>(AGENTS.map(a => [a.name.toLowerCase(), a]));
+
+export function agentByHandle(handle: string): RegistryAgent | undefined {
+  return byHandle.get(handle.toLowerCase());
+}
+
+export function agentByName(name: string): RegistryAgent | undefined {
+  return byName.get(name.toLowerCase());
+}